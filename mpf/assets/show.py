@@ -1,5 +1,6 @@
 """Contains show related classes."""
 import re
+import time
 from collections import namedtuple
 
 from typing import List, Dict, Any, Optional
@@ -15,6 +16,9 @@ if MYPY:   # pragma: no cover
 
 __api__ = ['Show', 'RunningShow', 'ShowPool']
 
+ShowStep = namedtuple("ShowStep", ["duration", "actions"])
+"""A compiled show step. actions is a list of (item_type, player, program, settings)."""
+
 ShowConfig = namedtuple("ShowConfig", ["name", "priority", "speed", "loops", "sync_ms", "manual_advance", "show_tokens",
                                        "events_when_played", "events_when_stopped", "events_when_looped",
                                        "events_when_paused", "events_when_resumed", "events_when_advanced",
@@ -72,7 +76,7 @@ class Show:
     asset_group_class = ShowPool
 
     __slots__ = ["_autoplay_settings", "tokens", "token_values", "token_keys", "name", "total_steps", "show_steps",
-                 "_step_cache", "machine"]
+                 "_step_cache", "_program_cache", "_planned_program_cache", "machine"]
 
     def __init__(self, machine, name):
         """Initialize show."""
@@ -86,6 +90,8 @@ class Show:
         self.total_steps = None
         self.show_steps = []      # type: List[Dict[str, Any]]
         self._step_cache = {}
+        self._program_cache = {}
+        self._planned_program_cache = {}
 
     def __lt__(self, other):
         """Compare two instances."""
@@ -120,6 +126,9 @@ class Show:
     def load(self, data: Optional[Dict]):
         """Load show configuration."""
         self.show_steps = list()
+        self._step_cache = {}
+        self._program_cache = {}
+        self._planned_program_cache = {}
 
         if not isinstance(data, list):    # pragma: no cover
             self._show_validation_error("Show {} does not appear to be a valid show "
@@ -429,6 +438,84 @@ class Show:
         # otherwise return show steps. the caller should not change them
         return self.show_steps
 
+    def get_show_program_with_token(self, show_tokens) -> List[ShowStep]:
+        """Return show steps with tokens replaced compiled into step programs.
+
+        Players resolve their entries once per token set (see
+        ConfigPlayer.compile_show_entry) so running a step does not have to
+        look up devices or convert values again.
+        """
+        token_hash = hash(str(show_tokens)) if show_tokens and self.tokens else None
+        try:
+            return self._program_cache[token_hash]
+        except KeyError:
+            pass
+
+        show_players = self.machine.show_controller.show_players
+        program = []
+        for step in self.get_show_steps_with_token(show_tokens):
+            actions = []
+            for item_type, item_dict in step.items():
+                if item_type == 'duration':
+                    continue
+                try:
+                    player = show_players[item_type]
+                except KeyError:
+                    raise ValueError("Invalid entry in show: {}".format(item_type))
+                actions.append((item_type, player, player.compile_show_entry(item_dict), item_dict))
+            program.append(ShowStep(step['duration'], actions))
+
+        self._program_cache[token_hash] = program
+        return program
+
+    def get_planned_show_program_with_token(self, show_tokens) -> List[ShowStep]:
+        """Return the compiled show program after players planned ahead across steps.
+
+        Players may rewrite their programs with knowledge of all following
+        steps (see ConfigPlayer.plan_show_programs). E.g. the light player
+        merges fades into longer hardware fades. Only valid when the show runs
+        at normal speed without manual advance.
+        """
+        token_hash = hash(str(show_tokens)) if show_tokens and self.tokens else None
+        try:
+            return self._planned_program_cache[token_hash]
+        except KeyError:
+            pass
+
+        program = self.get_show_program_with_token(show_tokens)
+        durations = [step.duration for step in program]
+        planned_programs = {}
+        for step in program:
+            for item_type, player, _, _ in step.actions:
+                if item_type not in planned_programs:
+                    programs = [self._get_program_of_step(show_step, item_type) for show_step in program]
+                    planned_programs[item_type] = player.plan_show_programs(durations, programs)
+
+        planned_program = []
+        changed = False
+        for step_num, step in enumerate(program):
+            actions = []
+            for item_type, player, step_program, item_dict in step.actions:
+                planned_step_program = planned_programs[item_type][step_num]
+                if planned_step_program is not step_program:
+                    changed = True
+                actions.append((item_type, player, planned_step_program, item_dict))
+            planned_program.append(ShowStep(step.duration, actions))
+
+        if not changed:
+            # nothing was planned. share the program
+            planned_program = program
+
+        self._planned_program_cache[token_hash] = planned_program
+        return planned_program
+
+    @staticmethod
+    def _get_program_of_step(step, item_type):
+        for step_item_type, _, program, _ in step.actions:
+            if step_item_type == item_type:
+                return program
+        return None
+
     def _replace_token_values(self, show_steps, show_tokens):
         for token, replacement in show_tokens.items():
             if token in self.token_values:
@@ -488,7 +575,8 @@ class RunningShow:
 
     __slots__ = ["machine", "show", "show_steps", "show_config", "callback", "start_step", "start_running",
                  "start_callback", "_delay_handler", "next_step_index", "current_step_index", "next_step_time",
-                 "name", "loops", "id", "_players", "debug", "_stopped", "_total_steps", "context"]
+                 "name", "loops", "id", "_players", "debug", "_stopped", "_total_steps", "context", "show_program",
+                 "planned_show_program", "_planned_step_played"]
 
     # pylint: disable-msg=too-many-arguments
     # pylint: disable-msg=too-many-locals
@@ -516,6 +604,11 @@ class RunningShow:
         self._stopped = False
         self._total_steps = None
         self.show_steps = self.show.get_show_steps_with_token(self.show_config.show_tokens)
+        self.show_program = self.show.get_show_program_with_token(self.show_config.show_tokens)
+        self.planned_show_program = self.show.get_planned_show_program_with_token(self.show_config.show_tokens)
+        self._planned_step_played = False
+        if self.machine.show_controller.show_profiler:
+            self.machine.show_controller.show_profiler.show_started(self)
         self._start_play()
 
     def _start_play(self):
@@ -562,6 +655,8 @@ class RunningShow:
             return
 
         self._stopped = True
+        if self.machine.show_controller.show_profiler:
+            self.machine.show_controller.show_profiler.show_stopped(self)
 
         # if the start callback has never been called then call it now
         if self.start_callback:
@@ -590,9 +685,25 @@ class RunningShow:
     def pause(self):
         """Pause show."""
         self._remove_delay_handler()
+        if self._planned_step_played:
+            self._replay_unplanned_step()
         if self.show_config.events_when_paused:
             self._post_events(self.show_config.events_when_paused)
 
+    def _replay_unplanned_step(self):
+        """Replay entries of the current step which were planned beyond this step.
+
+        Planned entries (e.g. merged light fades) would otherwise continue into
+        the following steps while the show is paused.
+        """
+        self._planned_step_played = False
+        step = self.show_program[self.current_step_index]
+        planned_step = self.planned_show_program[self.current_step_index]
+        for (_, player, program, _), (_, _, planned_program, _) in zip(step.actions, planned_step.actions):
+            if program is not planned_program:
+                player.play_show_program(program, context=self.context, priority=self.show_config.priority,
+                                         start_time=None)
+
     def resume(self):
         """Resume paused show."""
         self.next_step_time = self.machine.clock.get_time()
@@ -643,6 +754,22 @@ class RunningShow:
         self._run_next_step(post_events=self.show_config.events_when_played,
                             pause_after_step=pause_after_step)
 
+    def _play_action(self, item_type, player, program, item_dict) -> None:
+        """Play one entry of the current step in its config player."""
+        if program is not None:
+            player.play_show_program(program, context=self.context, priority=self.show_config.priority,
+                                     start_time=self.next_step_time)
+        else:
+            player.show_play_callback(
+                settings=item_dict,
+                context=self.context,
+                calling_context=self.current_step_index,
+                priority=self.show_config.priority,
+                show_tokens=self.show_config.show_tokens,
+                start_time=self.next_step_time)
+
+        self._players.add(item_type)
+
     def _run_next_step(self, post_events=None, pause_after_step=False) -> None:
         """Run the next show step."""
         events = []
@@ -673,33 +800,34 @@ class RunningShow:
 
         self.current_step_index = self.next_step_index
 
-        for item_type, item_dict in self.show_steps[self.current_step_index].items():
-
-            if item_type == 'duration':
-                continue
-
-            try:
-                player = self.machine.show_controller.show_players[item_type]
-            except KeyError:
-                raise ValueError("Invalid entry in show: {}".format(item_type))
-
-            player.show_play_callback(
-                settings=item_dict,
-                context=self.context,
-                calling_context=self.current_step_index,
-                priority=self.show_config.priority,
-                show_tokens=self.show_config.show_tokens,
-                start_time=self.next_step_time)
-
-            self._players.add(item_type)
+        if self.show_config.speed == 1 and not self.show_config.manual_advance:
+            step = self.planned_show_program[self.current_step_index]
+        else:
+            step = self.show_program[self.current_step_index]
+        self._planned_step_played = step is not self.show_program[self.current_step_index]
+        profiler = self.machine.show_controller.show_profiler
+        if profiler:
+            step_start = time.perf_counter()
+            for action in step.actions:
+                action_start = time.perf_counter()
+                self._play_action(*action)
+                profiler.player_done(action[0], time.perf_counter() - action_start)
+            profiler.step_done(self.name, time.perf_counter() - step_start)
+        else:
+            for action in step.actions:
+                self._play_action(*action)
 
         if events:
             self._post_events(events)
 
         self.next_step_index += 1
 
-        time_to_next_step = self.show_steps[self.current_step_index]['duration'] / self.show_config.speed
+        time_to_next_step = step.duration / self.show_config.speed
         if not self.show_config.manual_advance and time_to_next_step > 0 and not pause_after_step:
             self.next_step_time += time_to_next_step
-            self._delay_handler = self.machine.clock.loop.call_at(when=self.next_step_time,
-                                                                  callback=self._run_next_step)
+            if self.machine.show_controller.batch_show_steps:
+                self._delay_handler = self.machine.show_controller.schedule_show_step(self.next_step_time,
+                                                                                      self._run_next_step)
+            else:
+                self._delay_handler = self.machine.clock.loop.call_at(when=self.next_step_time,
+                                                                      callback=self._run_next_step)
@@ -0,0 +1,47 @@
+import time
+
+from mpf.core.logging import LogMixin
+from mpf.core.rgb_color import RGBColor
+
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class BenchmarkColorCorrection(MpfTestCase):
+
+    """Color wash over 1000 color corrected LEDs at 50Hz."""
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_machine_path(self):
+        return 'benchmarks/machine_files/color_wash/'
+
+    def get_platform(self):
+        return 'virtual'
+
+    def setUp(self):
+        LogMixin.unit_test = False
+        super().setUp()
+
+    def _wash(self, name, set_colors, num=100):
+        colors = [RGBColor((index * 7 % 256, index * 13 % 256, index * 29 % 256)) for index in range(num)]
+        duration = 0
+        for frame, color in enumerate(colors):
+            start = time.time()
+            set_colors(color, "wash{}".format(frame % 2))
+            duration += time.time() - start
+            self.advance_time_and_run(.02)
+        print("{}: {:.3f}ms per frame".format(name, duration * 1000 / num))
+
+    def testColorWash(self):
+        stripe = self.machine.light_stripes["wash"]
+
+        def single_lights(color, key):
+            for light in stripe.lights:
+                light.color(color, fade_ms=20, key=key)
+
+        self._wash("1000 lights one by one", single_lights)
+        self._wash("1000 lights as group", lambda color, key: stripe.color(color, fade_ms=20, key=key))
+        self.machine.light_controller.brightness_factor = 0.5
+        self._wash("1000 lights as group at 50% brightness",
+                   lambda color, key: stripe.color(color, fade_ms=20, key=key))
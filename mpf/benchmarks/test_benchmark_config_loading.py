@@ -0,0 +1,79 @@
+import os
+import tempfile
+import time
+import unittest
+
+from mpf.core.config_processor import ConfigProcessor
+from mpf.core.file_manager import FileManager
+from mpf.core.utility_functions import Util
+from mpf.file_interfaces.yaml_interface import YamlInterface
+
+
+class BenchmarkConfigLoading(unittest.TestCase):
+
+    """Load a large machine config split into many files."""
+
+    files = 40
+    devices_per_file = 50
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        sub_files = []
+        for file_num in range(self.files):
+            lines = ["#config_version=6", "switches:"]
+            for num in range(self.devices_per_file):
+                lines.append("  s_switch_{}_{}:".format(file_num, num))
+                lines.append("    number: {}".format(file_num * self.devices_per_file + num))
+                lines.append("    tags: tag{}, playfield_active".format(num))
+                lines.append("    events_when_activated: hit_{}_{}, hit".format(file_num, num))
+            lines.append("lights:")
+            for num in range(self.devices_per_file):
+                lines.append("  l_light_{}_{}:".format(file_num, num))
+                lines.append("    number: {}".format(file_num * self.devices_per_file + num))
+                lines.append("    tags: row{}".format(file_num))
+                lines.append("    default_on_color: red")
+            lines.append("light_player:")
+            lines.append("  ball_started:")
+            for num in range(self.devices_per_file):
+                lines.append("    l_light_{}_{}: on".format(file_num, num))
+            name = "sub_{}.yaml".format(file_num)
+            with open(os.path.join(self.tmp_dir.name, name), "w") as f:
+                f.write("\n".join(lines) + "\n")
+            sub_files.append(name)
+
+        self.config_file = os.path.join(self.tmp_dir.name, "config.yaml")
+        with open(self.config_file, "w") as f:
+            f.write("#config_version=6\nconfig: {}\n".format(", ".join(sub_files)))
+
+        self.config_processor = ConfigProcessor(False, False)
+        self.config_spec = self.config_processor.load_config_spec()
+        self.addCleanup(setattr, YamlInterface, "cache", YamlInterface.cache)
+        self.addCleanup(setattr, YamlInterface, "file_cache", YamlInterface.file_cache)
+
+    def _load(self, num=10):
+        start = time.time()
+        for _ in range(num):
+            config = self.config_processor.load_config_files_with_cache([self.config_file], "machine",
+                                                                        config_spec=self.config_spec)
+        return config, (time.time() - start) / num
+
+    def testLoadConfig(self):
+        for cache in (False, True):
+            YamlInterface.cache = cache
+            YamlInterface.file_cache = {}
+            self._load(1)
+            _, duration = self._load()
+            print("Load config with file cache {}: {:.2f}ms".format(cache, duration * 1000))
+
+    def testMerge(self):
+        file_configs = [FileManager.load(os.path.join(self.tmp_dir.name, "sub_{}.yaml".format(file_num)))
+                        for file_num in range(self.files)]
+
+        for name, merge in (("dict_merge", Util.dict_merge), ("dict_merge_shared", Util.dict_merge_shared)):
+            start = time.time()
+            for _ in range(10):
+                config = {}
+                for file_config in file_configs:
+                    config = merge(config, file_config)
+            print("Merge {} files with {}: {:.2f}ms".format(self.files, name, (time.time() - start) * 100))
@@ -0,0 +1,66 @@
+import sys
+import time
+
+from mpf.core.logging import LogMixin
+from mpf.core.memory_report import create_memory_snapshot
+
+from mpf.tests.MpfGameTestCase import MpfGameTestCase
+
+
+class BenchmarkDeviceLayoutBase(MpfGameTestCase):
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_platform(self):
+        return 'virtual'
+
+    def setUp(self):
+        LogMixin.unit_test = False
+        super().setUp()
+
+    def _benchmark_access(self, name, devices, attribute, num=100000):
+        devices = list(devices)
+        start = time.time()
+        for _ in range(num):
+            for device in devices:
+                getattr(device, attribute)
+        duration = time.time() - start
+        print("Access {}.{}: {:.5f}us per access".format(name, attribute, duration * 1000000 / num / len(devices)))
+
+    def _report_size(self, name, collection):
+        devices = list(self.machine.device_manager.collections[collection].values())
+        shallow = sum(sys.getsizeof(device) for device in devices) / len(devices)
+        has_dict = any(hasattr(device, "__dict__") for device in devices)
+        snapshot = create_memory_snapshot(self.machine)
+        retained = snapshot["categories"]["devices." + collection]["size"] / len(devices)
+        print("Size {}: {:.0f} bytes per instance, {:.0f} bytes retained per instance, __dict__: {}".format(
+            name, shallow, retained, has_dict))
+
+
+class BenchmarkLightLayout(BenchmarkDeviceLayoutBase):
+
+    def get_machine_path(self):
+        return 'benchmarks/machine_files/shows/'
+
+    def testLights(self):
+        lights = self.machine.lights.values()
+        self._report_size("light", "lights")
+        self._benchmark_access("light", lights, "stack")
+        self._benchmark_access("light", lights, "hw_drivers")
+        self._benchmark_access("light", lights, "name")
+        self._benchmark_access("light", lights, "config")
+
+
+class BenchmarkSwitchLayout(BenchmarkDeviceLayoutBase):
+
+    def get_machine_path(self):
+        return 'benchmarks/machine_files/switch_hits/'
+
+    def testSwitches(self):
+        switches = self.machine.switches.values()
+        self._report_size("switch", "switches")
+        self._benchmark_access("switch", switches, "state")
+        self._benchmark_access("switch", switches, "hw_switch")
+        self._benchmark_access("switch", switches, "recycle_secs")
+        self._benchmark_access("switch", switches, "name")
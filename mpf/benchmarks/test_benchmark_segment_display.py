@@ -0,0 +1,50 @@
+import time
+
+from mpf.core.logging import LogMixin
+from mpf.core.rgb_color import RGBColor
+from mpf.devices.segment_display.transitions import PushTransition, WipeTransition, TransitionRunner
+
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class BenchmarkSegmentDisplay(MpfTestCase):
+
+    """Transitions and score updates on segment displays."""
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_machine_path(self):
+        return 'tests/machine_files/light_segment_displays/'
+
+    def get_platform(self):
+        return None
+
+    def setUp(self):
+        LogMixin.unit_test = False
+        super().setUp()
+
+    def testTransitions(self):
+        colors = [RGBColor("red")] * 16
+        for name, transition_class in (("push", PushTransition), ("wipe", WipeTransition)):
+            num = 200
+            start = time.time()
+            for num_score in range(num):
+                # every score is shown a few times (e.g. by multiple displays or while flashing)
+                transition = transition_class(16, True, True, False, {'direction': 'right', 'text': '**'})
+                runner = TransitionRunner(self.machine, transition, "{:,}".format(num_score % 20 * 1000),
+                                          "{:,}".format(num_score % 20 * 1000 + 1000), colors, colors)
+                for _ in runner:
+                    pass
+            duration = time.time() - start
+            print("Transition {}: {:.3f}ms per transition".format(name, duration * 1000 / num))
+
+    def testLightSegmentDisplay(self):
+        display = self.machine.segment_displays["display1"]
+        num = 2000
+        start = time.time()
+        for score in range(num):
+            display.add_text(str(score % 100))
+            self.machine_run()
+        duration = time.time() - start
+        print("Light segment display: {:.3f}ms per update".format(duration * 1000 / num))
@@ -0,0 +1,40 @@
+import time
+
+from mpf.core.logging import LogMixin
+
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class BenchmarkShowScheduler(MpfTestCase):
+
+    """40 synced insert shows with and without batched show steps."""
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_machine_path(self):
+        return 'benchmarks/machine_files/show_scheduler/'
+
+    def get_platform(self):
+        return 'virtual'
+
+    def setUp(self):
+        LogMixin.unit_test = False
+        super().setUp()
+
+    def _run_shows(self, name, batch_show_steps, seconds=20):
+        self.machine.config['mpf']['batch_show_steps'] = batch_show_steps
+        shows = [self.machine.shows["blink"].play(show_tokens={"led": light.name})
+                 for light in self.machine.light_stripes["inserts"].lights]
+        self.advance_time_and_run(1)
+        start = time.time()
+        self.advance_time_and_run(seconds)
+        duration = time.time() - start
+        for show in shows:
+            show.stop()
+        self.advance_time_and_run(1)
+        print("{}: {:.3f}ms per show second".format(name, duration * 1000 / seconds))
+
+    def testShowScheduler(self):
+        self._run_shows("One wakeup per show", False)
+        self._run_shows("Batched show steps", True)
@@ -0,0 +1,80 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from mpf.core.logging import LogMixin
+from mpf.core.text_ui import TextUi, Label
+
+from mpf.tests.MpfGameTestCase import MpfGameTestCase
+
+
+def _create_headless_window(self):
+    # the benchmark has no terminal. build everything except the screen.
+    self.screen = MagicMock()
+    self.screen.has_resized.return_value = False
+    self.layout = MagicMock()
+    self.footer_memory = Label("")
+    self.footer_cpu = Label("")
+    self.footer_mc_cpu = Label("")
+    self.footer_uptime = Label("")
+
+
+def _draw_headless_screen(self):
+    self._layout_change = False
+    self.frames_drawn += 1
+
+
+class BenchmarkTextUi(MpfGameTestCase):
+
+    """Switch throughput with the text UI on and off.
+
+    With the UI on the render thread updates widgets from snapshots while
+    switches are processed. Only the terminal output is left out.
+    """
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_machine_path(self):
+        return 'benchmarks/machine_files/switch_hits/'
+
+    def get_platform(self):
+        return 'virtual'
+
+    def setUp(self):
+        LogMixin.unit_test = False
+        super().setUp()
+
+    def _start_text_ui(self):
+        self.machine.options['text_ui'] = True
+        with patch.object(TextUi, "_create_window", _create_headless_window):
+            text_ui = TextUi(self.machine)
+        text_ui._init()
+        self.addCleanup(text_ui.stop)
+        return text_ui
+
+    def _run_switches(self, name):
+        for _ in range(1000):
+            self.machine.switch_controller.process_switch_by_num("4", 1, self.machine.default_platform)
+            self.machine.switch_controller.process_switch_by_num("4", 0, self.machine.default_platform)
+        self.advance_time_and_run()
+
+        num = 10000
+        total = 0
+        for _ in range(10):
+            start = time.time()
+            for _ in range(num):
+                self.machine.switch_controller.process_switch_by_num("4", 1, self.machine.default_platform)
+                self.machine.switch_controller.process_switch_by_num("4", 0, self.machine.default_platform)
+            self.advance_time_and_run()
+            total += time.time() - start
+        print("Text UI {}: {:.5f}ms per switch hit. Per second: {:.0f}".format(
+            name, 1000 * total / num / 10, num * 10 / total))
+
+    def testSwitchHitsUiOff(self):
+        self._run_switches("off")
+
+    def testSwitchHitsUiOn(self):
+        with patch.object(TextUi, "_draw_screen", _draw_headless_screen):
+            text_ui = self._start_text_ui()
+            self._run_switches("on")
+        print("Frames drawn: {}".format(text_ui.frames_drawn))
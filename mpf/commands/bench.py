@@ -0,0 +1,148 @@
+"""Command to boot many virtual machines in parallel and benchmark them."""
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from terminaltables import AsciiTable
+
+from mpf.core.file_manager import FileManager
+
+SUBCOMMAND = True
+
+
+def _get_rss():
+    try:
+        # pylint: disable-msg=import-outside-toplevel
+        import psutil
+    except ImportError:     # pragma: no cover
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def run_machine(job):
+    """Boot one machine, run the script and return its measurements.
+
+    This runs in a worker process.
+    """
+    # pylint: disable-msg=import-outside-toplevel
+    from mpf.core.headless_machine import HeadlessMachine
+    result = {
+        "machine_path": job["machine_path"],
+        "copy": job["copy"],
+        "boot_secs": None,
+        "run_secs": None,
+        "virtual_secs": None,
+        "events": None,
+        "events_per_sec": None,
+        "rss_bytes": None,
+        "error": None,
+    }
+    machine = HeadlessMachine(job["machine_path"], job["config_files"], job["platform"],
+                              config_patches=job.get("config_patches"))
+    try:
+        machine.boot()
+        result["boot_secs"] = machine.boot_secs
+        events_before = machine.machine.events.num_events_posted
+        virtual_start = machine.clock.get_time()
+        start = time.time()
+        machine.run_steps(job["steps"])
+        result["run_secs"] = time.time() - start
+        result["virtual_secs"] = machine.clock.get_time() - virtual_start
+        result["events"] = machine.machine.events.num_events_posted - events_before
+        if result["run_secs"] > 0:
+            result["events_per_sec"] = result["events"] / result["run_secs"]
+    except Exception:   # pylint: disable-msg=broad-except
+        result["error"] = traceback.format_exc()
+    result["rss_bytes"] = _get_rss()
+    try:
+        machine.stop()
+    except Exception:   # pylint: disable-msg=broad-except
+        pass
+    return result
+
+
+def _format(value, fmt):
+    return "-" if value is None else fmt.format(value)
+
+
+class Command:
+
+    """Boot machine folders in a process pool and report boot time, event throughput and memory."""
+
+    def __init__(self, argv, path):
+        """Run benchmark."""
+        parser = argparse.ArgumentParser(description='Boots machines with a virtual platform in parallel, runs '
+                                                     'a scripted switch sequence against them and reports boot '
+                                                     'time, events/sec and memory per machine.')
+        parser.add_argument("machine_paths", nargs="+", metavar="machine_path",
+                            help="Machine folders to boot")
+        parser.add_argument("-c", action="store", dest="configfile", default="config.yaml", metavar="config_file",
+                            help="Config file(s) to load (comma-separated). Default is config.yaml")
+        parser.add_argument("-n", action="store", dest="copies", type=int, default=1,
+                            help="Boot every machine folder n times")
+        parser.add_argument("-j", action="store", dest="processes", type=int, default=os.cpu_count(),
+                            help="Number of worker processes. Default is the number of CPUs")
+        parser.add_argument("-s", action="store", dest="script", default=None, metavar="script_file",
+                            help="YAML file with a list of steps (switch, wait, event, repeat) to run after boot")
+        parser.add_argument("-x", action="store_const", dest="platform", const="virtual", default="smart_virtual",
+                            help="Use the virtual platform instead of smart_virtual")
+        parser.add_argument("-o", action="store", dest="output", default=None, metavar="json_file",
+                            help="Also write the report as JSON")
+        args = parser.parse_args(argv[1:])
+
+        steps = FileManager.load(os.path.join(path, args.script)) if args.script else []
+        if not isinstance(steps, list):
+            print("Script needs to contain a list of steps.")
+            sys.exit(1)
+
+        config_files = args.configfile.split(",")
+        jobs = []
+        for machine_path in args.machine_paths:
+            for copy_num in range(args.copies):
+                jobs.append({"machine_path": os.path.abspath(os.path.join(path, machine_path)),
+                             "config_files": config_files, "platform": args.platform, "steps": steps,
+                             "copy": copy_num})
+
+        start = time.time()
+        with ProcessPoolExecutor(max_workers=max(1, args.processes)) as executor:
+            results = list(executor.map(run_machine, jobs))
+        duration = time.time() - start
+
+        self.print_report(results, duration)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"total_secs": duration, "machines": results}, f, indent=2)
+
+        sys.exit(1 if any(result["error"] for result in results) else 0)
+
+    @staticmethod
+    def print_report(results, duration):
+        """Print a table with one row per machine."""
+        rows = [["Machine", "Copy", "Boot (s)", "Run (s)", "Virtual (s)", "Events", "Events/s", "RSS (MB)",
+                 "Status"]]
+        for result in results:
+            rows.append([
+                os.path.basename(result["machine_path"].rstrip(os.sep)),
+                result["copy"],
+                _format(result["boot_secs"], "{:.2f}"),
+                _format(result["run_secs"], "{:.2f}"),
+                _format(result["virtual_secs"], "{:.1f}"),
+                _format(result["events"], "{}"),
+                _format(result["events_per_sec"], "{:.0f}"),
+                _format(result["rss_bytes"] / 1024 / 1024 if result["rss_bytes"] else None, "{:.1f}"),
+                "ERROR" if result["error"] else "OK"])
+        print(AsciiTable(rows).table)
+
+        for result in results:
+            if result["error"]:
+                print("\nError in {} (copy {}):\n{}".format(result["machine_path"], result["copy"], result["error"]))
+
+        boot_times = [result["boot_secs"] for result in results if result["boot_secs"] is not None]
+        if boot_times:
+            print("Machines: {} Total: {:.2f}s Boot min/avg/max: {:.2f}/{:.2f}/{:.2f}s".format(
+                len(results), duration, min(boot_times), sum(boot_times) / len(boot_times), max(boot_times)))
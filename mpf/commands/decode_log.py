@@ -0,0 +1,56 @@
+"""Command to render binary MPF logs as text."""
+import argparse
+import logging
+import sys
+
+from mpf.core.binary_logging import read_entries, open_log_file, entry_to_record
+
+SUBCOMMAND = True
+
+
+class Command:
+
+    """Decode binary log files written with --binary-logging."""
+
+    def __init__(self, argv, path):
+        """Decode logs."""
+        del path
+        parser = argparse.ArgumentParser(description='Renders binary MPF log files as text')
+        parser.add_argument("files", nargs="+", metavar="file",
+                            help="Binary log files to decode. Rotated files are decoded in the given order.")
+        parser.add_argument("--json", action="store_true", dest="json", default=False,
+                            help="Render records as JSON (same format as --json-logging)")
+        parser.add_argument("-o", action="store", dest="output", default=None, metavar="output_file",
+                            help="Write to a file instead of stdout")
+        args = parser.parse_args(argv[1:])
+
+        # levels used by LogMixin
+        logging.addLevelName(21, "INFO")
+        logging.addLevelName(11, "DEBUG")
+        logging.addLevelName(22, "INFO")
+        logging.addLevelName(12, "DEBUG")
+
+        if args.json:
+            # pylint: disable-msg=import-outside-toplevel
+            from mpf.commands.logging_formatters import JSONFormatter
+            formatter = JSONFormatter()     # type: logging.Formatter
+        else:
+            formatter = logging.Formatter('%(asctime)s : %(levelname)s : %(name)s : %(message)s')
+
+        output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for filename in args.files:
+                with open_log_file(filename) as file:
+                    for entry in read_entries(file):
+                        record = entry_to_record(entry)
+                        try:
+                            line = formatter.format(record)
+                        except (TypeError, ValueError):
+                            # format and args do not match. show them unformatted
+                            record.msg = "{} {}".format(record.msg, record.args)
+                            record.args = ()
+                            line = formatter.format(record)
+                        output.write(line + "\n")
+        finally:
+            if args.output:
+                output.close()
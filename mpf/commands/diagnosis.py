@@ -1,10 +1,14 @@
 """Command to show diagnosis information about mpf and mc."""
-
+import argparse
+import asyncio
 import sys
 
 from serial.tools import list_ports
 
 from mpf._version import version as mpf_version
+from mpf.core.bcp.bcp_socket_client import AsyncioBcpClientSocket
+from mpf.core.memory_report import format_memory_report
+from mpf.core.show_profiler import format_show_profile
 
 
 class Command:
@@ -13,7 +17,33 @@ class Command:
 
     def __init__(self, mpf_path, machine_path, args):
         """Run mpf diagnosis."""
-        del args
+        parser = argparse.ArgumentParser(description='Shows diagnosis information about MPF')
+        parser.add_argument("--memory", action="store_true", dest="memory", default=False,
+                            help="Request a memory report from a running MPF via BCP")
+        parser.add_argument("--snapshot", action="store", dest="snapshot", default=None, metavar="name",
+                            help="Store the memory report in MPF under this name")
+        parser.add_argument("--diff", action="store", dest="diff", default=None, metavar="name",
+                            help="Compare the memory report to the snapshot stored under this name")
+        parser.add_argument("--shows", action="store_true", dest="shows", default=False,
+                            help="Request the show profile from a running MPF via BCP")
+        parser.add_argument("--start", action="store_true", dest="start", default=False,
+                            help="Start (or restart) the show profiler before requesting the show profile")
+        parser.add_argument("--stop", action="store_true", dest="stop", default=False,
+                            help="Stop the show profiler after requesting the show profile")
+        parser.add_argument("--host", action="store", dest="host", default="localhost",
+                            help="BCP host of the running MPF. Default is localhost")
+        parser.add_argument("--port", action="store", dest="port", type=int, default=5051,
+                            help="BCP port of the running MPF. Default is 5051")
+        args, _ = parser.parse_known_args(args)
+
+        if args.memory:
+            self.memory_report(args)
+            sys.exit()
+
+        if args.shows:
+            self.show_profile(args)
+            sys.exit()
+
         print("MPF version: {}".format(mpf_version))
         print("MPF install location: {}".format(mpf_path))
         print("Machine folder detected: {}".format(machine_path))
@@ -34,3 +64,48 @@ class Command:
             sys.stdout.write("    hwid: {}\n".format(hwid))
 
         sys.exit()
+
+    @staticmethod
+    def memory_report(args):
+        """Request a memory report from MPF and print it."""
+        loop = asyncio.get_event_loop()
+        reader, writer = loop.run_until_complete(asyncio.open_connection(args.host, args.port))
+        client = AsyncioBcpClientSocket(writer, reader)
+        params = {}
+        if args.snapshot:
+            params["snapshot"] = args.snapshot
+        if args.diff:
+            params["diff"] = args.diff
+        client.send("memory_report", params)
+        _, message = loop.run_until_complete(client.wait_for_response("memory_report"))
+        writer.close()
+
+        if message.get("error"):
+            print("Error: {}".format(message["error"]))
+            return
+
+        for line in format_memory_report(message["report"], message.get("diff")):
+            print(line)
+
+    @staticmethod
+    def show_profile(args):
+        """Request the show profile from MPF and print it."""
+        loop = asyncio.get_event_loop()
+        reader, writer = loop.run_until_complete(asyncio.open_connection(args.host, args.port))
+        client = AsyncioBcpClientSocket(writer, reader)
+        params = {}
+        if args.start:
+            params["enable"] = True
+            params["reset"] = True
+        elif args.stop:
+            params["enable"] = False
+        client.send("show_profile", params)
+        _, message = loop.run_until_complete(client.wait_for_response("show_profile"))
+        writer.close()
+
+        if message.get("error"):
+            print("Error: {}".format(message["error"]))
+            return
+
+        for line in format_show_profile(message["report"]):
+            print(line)
@@ -17,6 +17,7 @@ from mpf.core.machine import MachineController
 from mpf.core.utility_functions import Util
 from mpf.core.config_loader import YamlMultifileConfigLoader, ProductionConfigLoader
 from mpf.commands.logging_formatters import JSONFormatter
+from mpf.core.binary_logging import BinaryLogHandler, BoundedQueueHandler
 from mpf.exceptions.config_file_error import ConfigFileError
 
 
@@ -73,6 +74,22 @@ class Command:
                             default=False,
                             help="Enables json logging to file. ")
 
+        parser.add_argument("--binary-logging",
+                            action="store_true", dest="binary_logging",
+                            default=False,
+                            help="Log to rotating compressed binary files "
+                                 "instead of text. Records are not formatted "
+                                 "at runtime and dropped instead of blocking "
+                                 "when the writer cannot keep up. Use "
+                                 "'mpf decode_log' to read them.")
+
+        parser.add_argument("--binary-log-ring",
+                            action="store", dest="binary_log_ring",
+                            type=int, default=10000, metavar="records",
+                            help="Number of recent log records kept in memory "
+                                 "when using --binary-logging. Dumped next to "
+                                 "the log on crash.")
+
         parser.add_argument("-l",
                             action="store", dest="logfile",
                             metavar='file_name',
@@ -180,27 +197,40 @@ class Command:
         console_log.setFormatter(logging.Formatter(
             '%(asctime)s.%(msecs)03d : %(levelname)s [%(name)s] %(message)s', "%H:%M:%S"))
 
-        # initialize async handler for console
-        console_log_queue = Queue()
-        console_queue_handler = QueueHandler(console_log_queue)
+        self.binary_log_handler = None
+        if self.args.binary_logging:
+            # bounded console queue which drops instead of growing
+            console_log_queue = Queue(maxsize=10000)
+            console_queue_handler = BoundedQueueHandler(console_log_queue)
+        else:
+            # initialize async handler for console
+            console_log_queue = Queue()
+            console_queue_handler = QueueHandler(console_log_queue)
         self.console_queue_listener = logging.handlers.QueueListener(
             console_log_queue, console_log, respect_handler_level=True)
         self.console_queue_listener.start()
 
-        # initialize file log
-        file_log = logging.FileHandler(full_logfile_path)
-        if self.args.jsonlogging:
-            formatter = JSONFormatter()
+        if self.args.binary_logging:
+            # binary handler does not format and never blocks. it writes in its own thread.
+            self.binary_log_handler = BinaryLogHandler(os.path.splitext(full_logfile_path)[0] + ".binlog",
+                                                       ring_size=self.args.binary_log_ring)
+            file_queue_handler = self.binary_log_handler
+            self.file_queue_listener = None
         else:
-            formatter = logging.Formatter('%(asctime)s : %(levelname)s : %(name)s : %(message)s')
-        file_log.setFormatter(formatter)
+            # initialize file log
+            file_log = logging.FileHandler(full_logfile_path)
+            if self.args.jsonlogging:
+                formatter = JSONFormatter()
+            else:
+                formatter = logging.Formatter('%(asctime)s : %(levelname)s : %(name)s : %(message)s')
+            file_log.setFormatter(formatter)
 
-        # initialize async handler for file log
-        file_log_queue = Queue()
-        file_queue_handler = QueueHandler(file_log_queue)
-        self.file_queue_listener = logging.handlers.QueueListener(
-            file_log_queue, file_log)
-        self.file_queue_listener.start()
+            # initialize async handler for file log
+            file_log_queue = Queue()
+            file_queue_handler = QueueHandler(file_log_queue)
+            self.file_queue_listener = logging.handlers.QueueListener(
+                file_log_queue, file_log)
+            self.file_queue_listener.start()
 
         # add loggers
         logger = logging.getLogger()
@@ -271,10 +301,18 @@ class Command:
         """
         if exception:
             logging.exception(exception)
+            if self.binary_log_handler:
+                self.binary_log_handler.dump_ring(self.binary_log_handler.filename + ".ring")
+
+        if self.binary_log_handler:
+            stats = self.binary_log_handler.get_stats()
+            if stats["dropped_records"]:
+                logging.warning("Binary log dropped %s of %s records", stats["dropped_records"], stats["records"])
 
         logging.shutdown()
         self.console_queue_listener.stop()
-        self.file_queue_listener.stop()
+        if self.file_queue_listener:
+            self.file_queue_listener.stop()
 
         if self.args.pause:
             input('Press ENTER to continue...')     # nosec
@@ -0,0 +1,379 @@
+"""Command to play many simulated games and report score and feature distributions."""
+import argparse
+import bisect
+import json
+import math
+import os
+import random
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from terminaltables import AsciiTable
+
+from mpf.core.file_manager import FileManager
+from mpf.core.utility_functions import Util
+
+SUBCOMMAND = True
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from mpf.core.headless_machine import HeadlessMachine   # pylint: disable-msg=cyclic-import,unused-import
+
+PERCENTILES = [10, 25, 50, 75, 90, 95, 99]
+
+
+def parse_model(model) -> dict:
+    """Validate a switch model and convert all times to seconds.
+
+    A model looks like this:
+
+    .. code-block:: yaml
+
+        ball_time: 40s            # average time a ball stays in play
+        drain_probability: 0.02   # chance that the ball drains after a switch hit
+        players: 1
+        switches:
+          s_left_sling: 0.8       # hits per second while one ball is in play
+          s_spinner:
+            rate: 0.2
+            hold: 20ms
+        player_vars: score, ramps_made    # default: all numeric player vars
+        count_events: jackpot, extra_ball_awarded
+    """
+    if not isinstance(model, dict):
+        raise AssertionError("Model needs to be a dict.")
+    unknown_keys = set(model) - {"ball_time", "drain_probability", "players", "switches", "start_switch",
+                                 "player_vars", "count_events", "plunger_time", "max_game_time"}
+    if unknown_keys:
+        raise AssertionError("Unknown keys in model: {}".format(", ".join(sorted(unknown_keys))))
+
+    switches = {}
+    for name, switch in (model.get("switches") or {}).items():
+        if not isinstance(switch, dict):
+            switch = {"rate": switch}
+        rate = float(switch.get("rate", 0))
+        if rate < 0:
+            raise AssertionError("Rate of switch {} cannot be negative.".format(name))
+        switches[name] = {"rate": rate, "hold": Util.string_to_secs(switch.get("hold", "50ms"))}
+
+    ball_time = Util.string_to_secs(model.get("ball_time", 0))
+    drain_probability = float(model.get("drain_probability", 0))
+    if not 0 <= drain_probability <= 1:
+        raise AssertionError("drain_probability has to be between 0 and 1.")
+    if not ball_time and not (drain_probability and any(switch["rate"] for switch in switches.values())):
+        raise AssertionError("Balls never drain. Set ball_time or drain_probability and switch rates.")
+
+    player_vars = model.get("player_vars")
+    return {
+        "ball_time": ball_time,
+        "drain_probability": drain_probability,
+        "players": int(model.get("players", 1)),
+        "switches": switches,
+        "start_switch": model.get("start_switch"),
+        "player_vars": Util.string_to_event_list(player_vars) if player_vars is not None else None,
+        "count_events": Util.string_to_event_list(model.get("count_events", [])),
+        "plunger_time": Util.string_to_secs(model.get("plunger_time", "1s")),
+        "max_game_time": Util.string_to_secs(model.get("max_game_time", "1h")),
+    }
+
+
+class GameSimulator:
+
+    """Play games on a headless machine with a stochastic switch model.
+
+    Balls on the playfield hit switches as a Poisson process with the rates
+    from the model and drain either after an exponentially distributed ball
+    time or with a fixed chance after every switch hit. Ball devices, drop
+    targets and score reels are handled by the smart_virtual platform.
+    """
+
+    __slots__ = ["headless", "model", "random", "_switches", "_cumulative_rates", "_total_rate", "_drain_rate",
+                 "_start_switch", "_drain", "_event_counts"]
+
+    def __init__(self, headless: "HeadlessMachine", model: dict, seed=None) -> None:
+        """Initialise simulator.
+
+        Args:
+        ----
+            headless: A booted headless machine with the smart_virtual platform.
+            model: Model as returned by parse_model.
+            seed: Seed for the random generator.
+        """
+        self.headless = headless
+        self.model = model
+        self.random = random.Random(seed)
+        self._switches = []
+        self._cumulative_rates = []
+        self._total_rate = 0
+        self._drain_rate = 1 / model["ball_time"] if model["ball_time"] else 0
+        self._start_switch = None
+        self._drain = None
+        self._event_counts = {}
+
+    def prepare(self):
+        """Look up switches and devices of the model and fill the troughs."""
+        machine = self.headless.machine
+        for name, switch in self.model["switches"].items():
+            if name not in machine.switches:
+                raise AssertionError("Switch {} from the model does not exist.".format(name))
+            if not switch["rate"]:
+                continue
+            self._total_rate += switch["rate"]
+            self._switches.append((name, switch["hold"]))
+            self._cumulative_rates.append(self._total_rate)
+
+        if self.model["start_switch"]:
+            self._start_switch = self.model["start_switch"]
+        else:
+            start_switches = machine.switches.items_tagged("start")
+            if not start_switches:
+                raise AssertionError("No switch tagged start. Set start_switch in the model.")
+            self._start_switch = start_switches[0].name
+
+        drains = machine.ball_devices.items_tagged("drain")
+        if not drains:
+            raise AssertionError("No ball device tagged drain.")
+        self._drain = drains[0]
+
+        for event in self.model["count_events"]:
+            machine.events.add_handler(event, self._count_event, event_name=event)
+
+        for trough in machine.ball_devices.items_tagged("trough"):
+            for switch in trough.ball_count_handler.counter.config.get('ball_switches', []):
+                self.headless.set_switch(switch.name, 1)
+        self.headless.advance(1)
+
+    def _count_event(self, event_name, **kwargs):
+        del kwargs
+        self._event_counts[event_name] += 1
+
+    def _start_game(self):
+        machine = self.headless.machine
+        # the machine may still be busy with the last game (e.g. high score entry)
+        for _ in range(120):
+            self.headless.hit_switch(self._start_switch)
+            self.headless.advance(1)
+            if machine.game:
+                break
+        else:
+            raise AssertionError("Game did not start. Check the start switch and the troughs.")
+
+        for _ in range(self.model["players"] - 1):
+            self.headless.hit_switch(self._start_switch)
+            self.headless.advance(.1)
+
+    def play_game(self) -> dict:
+        """Play one game and return scores, player vars and event counts."""
+        machine = self.headless.machine
+        clock = self.headless.clock
+        self._event_counts = {event: 0 for event in self.model["count_events"]}
+        start = clock.get_time()
+        self._start_game()
+        player_list = machine.game.player_list
+        timeout = False
+
+        while machine.game:
+            if clock.get_time() - start > self.model["max_game_time"]:
+                timeout = True
+                machine.game.end_game()
+                self.headless.advance(1)
+                break
+            self._simulate_step()
+
+        return {
+            "game_secs": clock.get_time() - start,
+            "timeout": timeout,
+            "players": [self._get_player_vars(player) for player in player_list],
+            "events": dict(self._event_counts),
+        }
+
+    def _simulate_step(self):
+        """Wait for the next switch hit or drain and perform it."""
+        playfield = self.headless.machine.playfield
+        balls = playfield.balls + playfield.num_incoming_balls
+        if balls <= 0:
+            # ball is in a device or the plunger lane
+            self.headless.advance(.1)
+            return
+
+        total_rate = (self._total_rate + self._drain_rate) * balls
+        self.headless.advance(self.random.expovariate(total_rate))
+        if not self.headless.machine.game:
+            return
+
+        pick = self.random.random() * (self._total_rate + self._drain_rate)
+        if pick < self._drain_rate:
+            self._drain_ball()
+            return
+
+        index = bisect.bisect_right(self._cumulative_rates, pick - self._drain_rate)
+        name, hold = self._switches[min(index, len(self._switches) - 1)]
+        self.headless.hit_switch(name, hold)
+        if self.model["drain_probability"] and self.random.random() < self.model["drain_probability"]:
+            self._drain_ball()
+
+    def _drain_ball(self):
+        # only drain balls which arrived on the playfield. others would end up as extra balls
+        if self.headless.machine.playfield.balls > 0:
+            self.headless.machine.default_platform.add_ball_to_device(self._drain)
+            self.headless.advance(0)
+
+    def _get_player_vars(self, player) -> dict:
+        if self.model["player_vars"] is None:
+            return {name: value for name, value in player
+                    if isinstance(value, (int, float)) and not isinstance(value, bool)}
+        return {name: player[name] for name in self.model["player_vars"]}
+
+
+def run_simulation(job):
+    """Boot one machine, play a batch of games and return the results.
+
+    This runs in a worker process.
+    """
+    # pylint: disable-msg=import-outside-toplevel
+    from mpf.core.headless_machine import HeadlessMachine
+    result = {
+        "seed": job["seed"],
+        "boot_secs": None,
+        "run_secs": None,
+        "games": [],
+        "error": None,
+    }
+    config_patches = {"smart_virtual": {"simulate_manual_plunger": True,
+                                        "simulate_manual_plunger_timeout": int(job["model"]["plunger_time"] * 1000)}}
+    machine = HeadlessMachine(job["machine_path"], job["config_files"], "smart_virtual",
+                              config_patches=Util.dict_merge(config_patches, job.get("config_patches") or {}))
+    try:
+        machine.boot()
+        result["boot_secs"] = machine.boot_secs
+        simulator = GameSimulator(machine, job["model"], job["seed"])
+        simulator.prepare()
+        start = time.time()
+        for _ in range(job["games"]):
+            result["games"].append(simulator.play_game())
+        result["run_secs"] = time.time() - start
+    except Exception:   # pylint: disable-msg=broad-except
+        result["error"] = traceback.format_exc()
+    try:
+        machine.stop()
+    except Exception:   # pylint: disable-msg=broad-except
+        pass
+    return result
+
+
+def get_percentile(sorted_values, percent):
+    """Return the percentile of a sorted list with linear interpolation between the closest ranks."""
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def get_distribution(values) -> dict:
+    """Return count, mean, min, max and percentiles of values."""
+    values = sorted(values)
+    distribution = {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "min": values[0],
+        "max": values[-1],
+    }
+    for percent in PERCENTILES:
+        distribution["p{}".format(percent)] = get_percentile(values, percent)
+    return distribution
+
+
+def get_distributions(games) -> dict:
+    """Return distributions of game length, player vars (per player) and events (per game)."""
+    metrics = {"game_secs": [game["game_secs"] for game in games]}
+    for game in games:
+        for player in game["players"]:
+            for name, value in player.items():
+                metrics.setdefault("player." + name, []).append(value)
+        for name, value in game["events"].items():
+            metrics.setdefault("event." + name, []).append(value)
+    return {name: get_distribution(values) for name, values in metrics.items()}
+
+
+class Command:
+
+    """Play thousands of games with a stochastic switch model and report score and feature distributions."""
+
+    def __init__(self, argv, path):
+        """Run simulation."""
+        parser = argparse.ArgumentParser(description='Plays games on a machine config without hardware and '
+                                                     'without waiting in real time. Switch hits and drains are '
+                                                     'random according to a model file. Reports distributions '
+                                                     'of scores, player vars and events to tune replay and high '
+                                                     'score thresholds.')
+        parser.add_argument("machine_path", nargs="?", default=".", help="Machine folder")
+        parser.add_argument("-m", action="store", dest="model", required=True, metavar="model_file",
+                            help="YAML file with switch hit rates, drain probability and ball time")
+        parser.add_argument("-c", action="store", dest="configfile", default="config.yaml", metavar="config_file",
+                            help="Config file(s) to load (comma-separated). Default is config.yaml")
+        parser.add_argument("-n", action="store", dest="games", type=int, default=100,
+                            help="Number of games to play. Default is 100")
+        parser.add_argument("-j", action="store", dest="processes", type=int, default=os.cpu_count(),
+                            help="Number of worker processes. Default is the number of CPUs")
+        parser.add_argument("--seed", action="store", dest="seed", type=int, default=None,
+                            help="Seed for the random generators to repeat a run")
+        parser.add_argument("-o", action="store", dest="output", default=None, metavar="json_file",
+                            help="Also write the distributions and all games as JSON")
+        args = parser.parse_args(argv[1:])
+
+        try:
+            model = parse_model(FileManager.load(os.path.join(path, args.model)))
+        except AssertionError as e:
+            print("Invalid model: {}".format(e))
+            sys.exit(1)
+
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        processes = max(1, min(args.processes, args.games))
+        jobs = []
+        for num in range(processes):
+            jobs.append({"machine_path": os.path.abspath(os.path.join(path, args.machine_path)),
+                         "config_files": args.configfile.split(","), "model": model,
+                         "games": args.games // processes + (1 if num < args.games % processes else 0),
+                         "seed": seed + num})
+
+        start = time.time()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(run_simulation, jobs))
+        duration = time.time() - start
+
+        games = [game for result in results for game in result["games"]]
+        distributions = get_distributions(games) if games else {}
+        self.print_report(results, games, distributions, duration, seed)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"total_secs": duration, "seed": seed, "model": model, "distributions": distributions,
+                           "games": games, "errors": [result["error"] for result in results if result["error"]]},
+                          f, indent=2)
+
+        sys.exit(1 if any(result["error"] for result in results) else 0)
+
+    @staticmethod
+    def print_report(results, games, distributions, duration, seed):
+        """Print a table with one row per metric."""
+        for result in results:
+            if result["error"]:
+                print("Error in worker with seed {}:\n{}".format(result["seed"], result["error"]))
+
+        if not games:
+            print("No games were played.")
+            return
+
+        rows = [["Metric", "Count", "Mean", "Min"] + ["P{}".format(percent) for percent in PERCENTILES] + ["Max"]]
+        for name, distribution in sorted(distributions.items()):
+            rows.append([name, distribution["count"]] +
+                        ["{:.1f}".format(distribution[key]) for key in
+                         ["mean", "min"] + ["p{}".format(percent) for percent in PERCENTILES] + ["max"]])
+        print(AsciiTable(rows).table)
+
+        virtual_secs = sum(game["game_secs"] for game in games)
+        timeouts = sum(1 for game in games if game["timeout"])
+        print("Games: {} (timed out: {}) Seed: {} Total: {:.2f}s Simulated: {:.0f}s ({:.0f}x real time)".format(
+            len(games), timeouts, seed, duration, virtual_secs, virtual_secs / duration if duration else 0))
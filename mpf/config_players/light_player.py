@@ -1,9 +1,10 @@
 """Light config player."""
-from typing import List
+from typing import List, Optional
 
 from mpf.config_players.device_config_player import DeviceConfigPlayer
 from mpf.core.rgb_color import RGBColor, ColorException
 from mpf.core.utility_functions import Util
+from mpf.devices.light import Light
 
 
 class LightPlayer(DeviceConfigPlayer):
@@ -15,7 +16,12 @@ class LightPlayer(DeviceConfigPlayer):
     machine_collection_name = 'lights'
     allow_placeholders_in_keys = True
 
-    __slots__ = []  # type: List[str]
+    __slots__ = ["_tick_lights"]
+
+    def __init__(self, machine):
+        """Initialize light player."""
+        super().__init__(machine)
+        self._tick_lights = None    # type: Optional[List[Light]]
 
     # pylint: disable-msg=too-many-locals
     def play(self, settings, context, calling_context, priority=0, **kwargs):
@@ -42,6 +48,171 @@ class LightPlayer(DeviceConfigPlayer):
             else:
                 self._light_color(light, instance_dict, full_context, s['color'], s["fade"], final_priority, start_time)
 
+    def compile_show_entry(self, settings):
+        """Resolve lights, colors, fades and priorities of a show entry.
+
+        Returns a tuple of (light, color, fade_ms, priority) or None if the entry
+        still contains placeholders which have to be evaluated when it is played.
+        A color of None removes the light from the stack.
+        """
+        program = []
+        for light, s in settings.items():
+            if not isinstance(light, Light) or not isinstance(s["priority"], int) or \
+                    not (s["fade"] is None or isinstance(s["fade"], int)):
+                return None
+            color = s["color"]
+            if isinstance(color, str):
+                if color == "stop":
+                    color = None
+                elif color == "on":
+                    color = light.config['default_on_color']
+                else:
+                    return None
+            elif not isinstance(color, RGBColor):
+                return None
+            program.append((light, color, s["fade"], s["priority"]))
+
+        return tuple(program)
+
+    def play_show_program(self, program, context, priority, start_time):
+        """Set the colors of a compiled show entry."""
+        try:
+            instance_dict = self.instances[context][self.config_file_section]
+        except KeyError:
+            instance_dict = self.instances.setdefault(context, {}).setdefault(self.config_file_section, {})
+        full_context = self._get_full_context(context)
+
+        changed_lights = []
+        for light, color, fade_ms, light_priority in program:
+            if color is None:
+                self._light_remove(light, instance_dict, full_context, fade_ms)
+                continue
+            if light.add_color(color, key=full_context, fade_ms=fade_ms, priority=light_priority + priority,
+                               start_time=start_time):
+                changed_lights.append(light)
+            instance_dict[(full_context, light)] = light
+
+        if self._tick_lights is not None:
+            # the show controller runs multiple steps. update all lights at the end of the tick
+            self._tick_lights.extend(changed_lights)
+        else:
+            # correct and send all colors of this step at once
+            Light.schedule_updates(changed_lights)
+
+    def start_show_tick(self):
+        """Collect changed lights until the tick ends."""
+        self._tick_lights = []
+
+    def end_show_tick(self):
+        """Update all lights changed in this tick at once."""
+        lights = self._tick_lights
+        self._tick_lights = None
+        if lights:
+            Light.schedule_updates(lights)
+
+    def plan_show_programs(self, durations, programs):
+        """Merge fades which run along a straight line over several steps.
+
+        When a light fades through several consecutive steps and all colors lie
+        on one line (e.g. a ramp split into many steps) every step of that run
+        fades to the end of the run instead. The first step sends one long fade
+        and the light skips the following steps because its hardware already
+        runs that fade. Runs are limited to the longest fade the hardware of a
+        light can run on its own.
+        """
+        lights = {}
+        for program in programs:
+            for entry in program or ():
+                lights[entry[0]] = True
+
+        planned = {}
+        for light in lights:
+            max_fade_ms = light.get_max_fade_ms()
+            if max_fade_ms == 0:
+                # the host fades this light anyway
+                continue
+
+            entries = [self._get_show_entry_of_light(program, light) for program in programs]
+            for start, end in self._find_fade_runs(durations, entries, max_fade_ms):
+                _, (_, end_color, _, light_priority) = entries[end]
+                for step_num in range(start, end + 1):
+                    index, _ = entries[step_num]
+                    remaining_ms = int(round(sum(durations[step_num:end + 1]) * 1000))
+                    program = planned.setdefault(step_num, list(programs[step_num]))
+                    program[index] = (light, end_color, remaining_ms, light_priority)
+
+        return [tuple(planned[step_num]) if step_num in planned else program
+                for step_num, program in enumerate(programs)]
+
+    @staticmethod
+    def _get_show_entry_of_light(program, light):
+        """Return index and entry of a light in a program or None if it is not in there exactly once."""
+        found = None
+        for index, entry in enumerate(program or ()):
+            if entry[0] is light:
+                if found:
+                    return None
+                found = (index, entry)
+        return found
+
+    @staticmethod
+    def _is_continuous_fade(durations, entries, step_num):
+        """Return true if the light fades from the color of the previous step during the whole step."""
+        previous = entries[step_num - 1]
+        current = entries[step_num]
+        if not previous or not current:
+            return False
+        _, (light, previous_color, previous_fade, previous_priority) = previous
+        _, (_, color, fade, priority) = current
+        if previous_color is None or color is None or previous_priority != priority:
+            return False
+        if durations[step_num - 1] <= 0 or durations[step_num] <= 0:
+            return False
+        if previous_fade is None:
+            previous_fade = light.default_fade_ms or 0
+        if fade is None:
+            fade = light.default_fade_ms or 0
+        # the previous fade has to be done when this step starts and this fade has to last until the next step
+        return previous_fade <= durations[step_num - 1] * 1000 and abs(fade - durations[step_num] * 1000) < 1
+
+    def _find_fade_runs(self, durations, entries, max_fade_ms):
+        """Yield first and last step of all runs of fades along a straight line."""
+        step_num = 1
+        while step_num < len(entries):
+            if not self._is_continuous_fade(durations, entries, step_num):
+                step_num += 1
+                continue
+
+            start_rgb = entries[step_num - 1][1][1].rgb
+            points = []
+            end = step_num
+            total_time = durations[step_num]
+            while end + 1 < len(entries) and self._is_continuous_fade(durations, entries, end + 1):
+                new_total_time = total_time + durations[end + 1]
+                if 0 < max_fade_ms < new_total_time * 1000:
+                    break
+                new_points = points + [(total_time, entries[end][1][1].rgb)]
+                if not self._is_on_line(start_rgb, entries[end + 1][1][1].rgb, new_total_time, new_points):
+                    break
+                points = new_points
+                total_time = new_total_time
+                end += 1
+
+            if end > step_num:
+                yield step_num, end
+            step_num = end + 1
+
+    @staticmethod
+    def _is_on_line(start_rgb, end_rgb, total_time, points):
+        """Return true if all colors are within rounding distance of a fade from start to end."""
+        for point_time, rgb in points:
+            ratio = point_time / total_time
+            for channel in range(3):
+                expected = start_rgb[channel] + (end_rgb[channel] - start_rgb[channel]) * ratio
+                if abs(expected - rgb[channel]) > 1:
+                    return False
+        return True
+
     def _remove(self, settings, context, key=""):
         instance_dict = self._get_instance_dict(context)
         full_context = self._get_full_context(context + key)
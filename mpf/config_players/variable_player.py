@@ -64,6 +64,15 @@ class VariablePlayer(ConfigPlayer):
     def play(self, settings: dict, context: str, calling_context: str,
              priority: int = 0, **kwargs) -> None:
         """Variable name."""
+        if self.machine.game and self.machine.game.player:
+            # post one event per variable after all variables have been set
+            with self.machine.game.player.batch():
+                self._play(settings, context, calling_context, priority, kwargs)
+        else:
+            self._play(settings, context, calling_context, priority, kwargs)
+
+    # pylint: disable-msg=too-many-arguments
+    def _play(self, settings: dict, context: str, calling_context: str, priority: int, kwargs: dict) -> None:
         for var, s in settings.items():
             if var == "block":
                 self.raise_config_error('Do not use "block" as variable name in variable_player.', 1, context=context)
@@ -4,6 +4,27 @@ import abc
 from mpf.core.mpf_controller import MpfController
 
 
+def get_state_message_key(bcp_command, kwargs):
+    """Return the key of a state message or None for all other messages.
+
+    A state message (player_variable, machine_variable, switch or device)
+    supersedes older messages with the same key. Those may be merged or
+    dropped when clients fall behind. Other messages must always be sent.
+    Switch keys include the state so a short hit still shows up as active
+    and inactive.
+    """
+    if bcp_command == "player_variable":
+        return bcp_command, kwargs.get("name"), kwargs.get("player_num")
+    if bcp_command == "machine_variable":
+        return bcp_command, kwargs.get("name")
+    if bcp_command == "switch":
+        return bcp_command, kwargs.get("name"), kwargs.get("state")
+    if bcp_command == "device":
+        changes = kwargs.get("changes")
+        return bcp_command, kwargs.get("type"), kwargs.get("name"), changes[0] if changes else None
+    return None
+
+
 class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
 
     """Base class for bcp clients."""
@@ -33,6 +54,16 @@ class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
         """Send data to client."""
         raise NotImplementedError("implement")
 
+    def send_batch(self, messages):
+        """Send a list of (bcp_command, kwargs) to client."""
+        for bcp_command, kwargs in messages:
+            self.send(bcp_command, kwargs)
+
+    def get_send_buffer_metrics(self):
+        """Return metrics about data which has not been sent yet."""
+        return {"transport_bytes": 0, "buffered_bytes": 0, "buffered_messages": 0, "dropped_messages": 0,
+                "coalesced_messages": 0}
+
     def stop(self):
         """Stop client connection."""
         raise NotImplementedError("implement")
@@ -4,12 +4,16 @@ from copy import deepcopy
 from mpf.core.rgb_color import ColorException
 
 from mpf.core.events import PostedEvent
+from mpf.core.memory_report import create_memory_snapshot, diff_memory_snapshots
 from mpf.core.player import Player
 from mpf.core.utility_functions import Util
 from mpf.core.mpf_controller import MpfController
 from mpf.core.switch_controller import MonitoredSwitchChange
 from mpf.exceptions.driver_limits_error import DriverLimitsError
 
+# memory snapshots stored for later diffs
+MAX_MEMORY_SNAPSHOTS = 10
+
 
 class BcpInterface(MpfController):
 
@@ -23,12 +27,14 @@ class BcpInterface(MpfController):
         error
         get
         hello?version=xxx&controller_name=xxx&controller_version=xxx
+        memory_report?snapshot=xxx&diff=xxx
         mode_start?name=xxx&priority=xxx
         mode_stop?name=xxx
         player_added?player_num=x
         player_variable?name=x&value=x&prev_value=x&change=x&player_num=x
         set
         shot?name=x
+        show_profile?enable=x&reset=x
         switch?name=x&state=x
         timer
         trigger?name=xxx
@@ -38,7 +44,7 @@ class BcpInterface(MpfController):
     config_name = "bcp_interface"
 
     __slots__ = ["configured", "config", "_client_reset_queue", "_client_reset_complete_status", "bcp_receive_commands",
-                 "_shows"]
+                 "_shows", "_memory_snapshots"]
 
     def __init__(self, machine):
         """Initialize BCP."""
@@ -67,8 +73,11 @@ class BcpInterface(MpfController):
             monitor_stop=self._bcp_receive_monitor_stop,
             set_machine_var=self._bcp_receive_set_machine_var,
             service=self._service,
+            memory_report=self._bcp_receive_memory_report,
+            show_profile=self._bcp_receive_show_profile,
         )
         self._shows = {}
+        self._memory_snapshots = {}
 
         self.machine.events.add_handler('machine_reset_phase_1', self.bcp_reset)
 
@@ -115,6 +124,54 @@ class BcpInterface(MpfController):
         desc: Extended version of MC. This is set after MC got connected. Contains BCP and show version numbers.
         '''
 
+    async def _bcp_receive_memory_report(self, client, snapshot=None, diff=None, **kwargs):
+        """Send a memory report.
+
+        If snapshot is set the report is stored under that name. If diff is set
+        the report is compared to the stored snapshot with that name.
+        """
+        del kwargs
+        report = create_memory_snapshot(self.machine)
+        if snapshot:
+            # keep only the latest snapshots. storing a name again makes it the latest
+            self._memory_snapshots.pop(snapshot, None)
+            self._memory_snapshots[snapshot] = report
+            while len(self._memory_snapshots) > MAX_MEMORY_SNAPSHOTS:
+                del self._memory_snapshots[next(iter(self._memory_snapshots))]
+        changes = None
+        if diff:
+            if diff not in self._memory_snapshots:
+                self.machine.bcp.transport.send_to_client(client, "memory_report",
+                                                          error="Snapshot {} not found".format(diff))
+                return
+            changes = diff_memory_snapshots(self._memory_snapshots[diff], report)
+        self.machine.bcp.transport.send_to_client(client, "memory_report", report=report, diff=changes, error=False)
+
+    async def _bcp_receive_show_profile(self, client, enable=None, reset=False, **kwargs):
+        """Send the show profile.
+
+        If enable is true the profiler is started (and reset if reset is set).
+        If enable is false the profiler is stopped after this report.
+        """
+        del kwargs
+        try:
+            enable = Util.string_to_bool(enable)
+            reset = Util.string_to_bool(reset)
+        except ValueError as e:
+            self.machine.bcp.transport.send_to_client(client, "show_profile", error=str(e))
+            return
+        show_controller = self.machine.show_controller
+        if enable:
+            show_controller.enable_profiler(reset=reset)
+        if not show_controller.show_profiler:
+            self.machine.bcp.transport.send_to_client(client, "show_profile",
+                                                      error="Show profiler is not enabled")
+            return
+        report = show_controller.show_profiler.get_report()
+        if enable is False:
+            show_controller.disable_profiler()
+        self.machine.bcp.transport.send_to_client(client, "show_profile", report=report, error=False)
+
     async def _service_stop(self, client):
         for show in self._shows.values():
             show.stop()
@@ -370,7 +427,7 @@ class BcpInterface(MpfController):
 
     def monitor_posted_event(self, posted_event: PostedEvent):
         """Send monitored posted event to bcp clients."""
-        self.machine.bcp.transport.send_to_clients_with_handler(
+        self.machine.bcp.transport.queue_monitor_message(
             handler="_monitor_events",
             bcp_command="monitored_event",
             event_name=posted_event.event,
@@ -378,8 +435,7 @@ class BcpInterface(MpfController):
             event_callback=posted_event.callback,
             event_kwargs=Util.convert_to_simply_type(posted_event.kwargs),
             registered_handlers=Util.convert_to_simply_type(
-                self.machine.events.registered_handlers.get(posted_event.event, []))
-        )
+                self.machine.events.registered_handlers.get(posted_event.event, [])))
 
     def _monitor_devices(self, client):
         """Register client to get notified of device changes."""
@@ -407,7 +463,7 @@ class BcpInterface(MpfController):
         if not self.configured:
             return
 
-        self.machine.bcp.transport.send_to_clients_with_handler(
+        self.machine.bcp.transport.queue_monitor_message(
             handler="_devices",
             bcp_command='device',
             type=device.class_label,
@@ -430,7 +486,7 @@ class BcpInterface(MpfController):
 
     def _notify_switch_changes(self, change: MonitoredSwitchChange):
         """Notify all listeners about switch change."""
-        self.machine.bcp.transport.send_to_clients_with_handler(
+        self.machine.bcp.transport.queue_monitor_message(
             handler="_switches",
             bcp_command='switch',
             name=change.name,
@@ -440,7 +496,7 @@ class BcpInterface(MpfController):
         # Setup player variables to be monitored (if necessary)
         if not self.machine.bcp.transport.get_transports_for_handler("_player_vars"):
             Player.monitor_enabled = True
-            self.machine.register_monitor('player', self._player_var_change)
+            self.machine.register_monitor('player_vars', self._player_var_changes)
 
         self.machine.bcp.transport.add_handler_to_transport("_player_vars", client)
 
@@ -480,19 +536,19 @@ class BcpInterface(MpfController):
                                                       name=var_name,
                                                       value=settings['value'])
 
-    # pylint: disable-msg=too-many-arguments
-    def _player_var_change(self, name, value, prev_value, change, player_num):
-        self.machine.bcp.transport.send_to_clients_with_handler(
-            handler="_player_vars",
-            bcp_command='player_variable',
-            name=name,
-            value=value,
-            prev_value=prev_value,
-            change=change,
-            player_num=player_num)
+    def _player_var_changes(self, changes):
+        for change in changes:
+            self.machine.bcp.transport.queue_monitor_message(
+                handler="_player_vars",
+                bcp_command='player_variable',
+                name=change.name,
+                value=change.value,
+                prev_value=change.prev_value,
+                change=change.change,
+                player_num=change.player_num)
 
     def _machine_var_change(self, name, value, prev_value, change):
-        self.machine.bcp.transport.send_to_clients_with_handler(
+        self.machine.bcp.transport.queue_monitor_message(
             handler="_machine_vars",
             bcp_command='machine_variable',
             name=name,
@@ -4,10 +4,11 @@ from urllib.parse import urlsplit, parse_qs, quote, unquote, urlunparse
 
 import asyncio
 
-from typing import Tuple
+from itertools import count
+from typing import Tuple, Optional, Dict, Any
 
 from mpf._version import __version__, __bcp_version__
-from mpf.core.bcp.bcp_client import BaseBcpClient
+from mpf.core.bcp.bcp_client import BaseBcpClient, get_state_message_key
 
 BYTE_MARKER = b'&bytes='
 
@@ -208,7 +209,9 @@ class BCPClientSocket(BaseBcpClient):
 
     config_name = 'bcp_client'
 
-    __slots__ = ["_sender", "_receiver", "_send_goodbye", "_receive_buffer", "_bcp_client_socket_commands", "__dict__"]
+    __slots__ = ["_sender", "_receiver", "_send_goodbye", "_receive_buffer", "_bcp_client_socket_commands",
+                 "_send_buffer", "_send_buffer_bytes", "_drain_task", "_message_keys", "_high_watermark",
+                 "_low_watermark", "_max_send_buffer", "dropped_messages", "coalesced_messages", "__dict__"]
 
     def __init__(self, machine, name, bcp):
         """Initialize BCP client socket."""
@@ -219,6 +222,17 @@ class BCPClientSocket(BaseBcpClient):
         self._send_goodbye = True
         self._receive_buffer = b''
 
+        self._send_buffer = None        # type: Optional[Dict[Any, bytes]]
+        # messages which wait until the transport drained. None if the transport accepts writes
+        self._send_buffer_bytes = 0
+        self._drain_task = None         # type: Optional[asyncio.Task]
+        self._message_keys = count()
+        self._high_watermark = self.machine.config['bcp']['send_buffer_high_watermark']
+        self._low_watermark = self.machine.config['bcp']['send_buffer_low_watermark']
+        self._max_send_buffer = self.machine.config['bcp']['send_buffer_max_size']
+        self.dropped_messages = 0
+        self.coalesced_messages = 0
+
         self._bcp_client_socket_commands = {'hello': self._receive_hello,
                                             'goodbye': self._receive_goodbye}
 
@@ -252,6 +266,7 @@ class BCPClientSocket(BaseBcpClient):
 
         self.info_log("Connected BCP to '%s' %s:%s", self.name, client_host, client_port)
 
+        self._set_write_buffer_limits()
         self.send_hello()
         return True
 
@@ -260,8 +275,14 @@ class BCPClientSocket(BaseBcpClient):
         self._receiver = receiver
         self._sender = sender
 
+        self._set_write_buffer_limits()
         self.send_hello()
 
+    def _set_write_buffer_limits(self):
+        # drain() waits until the transport buffer is below the low watermark
+        if hasattr(self._sender.transport, "set_write_buffer_limits"):
+            self._sender.transport.set_write_buffer_limits(high=self._high_watermark, low=self._low_watermark)
+
     def stop(self):
         """Stop and shut down the socket client."""
         self.debug_log("Stopping socket client")
@@ -269,6 +290,12 @@ class BCPClientSocket(BaseBcpClient):
         if self._send_goodbye:
             self.send_goodbye()
 
+        if self._drain_task:
+            self._drain_task.cancel()
+            self._drain_task = None
+        self._send_buffer = None
+        self._send_buffer_bytes = 0
+
         self._sender.close()
 
     def send(self, bcp_command, kwargs):
@@ -289,10 +316,115 @@ class BCPClientSocket(BaseBcpClient):
         if self._debug:
             self.debug_log('Sending "%s"', bcp_string)
 
+        self._write([(self._get_message_key(bcp_command, kwargs), (bcp_string + '\n').encode())])
+
+    def send_batch(self, messages):
+        """Send a list of messages to the BCP host in one write.
+
+        Args:
+        ----
+            messages: List of (bcp_command, kwargs)
+        """
+        encoded_messages = []
+        for bcp_command, kwargs in messages:
+            try:
+                bcp_string = encode_command_string(bcp_command, **kwargs)
+            # pylint: disable-msg=broad-except
+            except Exception as e:
+                self.warning_log("Failed to encode bcp_command %s with args %s. %s", bcp_command, kwargs, e)
+                continue
+            encoded_messages.append((self._get_message_key(bcp_command, kwargs), (bcp_string + '\n').encode()))
+
+        if not encoded_messages:
+            return
+
+        if self._debug:
+            self.debug_log('Sending batch "%s"', encoded_messages)
+
+        self._write(encoded_messages)
+
+    def _get_message_key(self, bcp_command, kwargs):
+        """Return the state key of a message or a unique number for messages which cannot be dropped."""
+        key = get_state_message_key(bcp_command, kwargs)
+        if key is None:
+            return next(self._message_keys)
+        return key
+
+    def _write(self, messages):
+        """Write messages or buffer them while the transport is above the high watermark."""
         if hasattr(self._sender.transport, "is_closing") and self._sender.transport.is_closing():
             self.warning_log("Failed to write to bcp since transport is closing. Transport %s", self._sender.transport)
             return
-        self._sender.write((bcp_string + '\n').encode())
+
+        if self._send_buffer is None:
+            self._sender.write(b''.join(data for _, data in messages))
+            if self._get_transport_buffer_size() > self._high_watermark:
+                # the remote side does not keep up. buffer further messages until it drained
+                self._send_buffer = {}
+                self._drain_task = asyncio.ensure_future(self._drain())
+            return
+
+        for key, data in messages:
+            old_data = self._send_buffer.pop(key, None)
+            if old_data is not None:
+                self._send_buffer_bytes -= len(old_data)
+                self.coalesced_messages += 1
+            self._send_buffer[key] = data
+            self._send_buffer_bytes += len(data)
+
+        if self._send_buffer_bytes <= self._max_send_buffer:
+            return
+
+        # drop the oldest state messages first. a client which misses one only shows an older state until the next
+        # change of that variable, switch or device
+        for key in [key for key in self._send_buffer if isinstance(key, tuple)]:
+            self._send_buffer_bytes -= len(self._send_buffer.pop(key))
+            self.dropped_messages += 1
+            if self._send_buffer_bytes <= self._max_send_buffer:
+                return
+
+        # only messages which must not be dropped are left. the client cannot keep up
+        self.warning_log("Send buffer exceeded %s bytes with messages which cannot be dropped. Disconnecting.",
+                         self._max_send_buffer)
+        self._disconnect()
+
+    def _disconnect(self):
+        """Close the connection. The receive loop will unregister this client."""
+        if self._drain_task:
+            self._drain_task.cancel()
+            self._drain_task = None
+        self._send_buffer = None
+        self._send_buffer_bytes = 0
+        self._send_goodbye = False
+        # do not wait for the remote side to read what is left in the transport
+        self._sender.transport.abort()
+
+    def _get_transport_buffer_size(self):
+        if not self._sender or not hasattr(self._sender.transport, "get_write_buffer_size"):
+            return 0
+        return self._sender.transport.get_write_buffer_size()
+
+    async def _drain(self):
+        try:
+            await self._sender.drain()
+        except OSError:
+            # the connection is gone. the receive loop will unregister this client
+            return
+
+        buffer = self._send_buffer
+        self._send_buffer = None
+        self._send_buffer_bytes = 0
+        self._drain_task = None
+        if buffer:
+            self._write(list(buffer.items()))
+
+    def get_send_buffer_metrics(self):
+        """Return bytes in the transport and the send buffer and the number of dropped and coalesced messages."""
+        return {"transport_bytes": self._get_transport_buffer_size(),
+                "buffered_bytes": self._send_buffer_bytes,
+                "buffered_messages": len(self._send_buffer) if self._send_buffer else 0,
+                "dropped_messages": self.dropped_messages,
+                "coalesced_messages": self.coalesced_messages}
 
     # pylint: disable-msg=inconsistent-return-statements
     async def read_message(self):
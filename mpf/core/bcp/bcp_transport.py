@@ -1,9 +1,10 @@
 """Classes which manage BCP transports."""
 from collections import defaultdict
+from itertools import count
 
-from typing import Union
+from typing import Union, Dict, Tuple, Any
 
-from mpf.core.bcp.bcp_client import BaseBcpClient
+from mpf.core.bcp.bcp_client import BaseBcpClient, get_state_message_key
 from mpf.core.utility_functions import Util
 
 MYPY = False  # noqa
@@ -15,7 +16,9 @@ class BcpTransportManager:
 
     """Manages BCP transports."""
 
-    __slots__ = ["_machine", "_transports", "_readers", "_handlers"]
+    __slots__ = ["_machine", "_transports", "_readers", "_handlers", "_monitor_queues", "_monitor_keys",
+                 "_monitor_flush_scheduled", "monitor_flush_interval", "monitor_max_pending",
+                 "merged_monitor_messages", "dropped_monitor_messages"]
 
     def __init__(self, machine):
         """Initialize BCP transport manager."""
@@ -23,6 +26,21 @@ class BcpTransportManager:
         self._transports = []
         self._readers = {}
         self._handlers = defaultdict(set)
+        self._monitor_queues = {}   # type: Dict[BaseBcpClient, Dict[Any, Tuple[str, dict]]]
+        # monitor messages per client which have not been sent yet
+        self._monitor_keys = count()
+        self._monitor_flush_scheduled = False
+
+        if self._machine.config.get('bcp'):
+            self.monitor_flush_interval = Util.string_to_ms(
+                self._machine.config['bcp']['monitor_flush_interval']) / 1000.0
+            self.monitor_max_pending = self._machine.config['bcp']['monitor_max_pending']
+        else:
+            # bcp is disabled. there will be no clients to queue messages for
+            self.monitor_flush_interval = 0
+            self.monitor_max_pending = 0
+        self.merged_monitor_messages = 0
+        self.dropped_monitor_messages = 0
         self._machine.events.add_handler("shutdown", self.shutdown)
 
     def add_handler_to_transport(self, handler, transport: BaseBcpClient):
@@ -64,6 +82,8 @@ class BcpTransportManager:
         if transport in self._transports:
             self._transports.remove(transport)
 
+        self._monitor_queues.pop(transport, None)
+
         # remove transport from all handlers
         for handler in self._handlers:
             if transport in self._handlers[handler]:
@@ -76,6 +96,10 @@ class BcpTransportManager:
         if transport.exit_on_close:
             self._machine.stop("BCP client {} disconnected and exit_on_close is set".format(transport.name))
 
+    def get_send_buffer_metrics(self):
+        """Return send buffer metrics per client name."""
+        return {client.name: client.get_send_buffer_metrics() for client in self._transports}
+
     def get_all_clients(self):
         """Get a list of all clients."""
         return self._transports
@@ -99,12 +123,101 @@ class BcpTransportManager:
 
     def send_to_client(self, client: BaseBcpClient, bcp_command, **kwargs):
         """Send command to a specific bcp client."""
+        if client in self._monitor_queues:
+            # keep the order of messages
+            self._flush_monitor_queue(client)
         try:
             client.send(bcp_command, kwargs)
         except OSError:
             client.stop()
             self.unregister_transport(client)
 
+    def queue_monitor_message(self, handler, bcp_command, **kwargs):
+        """Queue a monitor message for all clients of a handler.
+
+        Messages are sent in batches per client at the end of the monitor
+        flush interval or before any other message to the same client. A
+        queued state message (see get_state_message_key) is replaced by a
+        newer one with the same key which starts at the old value of the
+        replaced message. When more than monitor_max_pending messages are
+        queued for a client the oldest state message is dropped. Other
+        messages (e.g. monitored events) are never dropped.
+
+        Args:
+        ----
+            handler: Handler which the clients registered for.
+            bcp_command: Command to send.
+            **kwargs: Parameters of the command.
+        """
+        clients = self._handlers.get(handler)
+        if not clients:
+            return
+
+        if not self.monitor_flush_interval:
+            self.send_to_clients(clients, bcp_command, **kwargs)
+            return
+
+        merge_key = get_state_message_key(bcp_command, kwargs)
+        if merge_key is None:
+            merge_key = next(self._monitor_keys)
+
+        for client in clients:
+            queue = self._monitor_queues.get(client)
+            if queue is None:
+                queue = self._monitor_queues[client] = {}
+
+            client_kwargs = kwargs
+            old_message = queue.pop(merge_key, None)
+            if old_message:
+                self.merged_monitor_messages += 1
+                client_kwargs = self._merge_monitor_message(old_message[1], kwargs)
+            elif len(queue) >= self.monitor_max_pending:
+                # state keys are tuples. the keys of other messages are numbers
+                oldest_state_key = next((key for key in queue if isinstance(key, tuple)), None)
+                if oldest_state_key is not None:
+                    del queue[oldest_state_key]
+                    self.dropped_monitor_messages += 1
+
+            queue[merge_key] = (bcp_command, client_kwargs)
+
+        if not self._monitor_flush_scheduled:
+            self._monitor_flush_scheduled = True
+            self._machine.clock.schedule_once(self._flush_scheduled_monitor_messages, self.monitor_flush_interval)
+
+    @staticmethod
+    def _merge_monitor_message(old_kwargs, kwargs):
+        """Return the parameters of a state message which replaces the queued message with old_kwargs."""
+        old_changes = old_kwargs.get("changes")
+        if old_changes and kwargs.get("changes"):
+            return dict(kwargs, changes=(old_changes[0], old_changes[1], kwargs["changes"][2]))
+        if "prev_value" in old_kwargs and "prev_value" in kwargs:
+            prev_value = old_kwargs["prev_value"]
+            try:
+                change = kwargs["value"] - prev_value
+            except TypeError:
+                change = prev_value != kwargs["value"]
+            return dict(kwargs, prev_value=prev_value, change=change)
+        return kwargs
+
+    def _flush_scheduled_monitor_messages(self):
+        self._monitor_flush_scheduled = False
+        self.flush_monitor_messages()
+
+    def flush_monitor_messages(self):
+        """Send all queued monitor messages."""
+        for client in list(self._monitor_queues):
+            self._flush_monitor_queue(client)
+
+    def _flush_monitor_queue(self, client: BaseBcpClient):
+        queue = self._monitor_queues.pop(client, None)
+        if not queue:
+            return
+        try:
+            client.send_batch(list(queue.values()))
+        except OSError:
+            client.stop()
+            self.unregister_transport(client)
+
     def send_to_all_clients(self, bcp_command, **kwargs):
         """Send command to all bcp clients."""
         for client in self._transports:
@@ -113,6 +226,7 @@ class BcpTransportManager:
     def shutdown(self, **kwargs):
         """Prepare the BCP clients for MPF shutdown."""
         del kwargs
+        self.flush_monitor_messages()
         for client in list(self._transports):
             client.stop()
             self.unregister_transport(client)
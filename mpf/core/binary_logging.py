@@ -0,0 +1,352 @@
+"""Compact binary logging with a bounded in-memory ring and rotating compressed files.
+
+Records are stored as (timestamp, logger id, format id, level, args) without
+formatting the message. Logger names and format strings are interned once and
+written as definition entries in front of the first record which uses them in
+each file. The format table is capped. Once it is full, new messages are
+stored formatted as an argument of a plain "%s" format.
+Use ``mpf decode_log`` to render the files as text.
+"""
+import gzip
+import logging
+import os
+import struct
+import threading
+from collections import deque
+from logging.handlers import QueueHandler
+from queue import Queue, Full, Empty
+from typing import Dict, List, Iterator, Tuple, Optional, BinaryIO
+
+KIND_LOGGER = 0x4c     # "L"
+KIND_FORMAT = 0x46     # "F"
+KIND_RECORD = 0x52     # "R"
+
+_DEFINITION = struct.Struct("<BII")
+_RECORD = struct.Struct("<BdHIBB")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LENGTH = struct.Struct("<I")
+
+ARG_NONE = 0x4e         # "N"
+ARG_TRUE = 0x54         # "T"
+ARG_FALSE = 0x46        # "F"
+ARG_INT = 0x69          # "i"
+ARG_FLOAT = 0x66        # "f"
+ARG_STR = 0x73          # "s"
+
+# format used for messages which do not fit into the format table any more
+LITERAL_FORMAT = "%s"
+
+_MIN_INT = -(1 << 63)
+_MAX_INT = (1 << 63) - 1
+
+
+def encode_args(args) -> bytes:
+    """Encode log args compactly.
+
+    Ints, floats, bools, None and strings keep their type. Everything else is
+    stored as its string representation.
+    """
+    parts = []
+    for arg in args:
+        if arg is None:
+            parts.append(b"N")
+        elif arg is True:
+            parts.append(b"T")
+        elif arg is False:
+            parts.append(b"F")
+        elif isinstance(arg, int) and _MIN_INT <= arg <= _MAX_INT:
+            parts.append(b"i" + _INT.pack(arg))
+        elif isinstance(arg, float):
+            parts.append(b"f" + _FLOAT.pack(arg))
+        else:
+            value = (arg if isinstance(arg, str) else str(arg)).encode("utf-8", "replace")
+            parts.append(b"s" + _LENGTH.pack(len(value)) + value)
+    return b"".join(parts)
+
+
+def decode_args(data: bytes, offset: int, count: int) -> Tuple[tuple, int]:
+    """Decode ``count`` args from data starting at offset.
+
+    Returns the args and the offset after the last arg.
+    """
+    args = []
+    for _ in range(count):
+        arg_type = data[offset]
+        offset += 1
+        if arg_type == ARG_NONE:
+            args.append(None)
+        elif arg_type == ARG_TRUE:
+            args.append(True)
+        elif arg_type == ARG_FALSE:
+            args.append(False)
+        elif arg_type == ARG_INT:
+            args.append(_INT.unpack_from(data, offset)[0])
+            offset += _INT.size
+        elif arg_type == ARG_FLOAT:
+            args.append(_FLOAT.unpack_from(data, offset)[0])
+            offset += _FLOAT.size
+        elif arg_type == ARG_STR:
+            length = _LENGTH.unpack_from(data, offset)[0]
+            offset += _LENGTH.size
+            args.append(data[offset:offset + length].decode("utf-8", "replace"))
+            offset += length
+        else:
+            raise ValueError("Invalid arg type {} at offset {}".format(arg_type, offset - 1))
+    return tuple(args), offset
+
+
+class BinaryLogHandler(logging.Handler):
+
+    """Log handler which stores records in a compact binary format.
+
+    The handler never blocks the caller. Every record is encoded, appended to a
+    bounded in-memory ring and queued for a background thread which writes
+    rotating gzip files. When the queue is full the record is dropped from the
+    file and counted in ``dropped_records``.
+    """
+
+    def __init__(self, filename: Optional[str], ring_size: int = 10000, queue_size: int = 10000,
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5, max_formats: int = 2000) -> None:
+        """Initialise binary log handler.
+
+        Args:
+        ----
+            filename: Base file name of the log. Rotated files get a suffix of
+                ".1", ".2" and so on. Use None to only keep the in-memory ring.
+            ring_size: Number of most recent records kept in memory.
+            queue_size: Maximum number of records waiting to be written.
+            max_bytes: Uncompressed bytes written per file before rotating.
+            backup_count: Number of rotated files to keep.
+            max_formats: Maximum number of interned format strings. Messages
+                with new formats are stored as literal text after that.
+        """
+        super().__init__()
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_formats = max_formats
+        self.literal_messages = 0
+        self.ring = deque(maxlen=ring_size)     # type: deque
+        self.dropped_records = 0
+        self.ring_overwrites = 0
+        self.records = 0
+        self.logger_names = []                  # type: List[str]
+        self.formats = []                       # type: List[str]
+        self._logger_ids = {}                   # type: Dict[str, int]
+        self._format_ids = {}                   # type: Dict[str, int]
+        self._exception_formatter = logging.Formatter()
+        self._queue = Queue(maxsize=queue_size)     # type: Queue
+        self._thread = None                     # type: Optional[threading.Thread]
+        if filename:
+            self._thread = threading.Thread(target=self._writing_thread, name="binary_log_writer", daemon=True)
+            self._thread.start()
+
+    def _intern(self, value: str, ids: Dict[str, int], table: List[str]) -> int:
+        try:
+            return ids[value]
+        except KeyError:
+            ids[value] = len(table)
+            table.append(value)
+            return ids[value]
+
+    def encode(self, record: logging.LogRecord) -> bytes:
+        """Encode a log record."""
+        msg = record.msg if isinstance(record.msg, str) else str(record.msg)
+        args = record.args
+        if isinstance(args, dict):
+            # mapping args cannot be stored positionally. format them now.
+            msg = msg % args
+            args = ()
+        elif not args:
+            args = ()
+        if record.exc_info:
+            # keep the traceback. exceptions are not on the hot path.
+            args = (record.getMessage(), self._exception_formatter.formatException(record.exc_info))
+            msg = "%s\n%s"
+        if msg not in self._format_ids and len(self.formats) >= self.max_formats:
+            # pre-formatted messages would grow the table for ever. store the message itself instead.
+            self.literal_messages += 1
+            args = (msg % args if args else msg, )
+            msg = LITERAL_FORMAT
+        logger_id = self._intern(record.name, self._logger_ids, self.logger_names)
+        format_id = self._intern(msg, self._format_ids, self.formats)
+        return _RECORD.pack(KIND_RECORD, record.created, logger_id, format_id, min(record.levelno, 255),
+                            len(args)) + encode_args(args)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Store record in ring and queue it for writing."""
+        try:
+            data = self.encode(record)
+        except Exception:   # pylint: disable-msg=broad-except
+            self.handleError(record)
+            return
+        self.records += 1
+        if len(self.ring) == self.ring.maxlen:
+            self.ring_overwrites += 1
+        self.ring.append(data)
+        if not self._thread:
+            return
+        try:
+            self._queue.put_nowait(data)
+        except Full:
+            self.dropped_records += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counters of this handler."""
+        return {
+            "records": self.records,
+            "dropped_records": self.dropped_records,
+            "ring_overwrites": self.ring_overwrites,
+            "queued": self._queue.qsize(),
+            "loggers": len(self.logger_names),
+            "formats": len(self.formats),
+            "literal_messages": self.literal_messages,
+        }
+
+    def _definitions_for(self, data: bytes, written_loggers: set, written_formats: set) -> bytes:
+        _, _, logger_id, format_id, _, _ = _RECORD.unpack_from(data)
+        result = b""
+        if logger_id not in written_loggers:
+            written_loggers.add(logger_id)
+            name = self.logger_names[logger_id].encode("utf-8", "replace")
+            result += _DEFINITION.pack(KIND_LOGGER, logger_id, len(name)) + name
+        if format_id not in written_formats:
+            written_formats.add(format_id)
+            fmt = self.formats[format_id].encode("utf-8", "replace")
+            result += _DEFINITION.pack(KIND_FORMAT, format_id, len(fmt)) + fmt
+        return result
+
+    def write_records(self, file: BinaryIO, records) -> int:
+        """Write records including all required definitions to an open file.
+
+        Returns the number of bytes written.
+        """
+        written_loggers = set()     # type: set
+        written_formats = set()     # type: set
+        written = 0
+        for data in records:
+            data = self._definitions_for(data, written_loggers, written_formats) + data
+            file.write(data)
+            written += len(data)
+        return written
+
+    def dump_ring(self, filename: str) -> None:
+        """Write the in-memory ring to a standalone compressed file."""
+        with gzip.open(filename, "wb") as file:
+            self.write_records(file, list(self.ring))
+
+    def _rotate(self):
+        if self.backup_count <= 0:
+            os.remove(self.filename)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = "{}.{}".format(self.filename, i)
+            if os.path.exists(source):
+                os.replace(source, "{}.{}".format(self.filename, i + 1))
+        os.replace(self.filename, self.filename + ".1")
+
+    def _writing_thread(self):  # pragma: no cover
+        file = gzip.open(self.filename, "wb")
+        written_loggers = set()     # type: set
+        written_formats = set()     # type: set
+        written = 0
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            batch = [data]
+            # write everything which is waiting in one go
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except Empty:
+                pass
+            stop = batch[-1] is None
+            for data in batch:
+                if data is None:
+                    continue
+                data = self._definitions_for(data, written_loggers, written_formats) + data
+                file.write(data)
+                written += len(data)
+                if written >= self.max_bytes:
+                    file.close()
+                    self._rotate()
+                    file = gzip.open(self.filename, "wb")
+                    written_loggers = set()
+                    written_formats = set()
+                    written = 0
+            if stop:
+                break
+        file.close()
+
+    def close(self) -> None:
+        """Flush pending records and stop the writer thread."""
+        if self._thread:
+            # the writer has to get the sentinel even if the queue is full
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        super().close()
+
+
+class BoundedQueueHandler(QueueHandler):
+
+    """QueueHandler which drops records when its bounded queue is full."""
+
+    def __init__(self, queue: Queue) -> None:
+        """Initialise handler."""
+        super().__init__(queue)
+        self.dropped_records = 0
+
+    def enqueue(self, record):
+        """Enqueue record or count it as dropped."""
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped_records += 1
+
+
+def read_entries(file: BinaryIO) -> Iterator[Tuple[float, str, int, str, tuple]]:
+    """Decode a binary log stream.
+
+    Yields tuples of (timestamp, logger name, level, format, args).
+    """
+    data = file.read()
+    loggers = {}    # type: Dict[int, str]
+    formats = {}    # type: Dict[int, str]
+    offset = 0
+    end = len(data)
+    while offset < end:
+        kind = data[offset]
+        if kind == KIND_RECORD:
+            _, timestamp, logger_id, format_id, level, argc = _RECORD.unpack_from(data, offset)
+            args, offset = decode_args(data, offset + _RECORD.size, argc)
+            yield (timestamp, loggers.get(logger_id, "<logger {}>".format(logger_id)), level,
+                   formats.get(format_id, "<format {}>".format(format_id)), args)
+        elif kind in (KIND_LOGGER, KIND_FORMAT):
+            _, definition_id, length = _DEFINITION.unpack_from(data, offset)
+            offset += _DEFINITION.size
+            table = loggers if kind == KIND_LOGGER else formats
+            table[definition_id] = data[offset:offset + length].decode("utf-8", "replace")
+            offset += length
+        else:
+            raise ValueError("Invalid entry type {} at offset {}".format(kind, offset))
+
+
+def open_log_file(filename: str) -> BinaryIO:
+    """Open a binary log file which may or may not be gzip compressed."""
+    with open(filename, "rb") as file:
+        magic = file.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(filename, "rb")
+    return open(filename, "rb")
+
+
+def entry_to_record(entry: Tuple[float, str, int, str, tuple]) -> logging.LogRecord:
+    """Turn a decoded entry back into a log record."""
+    timestamp, name, level, fmt, args = entry
+    record = logging.makeLogRecord({"name": name, "levelno": level, "levelname": logging.getLevelName(level),
+                                    "msg": fmt, "args": args, "created": timestamp})
+    record.msecs = (timestamp - int(timestamp)) * 1000
+    return record
@@ -365,6 +365,36 @@ class ConfigPlayer(LogMixin, metaclass=abc.ABCMeta):
         self.play(settings=settings, priority=priority, calling_context=calling_context,
                   show_tokens=show_tokens, context=context, start_time=start_time)
 
+    def compile_show_entry(self, settings):
+        """Return a program to run this show entry on every step or None.
+
+        Called once per show and token set. Players which return a program
+        get it passed to play_show_program instead of show_play_callback.
+        """
+        del settings
+        return None
+
+    def play_show_program(self, program, context, priority, start_time):
+        """Run a program created by compile_show_entry."""
+        raise NotImplementedError
+
+    def start_show_tick(self):
+        """Start a tick in which the show controller runs the steps of multiple shows."""
+
+    def end_show_tick(self):
+        """End a show tick. Players may flush updates collected during the tick."""
+
+    def plan_show_programs(self, durations, programs):
+        """Return programs which were planned ahead across all steps of a show.
+
+        Called once per show and token set with the duration of every step and
+        the program of this player in that step (None if the step has no
+        compiled entry for this player). Planned programs are only played when
+        the show runs at normal speed without manual advance.
+        """
+        del durations
+        return programs
+
     def show_stop_callback(self, context):
         """Handle show stop."""
         self.clear_context(context)
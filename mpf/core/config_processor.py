@@ -8,6 +8,7 @@ import pickle   # nosec
 import tempfile
 
 from typing import List, Tuple, Any, Optional, Dict
+from copy import deepcopy
 from difflib import SequenceMatcher
 
 from mpf.core.config_spec_loader import ConfigSpecLoader
@@ -119,7 +120,10 @@ class ConfigProcessor:
                                                                                         ignore_unknown_sections,
                                                                                         config_spec=config_spec)
             loaded_files.update(file_subfiles)
-            config = Util.dict_merge(config, file_config)
+            config = Util.dict_merge_shared(config, file_config)
+
+        # the merged config shares subtrees with the file cache. copy it once before anybody modifies it.
+        config = deepcopy(config)
 
         # Step 5: Store to cache
         if self._store_cache:
@@ -174,7 +178,7 @@ class ConfigProcessor:
         # file being loaded is a machine config or a mode config file
         expected_version_str = ConfigProcessor.get_expected_version(config_type)
 
-        config = FileManager.load(filename, expected_version_str, True)
+        config = FileManager.load(filename, expected_version_str, True, shared=True)
         subfiles = {}
 
         if not config:
@@ -195,7 +199,7 @@ class ConfigProcessor:
                     subconfig, subsubfiles = self._load_config_file_and_return_loaded_files(full_file, config_type,
                                                                                             config_spec=config_spec)
                     subfiles.update(subsubfiles)
-                    config = Util.dict_merge(config, subconfig)
+                    config = Util.dict_merge_shared(config, subconfig)
             return config, subfiles
         except TypeError:
             return {}, {}
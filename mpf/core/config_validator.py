@@ -4,7 +4,6 @@ from functools import lru_cache
 
 import re
 from collections import namedtuple
-from copy import deepcopy
 
 from typing import Any
 from typing import Dict
@@ -132,9 +131,9 @@ class ConfigValidator:
             for spec in spec_element:
                 this_base_spec = this_base_spec[spec]
 
-            # need to deepcopy so the orig base spec doesn't get polluted
-            # with this widget's spec
-            this_base_spec = deepcopy(this_base_spec)
+            # only the top level changes. copy it so the orig base spec doesn't
+            # get polluted with this widget's spec and share everything below.
+            this_base_spec = dict(this_base_spec)
             this_base_spec.update(this_spec)
             this_spec = this_base_spec
 
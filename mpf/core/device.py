@@ -136,6 +136,10 @@ class Device(LogMixin, metaclass=abc.ABCMeta):
         self.tags = self.config['tags']
         self.label = self.config['label']
 
+        # some devices also add themselves to another collection (e.g. dual wound coils to coils)
+        for collection in self.machine.device_manager.collections.values():
+            collection.update_tags(self)
+
     def __repr__(self):
         """Return string representation."""
         return '<{self.class_label}.{self.name}>'.format(self=self)
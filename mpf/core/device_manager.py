@@ -1,7 +1,7 @@
 """Contains the DeviceManager base class."""
 import asyncio
 
-from typing import Callable, Tuple, List, Generator, Dict
+from typing import Callable, Tuple, List, Generator, Dict, Iterable, Set
 
 from mpf.core.utility_functions import Util
 from mpf.core.mpf_controller import MpfController
@@ -257,7 +257,8 @@ class DeviceCollection(dict):
     hardware device (such as coils, lights, switches, ball devices, etc.).
     """
 
-    __slots__ = ["machine", "name", "config_section", "_tag_cache"]
+    __slots__ = ["machine", "name", "config_section", "_tag_index", "_indexed_tags", "_positions", "_next_position",
+                 "_tag_cache", "_expression_cache"]
 
     def __init__(self, machine, collection, config_section):
         """Initialize device collection."""
@@ -266,17 +267,62 @@ class DeviceCollection(dict):
         self.machine = machine
         self.name = collection
         self.config_section = config_section
-        self._tag_cache = dict()
+        self._tag_index = dict()        # type: Dict[str, Set[str]]
+        # names of the devices per tag
+        self._indexed_tags = dict()     # type: Dict[str, Tuple[str, ...]]
+        # tags under which a device is currently indexed
+        self._positions = dict()        # type: Dict[str, int]
+        self._next_position = 0
+        # insertion order of devices. lists returned by items_tagged are sorted by it
+        self._tag_cache = dict()        # type: Dict[str, List[Device]]
+        self._expression_cache = dict()     # type: Dict[str, List[Device]]
 
     def __hash__(self):
         """Hash collection."""
         return hash((self.name, self.machine))
 
+    def __setitem__(self, key, value):
+        """Add device and index its tags."""
+        if key not in self:
+            self._positions[key] = self._next_position
+            self._next_position += 1
+        super().__setitem__(key, value)
+        self._index_tags(key, getattr(value, "tags", None) or [])
+
     def __delitem__(self, key):
         """Delete item for key."""
-        # clear the tag cache
-        self._tag_cache = dict()
-        return super().__delitem__(key)
+        super().__delitem__(key)
+        self._index_tags(key, [])
+        del self._positions[key]
+
+    def update_tags(self, device):
+        """Update the tag index after the tags of a device changed.
+
+        Args:
+        ----
+            device: Device in this collection.
+        """
+        if self.get(device.name) is device:
+            self._index_tags(device.name, device.tags)
+
+    def _index_tags(self, key, tags: Iterable[str]):
+        old_tags = self._indexed_tags.get(key, ())
+        new_tags = tuple(tags)
+        if old_tags == new_tags:
+            return
+
+        for tag in set(old_tags).difference(new_tags):
+            self._tag_index[tag].discard(key)
+            self._tag_cache.pop(tag, None)
+        for tag in set(new_tags).difference(old_tags):
+            self._tag_index.setdefault(tag, set()).add(key)
+            self._tag_cache.pop(tag, None)
+
+        if new_tags:
+            self._indexed_tags[key] = new_tags
+        else:
+            self._indexed_tags.pop(key, None)
+        self._expression_cache = dict()
 
     def __getattr__(self, attr):
         """Return device by key.
@@ -310,18 +356,42 @@ class DeviceCollection(dict):
         Args:
         ----
             tag: A string of the tag name which specifies what devices are
-                returned.  A value of "*" returns all devices.
-
-        Returns a list of device objects. If no devices are found with that tag, it
-        will return an empty list.
+                returned.  A value of "*" returns all devices. Tags can be
+                combined to an expression. "a&b" returns devices which have
+                both tags and "a|b" devices which have any of them. "&" binds
+                stronger than "|".
+
+        Returns a list of device objects in the order in which they were added
+        to the collection. If no devices are found with that tag, it will
+        return an empty list. The list must not be modified.
         """
         if tag == "*":
             return self.values()
 
-        items_in_tag_cache = self._tag_cache.get(tag, None)
-        if items_in_tag_cache is not None:
-            return items_in_tag_cache
+        items = self._tag_cache.get(tag, None)
+        if items is not None:
+            return items
 
-        items = [item for item in self.values() if hasattr(item, "tags") and tag in item.tags]
-        self._tag_cache[tag] = items
+        if tag in self._tag_index or ("&" not in tag and "|" not in tag):
+            items = self._sorted_devices(self._tag_index.get(tag, ()))
+            self._tag_cache[tag] = items
+            return items
+
+        items = self._expression_cache.get(tag, None)
+        if items is None:
+            items = self._expression_cache[tag] = self._sorted_devices(self._resolve_tag_expression(tag))
         return items
+
+    def _resolve_tag_expression(self, expression: str) -> Set[str]:
+        """Return names of all devices matching a tag expression."""
+        names = set()   # type: Set[str]
+        for term in expression.split("|"):
+            term_names = None
+            for tag in term.split("&"):
+                tag_names = self._tag_index.get(tag.strip(), set())
+                term_names = set(tag_names) if term_names is None else term_names.intersection(tag_names)
+            names.update(term_names)
+        return names
+
+    def _sorted_devices(self, names: Iterable[str]) -> List["Device"]:
+        return [self[name] for name in sorted(names, key=self._positions.__getitem__)]
@@ -1,6 +1,4 @@
 """Decorator to monitor devices."""
-import asyncio
-from collections import defaultdict
 
 from mpf.core.utility_functions import Util
 
@@ -55,10 +53,7 @@ class DeviceMonitor:
         def _notify_placeholder_change(self_inner, attribute_name, old, value):
             if old != value:
                 self_inner.machine.device_manager.notify_device_changes(self_inner, attribute_name, old, value)
-                for future in cls.attribute_futures[self_inner][attribute_name]:
-                    if not future.done():
-                        future.set_result(True)
-                cls.attribute_futures[self_inner][attribute_name] = []
+                self_inner.machine.placeholder_manager.variables.notify_change(("device", self_inner, attribute_name))
 
         def get_monitorable_state(self_inner):
             """Return monitorable state of device."""
@@ -73,10 +68,7 @@ class DeviceMonitor:
 
         def subscribe_attribute(self_inner, item, machine):
             """Subscribe to an attribute."""
-            del machine
-            future = asyncio.Future()
-            cls.attribute_futures[self_inner][item].append(future)
-            return future
+            return machine.placeholder_manager.variables.subscribe(("device", self_inner, item))
 
         def get_placeholder_value(self_inner, item):
             """Get the value of a placeholder."""
@@ -99,6 +91,5 @@ class DeviceMonitor:
         cls.get_placeholder_value = get_placeholder_value
         cls.subscribe_attribute = subscribe_attribute
         cls.notify_virtual_change = _notify_placeholder_change
-        cls.attribute_futures = defaultdict(lambda: defaultdict(list))
 
         return cls
@@ -34,7 +34,8 @@ class EventManager(MpfController):
 
     config_name = "event_manager"
 
-    __slots__ = ["registered_handlers", "event_queue", "callback_queue", "monitor_events", "_queue_tasks", "_stopped"]
+    __slots__ = ["registered_handlers", "event_queue", "callback_queue", "monitor_events", "_queue_tasks", "_stopped",
+                 "num_events_posted"]
 
     def __init__(self, machine: "MachineController") -> None:
         """Initialize EventManager."""
@@ -46,6 +47,7 @@ class EventManager(MpfController):
         self.monitor_events = False
         self._queue_tasks = []              # type: List[asyncio.Task]
         self._stopped = False
+        self.num_events_posted = 0
 
         self.add_handler("debug_dump_stats", self._debug_dump_events)
 
@@ -642,6 +644,7 @@ class EventManager(MpfController):
             self.warning_log("Event after stop: ===='%s'==== Type: %s, Callback: %s, "
                              "Args: %s", event, ev_type, callback, kwargs)
             return
+        self.num_events_posted += 1
         if self._debug:
             self.debug_log("Event: ===='%s'==== Type: %s, Callback: %s, "
                            "Args: %s", event, ev_type, callback, kwargs)
@@ -861,6 +864,9 @@ class EventManager(MpfController):
                 callback, kwargs = self.callback_queue.pop()
                 callback(**kwargs)
 
+        # resolve placeholder subscriptions once for all variables changed while processing the queue
+        self.machine.placeholder_manager.variables.flush()
+
 
 class QueuedEvent:
 
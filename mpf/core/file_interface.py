@@ -44,8 +44,11 @@ class FileInterface:
 
         return filename, os.path.splitext(filename)[1]
 
-    def load(self, filename, expected_version_str=None, halt_on_error=True):
-        """Load file."""
+    def load(self, filename, expected_version_str=None, halt_on_error=True, shared=False):
+        """Load file.
+
+        If shared is True the result may be shared with a cache and must not be modified.
+        """
         raise NotImplementedError
 
     def save(self, filename, data):
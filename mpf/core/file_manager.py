@@ -77,8 +77,11 @@ class FileManager:
             return None
 
     @staticmethod
-    def load(filename, verify_version=False, halt_on_error=True):
-        """Load a file by name."""
+    def load(filename, verify_version=False, halt_on_error=True, shared=False):
+        """Load a file by name.
+
+        If shared is True the result may be shared with the file cache and must not be modified.
+        """
         if not FileManager.initialized:
             FileManager.init()
 
@@ -102,7 +105,7 @@ class FileManager:
         except KeyError:
             raise AssertionError("No config file processor available for file type {}".format(ext))
 
-        return interface.load(file, verify_version, halt_on_error)
+        return interface.load(file, verify_version, halt_on_error, shared)
 
     @staticmethod
     def save(filename, data):
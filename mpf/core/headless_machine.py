@@ -0,0 +1,245 @@
+"""Run a machine headless under time travel outside of unittest."""
+import asyncio
+import copy
+import os
+import time
+from asyncio import events
+
+import mpf.core
+from mpf.core.config_loader import YamlMultifileConfigLoader
+from mpf.core.data_manager import DataManager
+from mpf.core.machine import MachineController
+from mpf.core.time_travel_loop import TimeTravelLoop, TimeTravelClock
+from mpf.core.utility_functions import Util
+
+
+class MemoryDataManager(DataManager):
+
+    """DataManager which keeps its data in memory and never writes to disk.
+
+    The data of the last save is available in written_data.
+    """
+
+    def __init__(self, data):     # pylint: disable-msg=super-init-not-called
+        """Initialise data manager with initial data."""
+        self.data = data
+        self.written_data = None
+
+    def _trigger_save(self):
+        self.written_data = copy.deepcopy(self.data)
+
+
+class HeadlessConfigLoader(YamlMultifileConfigLoader):
+
+    """Config loader which merges defaults and patches into the machine config."""
+
+    def __init__(self, machine_path, configfile, config_defaults, config_patches, spec_patches):
+        """Initialise config loader."""
+        super().__init__(machine_path, configfile, True, True)
+        self.config_defaults = config_defaults
+        self.config_patches = config_patches
+        self.spec_patches = spec_patches
+
+    def _load_config_spec(self):
+        config_spec = super()._load_config_spec()
+        if self.spec_patches:
+            config_spec = Util.dict_merge(config_spec, self.spec_patches, deepcopy_both=False)
+        return config_spec
+
+    def _load_mpf_machine_config(self, config_spec):
+        config = super()._load_mpf_machine_config(config_spec)
+        # remove text-ui as it imports a lot of modules which we do not need without a terminal
+        del config["mpf"]["core_modules"]["text_ui"]
+
+        if self.config_defaults:
+            config = Util.dict_merge(self.config_defaults, config, deepcopy_both=False)
+        if self.config_patches:
+            config = Util.dict_merge(config, self.config_patches, False, deepcopy_both=False)
+        return config
+
+
+class HeadlessMachineController(MachineController):
+
+    """MachineController which runs on a time travel clock and keeps its data in memory.
+
+    Plugins are only loaded if enable_plugins is set.
+    """
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, options, config, config_patches, config_defaults, clock, mock_data,
+                 enable_plugins=False):
+        """Initialise machine controller."""
+        self.test_config_patches = config_patches
+        self.test_config_defaults = config_defaults
+        self._enable_plugins = enable_plugins
+        self._test_clock = clock
+        self._mock_data = mock_data
+        super().__init__(options, config)
+
+    def create_data_manager(self, config_name):
+        """Create MemoryDataManager."""
+        return MemoryDataManager(self._mock_data.get(config_name, {}))
+
+    def _load_clock(self):
+        return self._test_clock
+
+    def _register_plugin_config_players(self):
+        if self._enable_plugins:
+            super()._register_plugin_config_players()
+
+
+class HeadlessMachine:
+
+    """Boot and drive a machine without hardware and without waiting in real time.
+
+    This uses the same time travel loop as the unit tests. Data managers keep
+    their data in memory.
+    """
+
+    def __init__(self, machine_path, config_files=None, platform="smart_virtual", enable_plugins=True,
+                 config_patches=None, mock_data=None):
+        """Initialise headless machine.
+
+        Args:
+        ----
+            machine_path: Absolute path of the machine folder.
+            config_files: List of config files. Defaults to config.yaml.
+            platform: Platform to force for all devices.
+            enable_plugins: Load plugins configured in the machine.
+            config_patches: Dict merged on top of the machine config.
+            mock_data: Initial data for the data managers by name.
+        """
+        self.machine_path = machine_path
+        self.config_files = config_files or ["config.yaml"]
+        self.platform = platform
+        self.enable_plugins = enable_plugins
+        self.config_patches = config_patches or {}
+        self.mock_data = mock_data or {}
+        self.machine = None     # type: HeadlessMachineController
+        self.loop = None        # type: TimeTravelLoop
+        self.clock = None       # type: TimeTravelClock
+        self.boot_secs = None
+        self._exception = None
+
+    def get_options(self):
+        """Return options for the machine controller."""
+        mpfconfig = os.path.abspath(os.path.join(mpf.core.__path__[0], os.pardir, 'mpfconfig.yaml'))
+        return {
+            'force_platform': self.platform,
+            'production': False,
+            'mpfconfigfile': mpfconfig,
+            'configfile': self.config_files,
+            'debug': False,
+            'bcp': False,
+            'no_load_cache': False,
+            'platform_integration_test': False,
+            'create_config_cache': True,
+            'text_ui': False,
+        }
+
+    def _exception_handler(self, loop, context):
+        try:
+            loop.stop()
+        except RuntimeError:
+            pass
+        if not self._exception:
+            self._exception = context
+
+    def _raise_exception(self, error=None):
+        context = self._exception
+        self._exception = None
+        if context and "exception" in context:
+            raise context["exception"]
+        if context:
+            raise AssertionError(context.get("message", context))
+        if error:
+            raise error
+
+    def boot(self, timeout=60):
+        """Load the config and run all init phases."""
+        start = time.time()
+        self.loop = TimeTravelLoop()
+        events.set_event_loop(self.loop)
+        self.loop.set_exception_handler(self._exception_handler)
+        self.clock = TimeTravelClock(self.loop)
+
+        config_patches = Util.dict_merge({"bcp": []}, self.config_patches)
+        config_defaults = {"playfields": {"playfield": {"tags": "default", "default_source_device": None}}}
+        config_loader = HeadlessConfigLoader(self.machine_path, self.config_files, config_defaults, config_patches,
+                                              {})
+        config = config_loader.load_mpf_config()
+
+        self.machine = HeadlessMachineController(self.get_options(), config, config_patches, config_defaults,
+                                                 self.clock, self.mock_data, self.enable_plugins)
+        init = asyncio.ensure_future(self.machine.initialize())
+        while not init.done() and not self._exception:
+            self.loop.run_once()
+            if timeout and time.time() > start + timeout:
+                raise AssertionError("Start took more than {}s".format(timeout))
+        self._raise_exception()
+        init.result()
+        self.machine.events.process_event_queue()
+        self.advance(.001)
+        self.boot_secs = time.time() - start
+
+    def advance(self, secs):
+        """Advance the (virtual) time and run everything scheduled during that time."""
+        try:
+            self.loop.run_until_complete(asyncio.sleep(delay=secs))
+        except RuntimeError as e:
+            self._raise_exception(e)
+        self._raise_exception()
+
+    def set_switch(self, name, state):
+        """Change the state of a switch and process it."""
+        self.machine.switch_controller.process_switch(name, state, logical=True)
+        self.advance(0)
+
+    def hit_switch(self, name, secs=.1):
+        """Activate a switch for some time and release it."""
+        self.machine.switch_controller.process_switch(name, 1, logical=True)
+        self.advance(secs)
+        self.machine.switch_controller.process_switch(name, 0, logical=True)
+        self.advance(0)
+
+    def post_event(self, event, **kwargs):
+        """Post an event and process the queue."""
+        self.machine.events.post(event, **kwargs)
+        self.advance(0)
+
+    def run_steps(self, steps):
+        """Run a scripted sequence of steps.
+
+        Every step is a dict with one of those keys:
+
+        * ``switch``: Name of a switch to hit. ``hold`` is the time it stays
+          active (default 100ms). ``state`` sets it to 0 or 1 instead.
+        * ``wait``: Time to advance.
+        * ``event``: Name of an event to post. ``params`` are passed along.
+        * ``repeat``: Count how often the list in ``steps`` is run.
+        """
+        for step in steps:
+            if "repeat" in step:
+                for _ in range(int(step["repeat"])):
+                    self.run_steps(step.get("steps", []))
+            elif "switch" in step:
+                if "state" in step:
+                    self.set_switch(step["switch"], int(step["state"]))
+                else:
+                    self.hit_switch(step["switch"], Util.string_to_secs(step.get("hold", "100ms")))
+            elif "wait" in step:
+                self.advance(Util.string_to_secs(step["wait"]))
+            elif "event" in step:
+                self.post_event(step["event"], **step.get("params", {}))
+            else:
+                raise AssertionError("Invalid step: {}".format(step))
+
+    def stop(self):
+        """Shut down the machine and close the loop."""
+        if self.machine:
+            self.machine._do_stop()     # pylint: disable-msg=protected-access
+            self.machine = None
+        if self.loop:
+            self.loop.close()
+            self.loop = None
+        events.set_event_loop(None)
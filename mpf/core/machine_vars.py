@@ -1,7 +1,7 @@
 """Contains the MachineVariables class."""
 import copy
 from platform import platform, python_version, system, release, version, system_alias, machine as platform_machine
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
 from mpf._version import version as mpf_version, extended_version as mpf_extended_version
 from mpf.core.data_manager import DataManager
@@ -17,7 +17,8 @@ class MachineVariables(LogMixin):
 
     """Class for Machine Variables."""
 
-    __slots__ = ["machine", "machine_vars", "machine_var_monitor", "machine_var_data_manager"]
+    __slots__ = ["machine", "machine_vars", "machine_var_monitor", "machine_var_data_manager", "_persisted_vars",
+                 "_dirty_vars", "_flush_scheduled", "writes_avoided"]
 
     def __init__(self, machine) -> None:
         """Initialize machine controller."""
@@ -27,12 +28,18 @@ class MachineVariables(LogMixin):
         self.machine_vars = dict()          # type: Dict[str, Any]
         self.machine_var_monitor = False
         self.machine_var_data_manager = None    # type: Optional[DataManager]
+        self._persisted_vars = dict()       # type: Dict[str, Dict[str, Any]]
+        self._dirty_vars = set()            # type: Set[str]
+        self._flush_scheduled = False
+        self.writes_avoided = 0
         self.configure_logging("machine_vars", self.machine.config['logging']['console']['machine_vars'],
                                self.machine.config['logging']['file']['machine_vars'])
 
     def load_machine_vars(self, machine_var_data_manager: DataManager, current_time) -> None:
         """Load machine vars from data manager."""
         self.machine_var_data_manager = machine_var_data_manager
+        self.machine.events.add_handler('shutdown', self.flush)
+        self.machine.events.add_handler('game_ended', self.flush)
 
         for name, settings in (
                 iter(self.machine_var_data_manager.get_data().items())):
@@ -119,16 +126,51 @@ class MachineVariables(LogMixin):
                                      value=Util.convert_to_type(element['initial_value'], element['value_type']))
             self.configure_machine_var(name=name, persist=element.get('persist', False))
 
-    def _write_machine_var_to_disk(self, name: str) -> None:
+    def _write_machine_var_to_disk(self, name: str, force=False) -> None:
         """Write value to disk."""
-        if self.machine_vars[name]['persist'] and self.machine.config['mpf']['save_machine_vars_to_disk']:
-            self._write_machine_vars_to_disk()
+        if (force or self.machine_vars[name]['persist']) and self.machine.config['mpf']['save_machine_vars_to_disk']:
+            self._mark_dirty(name)
+
+    def _mark_dirty(self, name: str) -> None:
+        """Remember a changed var and write all changes at the end of the save interval."""
+        self._dirty_vars.add(name)
+
+        save_interval = self.machine.config['mpf']['save_machine_vars_interval'] / 1000.0
+        if not save_interval:
+            self.flush()
+        elif self._flush_scheduled:
+            # this change will be written together with the previous ones
+            self.writes_avoided += 1
+        else:
+            self._flush_scheduled = True
+            self.machine.clock.schedule_once(self._flush_scheduled_vars, save_interval)
+
+    def _flush_scheduled_vars(self):
+        self._flush_scheduled = False
+        self.flush()
+
+    def flush(self, **kwargs) -> None:
+        """Write changed persistent machine vars to disk.
+
+        Removed and no longer persistent vars are dropped from the file. Runs
+        once save_machine_vars_interval has passed after the first change,
+        when a game ends and on shutdown.
+        """
+        del kwargs
+        if not self._dirty_vars or not self.machine_var_data_manager:
+            return
 
-    def _write_machine_vars_to_disk(self):
-        """Update machine vars on disk."""
-        self.machine_var_data_manager.save_all(
-            {name: {"value": var["value"], "expire": var['timeout'], "expire_secs": var["expire_secs"]}
-             for name, var in self.machine_vars.items() if var["persist"]})
+        for name in self._dirty_vars:
+            var = self.machine_vars.get(name)
+            if var and var["persist"]:
+                self._persisted_vars[name] = {"value": var["value"], "expire": var['timeout'],
+                                              "expire_secs": var["expire_secs"]}
+            else:
+                self._persisted_vars.pop(name, None)
+        self._dirty_vars = set()
+
+        # the data manager copies the data in its writer thread so it gets its own dict
+        self.machine_var_data_manager.save_all(dict(self._persisted_vars))
 
     def get_machine_var(self, name: str) -> Any:
         """Return the value of the variable if it exists, or None if the variable does not exist.
@@ -166,9 +208,12 @@ class MachineVariables(LogMixin):
             self.machine_vars[name] = {'value': None, 'persist': persist, 'expire_secs': expire_secs,
                                        'timeout': timeout}
         else:
+            was_persisted = self.machine_vars[name]['persist']
             self.machine_vars[name]['persist'] = persist
             self.machine_vars[name]['expire_secs'] = expire_secs
             self.machine_vars[name]['timeout'] = timeout
+            if persist or was_persisted:
+                self._write_machine_var_to_disk(name, force=True)
 
     def set_machine_var(self, name: str, value: Any, persist=False) -> None:
         """Set the value of a machine variable.
@@ -202,6 +247,7 @@ class MachineVariables(LogMixin):
             self.debug_log("Setting machine_var '%s' to: %s, (prior: %s, "
                            "change: %s)", name, value, prev_value,
                            change)
+            self.machine.placeholder_manager.variables.notify_change(("machine_var", name))
             self.machine.events.post('machine_var_' + name,
                                      value=value,
                                      prev_value=prev_value,
@@ -246,7 +292,7 @@ class MachineVariables(LogMixin):
         try:
             prev_value = self.machine_vars[name]
             del self.machine_vars[name]
-            self._write_machine_vars_to_disk()
+            self._mark_dirty(name)
         except KeyError:
             pass
         else:
@@ -269,5 +315,4 @@ class MachineVariables(LogMixin):
         for var in list(self.machine_vars.keys()):
             if var.startswith(startswith) and var.endswith(endswith):
                 del self.machine_vars[var]
-
-        self._write_machine_vars_to_disk()
+                self._mark_dirty(var)
@@ -0,0 +1,176 @@
+"""Attribute retained memory to subsystems and device collections."""
+import gc
+import sys
+import time
+from collections import deque
+from types import ModuleType, FunctionType, BuiltinFunctionType, MethodType, CodeType, FrameType
+from typing import Dict, List, Tuple, Any
+
+from mpf.core.data_manager import DataManager
+from mpf.core.device import Device
+from mpf.core.mpf_controller import MpfController
+from mpf.core.placeholder_manager import BaseTemplate, NativeTypeTemplate, TextTemplate
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from mpf.core.machine import MachineController  # pylint: disable-msg=cyclic-import,unused-import
+
+TEMPLATE_CATEGORY = "placeholder_templates"
+
+# objects of those types are never followed
+_OPAQUE_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, CodeType, FrameType)
+
+# objects of those types are accounted to their own category wherever they are found
+_TEMPLATE_TYPES = (BaseTemplate, NativeTypeTemplate, TextTemplate)
+
+
+def _get_slots(cls) -> List[str]:
+    slots = []
+    for klass in cls.__mro__:
+        klass_slots = klass.__dict__.get("__slots__", ())
+        if isinstance(klass_slots, str):
+            klass_slots = (klass_slots, )
+        slots.extend(slot for slot in klass_slots if slot not in ("__dict__", "__weakref__"))
+    return slots
+
+
+class MemorySizer:
+
+    """Walk object graphs and sum sizes without counting objects twice.
+
+    The walk stops at objects which are the root of another category
+    (e.g. devices found inside shows) and at controllers, functions,
+    classes and modules. Templates are accounted to their own category
+    wherever they are found.
+    """
+
+    __slots__ = ["seen", "stop_ids", "template_size", "template_objects", "_slots_cache"]
+
+    def __init__(self, stop_objects) -> None:
+        """Initialise sizer."""
+        self.seen = set()
+        self.stop_ids = {id(obj) for obj in stop_objects}
+        self.template_size = 0
+        self.template_objects = 0
+        self._slots_cache = {}      # type: Dict[type, List[str]]
+
+    def _children(self, obj) -> List[Any]:
+        if isinstance(obj, dict):
+            return list(obj.keys()) + list(obj.values())
+        if isinstance(obj, (list, tuple, set, frozenset, deque)):
+            return list(obj)
+        if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+            return []
+        children = []
+        try:
+            children.append(object.__getattribute__(obj, "__dict__"))
+        except AttributeError:
+            pass
+        cls = type(obj)
+        try:
+            slots = self._slots_cache[cls]
+        except KeyError:
+            slots = self._slots_cache[cls] = _get_slots(cls)
+        for slot in slots:
+            try:
+                children.append(object.__getattribute__(obj, slot))
+            except (AttributeError, TypeError):
+                pass
+        return children
+
+    def size_of(self, root) -> Tuple[int, int]:
+        """Return retained size and number of objects reachable from root."""
+        size = 0
+        objects = 0
+        stack = [(root, False)]
+        while stack:
+            obj, in_template = stack.pop()
+            obj_id = id(obj)
+            if obj_id in self.seen:
+                continue
+            if obj is not root and (obj_id in self.stop_ids or isinstance(obj, (_OPAQUE_TYPES, MpfController))):
+                continue
+            self.seen.add(obj_id)
+            obj_size = sys.getsizeof(obj, 0)
+            if in_template or isinstance(obj, _TEMPLATE_TYPES):
+                in_template = True
+                self.template_size += obj_size
+                self.template_objects += 1
+            else:
+                size += obj_size
+                objects += 1
+            for child in self._children(obj):
+                stack.append((child, in_template))
+        return size, objects
+
+
+def _get_categories(machine: "MachineController") -> List[Tuple[str, List[Any]]]:
+    """Return (category, roots) in the order in which they are attributed."""
+    categories = []
+    for collection_name, collection in machine.device_manager.collections.items():
+        categories.append(("devices.{}".format(collection_name), list(collection.values())))
+    categories.append(("modes", list(machine.modes.values())))
+    categories.append(("shows", list(machine.shows.values())))
+    categories.append(("event_handlers", [machine.events.registered_handlers]))
+    categories.append(("machine_vars", [machine.variables.machine_vars]))
+    categories.append(("data_managers", [obj for obj in gc.get_objects() if isinstance(obj, DataManager)]))
+    categories.append(("config", [machine.config]))
+    return categories
+
+
+def create_memory_snapshot(machine: "MachineController") -> Dict[str, Any]:
+    """Return the retained size and object count per category."""
+    start = time.time()
+    categories = _get_categories(machine)
+    stop_objects = [machine]
+    for _, roots in categories:
+        stop_objects.extend(roots)
+    # devices outside of collections (e.g. mode devices which are not loaded) are not followed either
+    stop_objects.extend(obj for obj in gc.get_objects() if isinstance(obj, Device))
+
+    sizer = MemorySizer(stop_objects)
+    result = {}
+    for category, roots in categories:
+        size = 0
+        objects = 0
+        for root in roots:
+            root_size, root_objects = sizer.size_of(root)
+            size += root_size
+            objects += root_objects
+        result[category] = {"size": size, "objects": objects}
+    result[TEMPLATE_CATEGORY] = {"size": sizer.template_size, "objects": sizer.template_objects}
+
+    return {
+        "time": machine.clock.get_time(),
+        "duration": time.time() - start,
+        "total": sum(value["size"] for value in result.values()),
+        "categories": result,
+    }
+
+
+def diff_memory_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> List[Tuple[str, int, int]]:
+    """Return (category, size change, object change) sorted by the largest growth first."""
+    result = []
+    for category in set(old["categories"]) | set(new["categories"]):
+        old_value = old["categories"].get(category, {"size": 0, "objects": 0})
+        new_value = new["categories"].get(category, {"size": 0, "objects": 0})
+        result.append((category, new_value["size"] - old_value["size"], new_value["objects"] - old_value["objects"]))
+    result.sort(key=lambda x: (-x[1], x[0]))
+    return result
+
+
+def format_memory_report(snapshot: Dict[str, Any], diff=None) -> List[str]:
+    """Format a snapshot (and optionally a diff) as text lines."""
+    lines = ["{:40} {:>12} {:>10}".format("Category", "Size (kB)", "Objects")]
+    for category, value in sorted(snapshot["categories"].items(), key=lambda x: -x[1]["size"]):
+        if not value["objects"]:
+            continue
+        lines.append("{:40} {:>12.1f} {:>10}".format(category, value["size"] / 1024, value["objects"]))
+    lines.append("{:40} {:>12.1f}".format("Total", snapshot["total"] / 1024))
+    if diff:
+        lines.append("")
+        lines.append("{:40} {:>12} {:>10}".format("Change", "Size (kB)", "Objects"))
+        for category, size, objects in diff:
+            if size or objects:
+                lines.append("{:40} {:>+12.1f} {:>+10}".format(category, size / 1024, objects))
+    return lines
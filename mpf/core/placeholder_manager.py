@@ -7,7 +7,7 @@ import abc
 from functools import lru_cache
 
 import re
-from typing import Tuple, List, Any, Union
+from typing import Tuple, List, Any, Union, Dict, Set, Optional
 
 from mpf.core.utility_functions import Util
 
@@ -64,7 +64,7 @@ class BaseTemplate(metaclass=abc.ABCMeta):
 
     """Base class for templates."""
 
-    __slots__ = ["template", "placeholder_manager", "default_value", "text"]
+    __slots__ = ["template", "placeholder_manager", "default_value", "text", "subscription"]
 
     def __init__(self, template, text, placeholder_manger, default_value):
         """Initialize template."""
@@ -72,6 +72,7 @@ class BaseTemplate(metaclass=abc.ABCMeta):
         self.template = template
         self.placeholder_manager = placeholder_manger
         self.default_value = default_value
+        self.subscription = None    # type: Optional[ReactiveVariableSubscription]
 
     def evaluate(self, parameters, fail_on_missing_params=False):
         """Evaluate template and convert the result."""
@@ -105,8 +106,10 @@ class BaseTemplate(metaclass=abc.ABCMeta):
 
     def evaluate_and_subscribe(self, parameters) -> Tuple[bool, asyncio.Future]:
         """Evaluate template and subscribe."""
+        if not self.subscription:
+            self.subscription = self.placeholder_manager.variables.create_subscription()
         result, subscriptions = self.placeholder_manager.evaluate_and_subscribe_template(self.template, parameters,
-                                                                                         self.text)
+                                                                                         self.text, self.subscription)
         if isinstance(result, TemplateEvalError) or result is None:
             result = self.default_value
         return self.convert_result(result), subscriptions
@@ -464,7 +467,7 @@ class PlayerPlaceholder(BasePlaceholder):
 
     def subscribe_attribute(self, item):
         """Subscribe player variable changes."""
-        return self._machine.events.wait_for_event('player_{}'.format(item))
+        return self._machine.placeholder_manager.variables.subscribe(("player", item))
 
     def __getitem__(self, item):
         """Array access."""
@@ -507,7 +510,7 @@ class PlayersPlaceholder(BasePlaceholder):
 
     def subscribe_attribute(self, item):
         """Subscribe player variable changes."""
-        return self._machine.events.wait_for_event('player_{}'.format(item))
+        return self._machine.placeholder_manager.variables.subscribe(("player", item))
 
     def __getitem__(self, item):
         """Array access."""
@@ -588,7 +591,7 @@ class MachinePlaceholder(BasePlaceholder):
         """Subscribe to machine variable."""
         if item == "time":
             return asyncio.Future()
-        return self._machine.events.wait_for_event('machine_var_{}'.format(item))
+        return self._machine.placeholder_manager.variables.subscribe(("machine_var", item))
 
     def __getitem__(self, item):
         """Array access."""
@@ -620,14 +623,148 @@ class SettingsPlaceholder(BasePlaceholder):
 
     def subscribe_attribute(self, item):
         """Subscribe to machine variable for this setting."""
-        return self._machine.events.wait_for_event(
-            'machine_var_{}'.format(self._machine.settings.get_setting_machine_var(item)))
+        return self._machine.placeholder_manager.variables.subscribe(
+            ("machine_var", self._machine.settings.get_setting_machine_var(item)))
 
     def __getattr__(self, item):
         """Attribute access."""
         return self._machine.settings.get_setting_value(item)
 
 
+class ReactiveVariable:
+
+    """A variable which a template reads. Returned by placeholders instead of a future."""
+
+    __slots__ = ["key"]
+
+    def __init__(self, key) -> None:
+        """Initialise variable."""
+        self.key = key
+
+
+class ReactiveVariableSubscription:
+
+    """Persistent subscription of a template to the variables it reads.
+
+    Every key is registered once. Changes of any of the keys mark the
+    subscription dirty and resolve the future of its current wait.
+    """
+
+    __slots__ = ["store", "keys", "dirty", "once", "_future"]
+
+    def __init__(self, store: "ReactiveVariableStore", once=False) -> None:
+        """Initialise subscription."""
+        self.store = store
+        self.keys = set()               # type: Set[Any]
+        self.dirty = False
+        self.once = once
+        self._future = None             # type: Optional[asyncio.Future]
+
+    def wait(self) -> asyncio.Future:
+        """Return a future which is done after the next change of any key.
+
+        All waits until the next change share one future. If a waiter cancels
+        it the other waiters wake up and subscribe again.
+        """
+        if self._future is None or self._future.done():
+            self._future = self.store.machine.clock.loop.create_future()
+        return self._future
+
+    def resolve(self):
+        """Wake up the current wait."""
+        self.dirty = False
+        future = self._future
+        self._future = None
+        if future and not future.done():
+            future.set_result(True)
+
+
+class ReactiveVariableStore:
+
+    """Track which templates depend on which variables.
+
+    Templates read keys such as ``("machine_var", "credits")``,
+    ``("player", "score")`` or ``("device", device, "state")``. Every
+    template registers each key once with its persistent subscription.
+    Changes mark the subscriptions of their key dirty and all dirty
+    subscriptions are resolved together once the event queue has been
+    processed (or in the next loop iteration for changes outside of event
+    handlers). A template which depends on a variable that changes multiple
+    times in one batch is reevaluated once.
+    """
+
+    __slots__ = ["machine", "_subscriptions", "_dirty", "_flush_scheduled", "changes", "flushes"]
+
+    def __init__(self, machine) -> None:
+        """Initialise store."""
+        self.machine = machine
+        self._subscriptions = {}        # type: Dict[Any, Set[ReactiveVariableSubscription]]
+        self._dirty = []                # type: List[ReactiveVariableSubscription]
+        self._flush_scheduled = False
+        self.changes = 0
+        self.flushes = 0
+
+    @staticmethod
+    def subscribe(key) -> ReactiveVariable:
+        """Return a variable for key which templates register with their subscription."""
+        return ReactiveVariable(key)
+
+    def create_subscription(self, once=False) -> ReactiveVariableSubscription:
+        """Create a subscription. Subscriptions with once are removed after their first change."""
+        return ReactiveVariableSubscription(self, once)
+
+    def add_key(self, subscription: ReactiveVariableSubscription, key) -> None:
+        """Register key with subscription if it is not registered already."""
+        if key in subscription.keys:
+            return
+        subscription.keys.add(key)
+        try:
+            self._subscriptions[key].add(subscription)
+        except KeyError:
+            self._subscriptions[key] = {subscription}
+
+    def remove_subscription(self, subscription: ReactiveVariableSubscription) -> None:
+        """Remove all keys of subscription."""
+        for key in subscription.keys:
+            subscriptions = self._subscriptions[key]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[key]
+        subscription.keys = set()
+
+    def notify_change(self, key) -> None:
+        """Mark the subscriptions of key dirty."""
+        subscriptions = self._subscriptions.get(key)
+        if not subscriptions:
+            return
+        self.changes += 1
+        for subscription in subscriptions:
+            if not subscription.dirty:
+                subscription.dirty = True
+                self._dirty.append(subscription)
+        if not self._flush_scheduled:
+            # the event manager flushes after processing the queue. this is for changes outside of events
+            self._flush_scheduled = True
+            self.machine.clock.loop.call_soon(self.flush)
+
+    def flush(self) -> None:
+        """Resolve all subscriptions which changed since the last flush."""
+        self._flush_scheduled = False
+        if not self._dirty:
+            return
+        self.flushes += 1
+        dirty = self._dirty
+        self._dirty = []
+        for subscription in dirty:
+            if subscription.once:
+                self.remove_subscription(subscription)
+            subscription.resolve()
+
+    def get_num_subscriptions(self) -> int:
+        """Return the number of registered keys of all subscriptions."""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
 class BasePlaceholderManager(MpfController):
 
     """Manages templates and placeholders for MPF and MC."""
@@ -636,11 +773,12 @@ class BasePlaceholderManager(MpfController):
     module_name = 'PlaceholderManager'
     config_name = 'placeholder_manager'
 
-    __slots__ = ["_eval_methods"]
+    __slots__ = ["_eval_methods", "variables"]
 
     def __init__(self, machine):
         """Initialize."""
         super().__init__(machine)
+        self.variables = ReactiveVariableStore(machine)
         self._eval_methods = {
             ast.Num: self._eval_num,
             ast.Str: self._eval_str,
@@ -851,8 +989,12 @@ class BasePlaceholderManager(MpfController):
         """Evaluate template."""
         return self._eval(template, parameters, False)[0]
 
-    def evaluate_and_subscribe_template(self, template, parameters, text=None):
-        """Evaluate and subscribe template."""
+    def evaluate_and_subscribe_template(self, template, parameters, text=None, subscription=None):
+        """Evaluate and subscribe template.
+
+        Variables read by the template are registered with subscription. Without
+        subscription a new one is used which is removed after the next change.
+        """
         if self.machine.stop_future.done():
             # return a canceled future if machine is already stopping
             future = asyncio.Future()
@@ -870,11 +1012,24 @@ class BasePlaceholderManager(MpfController):
             raise AssertionError("Failed to evaluate and subscribe template {} with parameters {}. "
                                  "See error above.".format(text, parameters)) from e
 
-        if not subscriptions:
+        futures = []
+        has_variables = False
+        for item in subscriptions:
+            if isinstance(item, ReactiveVariable):
+                if subscription is None:
+                    subscription = self.variables.create_subscription(once=True)
+                self.variables.add_key(subscription, item.key)
+                has_variables = True
+            else:
+                futures.append(item)
+        if has_variables:
+            futures.append(subscription.wait())
+
+        if not futures:
             future = self.machine.wait_for_stop()
         else:
-            subscriptions.append(self.machine.wait_for_stop())
-            future = Util.any(subscriptions)
+            futures.append(self.machine.wait_for_stop())
+            future = Util.any(futures)
         future = asyncio.ensure_future(future)
         return value, future
 
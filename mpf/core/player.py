@@ -1,9 +1,13 @@
 """Contains the Player class which represents a player in a pinball game."""
 import copy
 import logging
+from collections import namedtuple
+from contextlib import contextmanager
 
 from mpf.core.utility_functions import Util
 
+PlayerVarChange = namedtuple("PlayerVarChange", ["name", "value", "prev_value", "change", "player_num"])
+
 
 class Player:
 
@@ -74,6 +78,10 @@ class Player:
     ``player_score`` with Args: ``value=500, change=500, prev_value=0``
     ``player_score`` with Args: ``value=1200, change=700, prev_value=500``
 
+    Multiple changes can be batched with :meth:`batch`. In that case there is
+    only one event per variable which changed during the batch and it is
+    posted when the batch ends.
+
     """
 
     monitor_enabled = False
@@ -88,6 +96,8 @@ class Player:
         self.__dict__['machine'] = machine
         self.__dict__['vars'] = dict()
         self.__dict__['_events_enabled'] = False
+        self.__dict__['_batch_depth'] = 0
+        self.__dict__['_batched_changes'] = dict()
 
         number = index + 1
 
@@ -149,12 +159,71 @@ class Player:
 
     def send_all_variable_events(self):
         """Send a player variable event for the current value of all player variables."""
+        changes = []
         for name, value in self.vars.items():
             if isinstance(value, (int, str, float)):
-                if isinstance(value, str):
-                    self._send_variable_event(name, value, value, False, self.vars['number'])
-                else:
-                    self._send_variable_event(name, value, value, 0, self.vars['number'])
+                change = PlayerVarChange(name, value, value, False if isinstance(value, str) else 0,
+                                         self.vars['number'])
+                self._send_variable_event(*change)
+                changes.append(change)
+        self._notify_monitors(changes)
+
+    @contextmanager
+    def batch(self):
+        """Batch all player variable changes until the end of the block.
+
+        Variables are updated immediately but the player_(name) events are
+        posted and monitors are notified when the outermost batch ends. A
+        variable which changed multiple times only causes one event with the
+        value before the batch as ``prev_value`` and the combined change.
+        Variables which end up with their old value do not cause an event.
+        Monitors receive all changes in one call.
+
+        .. code::
+
+            with self.machine.game.player.batch() as player:
+                player.score += 1000
+                player.bonus_multiplier += 1
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._send_batched_variable_events()
+
+    def _send_batched_variable_events(self):
+        batched_changes = self._batched_changes
+        if not batched_changes:
+            return
+        self._batched_changes = dict()
+
+        changes = []
+        for name, (prev_value, new_entry, kwargs) in batched_changes.items():
+            value = self.vars[name]
+            change = self._get_change(value, prev_value)
+            if (change or new_entry) and isinstance(value, (int, str, float)):
+                variable_change = PlayerVarChange(name, value, prev_value, change, self.vars['number'])
+                self._send_variable_event(*variable_change, **kwargs)
+                changes.append(variable_change)
+
+        self._notify_monitors(changes)
+
+    def _notify_monitors(self, changes):
+        """Call player monitors for a list of changes.
+
+        Monitors in the "player" class are called for every change and
+        monitors in the "player_vars" class once with the whole list.
+        """
+        # note the monitor is only called for simpler var changes
+        if not changes or not Player.monitor_enabled:
+            return
+        for callback in self.machine.monitors.get('player', []):
+            for change in changes:
+                callback(**change._asdict())
+        for callback in self.machine.monitors.get('player_vars', []):
+            callback(changes=changes)
 
     def add_with_kwargs(self, name: str, value, **kwargs):
         """Add a value to a player variable and include kwargs in the update event.
@@ -178,7 +247,7 @@ class Player:
 
     # pylint: disable-msg=too-many-arguments
     def _send_variable_event(self, name: str, value, prev_value, change, player_num: int, **kwargs):
-        """Send a player variable event performs any monitor callbacks if configured.
+        """Send a player variable event.
 
         :param name: The player variable name
         :param value: The new variable value
@@ -186,6 +255,7 @@ class Player:
         :param change: The change in value or True/False
         :param player_num: The player number this variable belongs to
         """
+        self.machine.placeholder_manager.variables.notify_change(("player", name))
         self.machine.events.post('player_' + name,
                                  value=value,
                                  prev_value=prev_value,
@@ -240,13 +310,6 @@ class Player:
 
         '''
 
-        # note the monitor is only called for simpler var changes
-        if Player.monitor_enabled and "player" in self.machine.monitors:
-            for callback in self.machine.monitors['player']:
-                callback(name=name, value=value,
-                         prev_value=prev_value, change=change,
-                         player_num=player_num)
-
     def __repr__(self):
         """Return string representation."""
         try:
@@ -277,17 +340,30 @@ class Player:
 
         self.vars[name] = value
 
-        try:
-            change = value - prev_value
-        except TypeError:
-            change = prev_value != value
+        if self._batch_depth and self._events_enabled:
+            if name in self._batched_changes:
+                prev_value, new_entry, batched_kwargs = self._batched_changes[name]
+                kwargs = dict(batched_kwargs, **kwargs)
+            self._batched_changes[name] = (prev_value, new_entry, kwargs)
+            return
+
+        change = self._get_change(value, prev_value)
 
         if (change or new_entry) and isinstance(value, (int, str, float)):
             self.log.debug("Setting '%s' to: %s, (prior: %s, change: %s)",
                            name, self.vars[name], prev_value, change)
 
             if self._events_enabled:
-                self._send_variable_event(name, self.vars[name], prev_value, change, self.vars['number'], **kwargs)
+                variable_change = PlayerVarChange(name, self.vars[name], prev_value, change, self.vars['number'])
+                self._send_variable_event(*variable_change, **kwargs)
+                self._notify_monitors([variable_change])
+
+    @staticmethod
+    def _get_change(value, prev_value):
+        try:
+            return value - prev_value
+        except TypeError:
+            return prev_value != value
 
     def __getitem__(self, name):
         """Allow array get access."""
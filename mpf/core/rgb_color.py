@@ -7,7 +7,7 @@ The MIT License (MIT)
 """
 import random
 
-from typing import List, Union, Tuple, Optional
+from typing import List, Union, Tuple, Optional, Dict
 
 from mpf.core.utility_functions import Util
 
@@ -16,6 +16,9 @@ CHANNEL_MAX_VAL = 255
 RGB_MIN = (0, 0, 0)
 RGB_MAX = (255, 255, 255)
 
+# maximum number of brightness factors to keep correction tables for per profile
+MAX_CORRECTED_TABLES = 16
+
 # Standard web color names and values
 NAMED_RGB_COLORS = dict(
     off=(0, 0, 0),
@@ -192,6 +195,8 @@ class RGBColor:
 
     def __eq__(self, other):
         """Return true if equal."""
+        if isinstance(other, RGBColor):
+            return other.rgb == self.rgb
         return RGBColor(other).rgb == self.rgb
 
     def __ne__(self, other):
@@ -363,9 +368,26 @@ class RGBColor:
         else:
             end_color = RGBColor(start_color).rgb
 
-        output_color = tuple(start_color[i] + int(
-            (end_color[i] - start_color[i]) * fraction) for i in range(3))
-        return RGBColor(output_color)
+        return RGBColor(RGBColor.blend_rgb(start_color, end_color, fraction))
+
+    @staticmethod
+    def blend_rgb(start_rgb, end_rgb, fraction) -> Tuple[int, int, int]:
+        """Blend two RGB tuples without creating intermediate RGBColor objects.
+
+        Args:
+        ----
+            start_rgb: The start color as (red, green, blue) tuple
+            end_rgb: The end color as (red, green, blue) tuple
+            fraction: The fraction between 0 and 1 that is used to set the
+                blend point between the two colors.
+
+        Returns: A (red, green, blue) tuple
+        """
+        start_red, start_green, start_blue = start_rgb
+        end_red, end_green, end_blue = end_rgb
+        return (start_red + int((end_red - start_red) * fraction),
+                start_green + int((end_green - start_green) * fraction),
+                start_blue + int((end_blue - start_blue) * fraction))
 
     @staticmethod
     def random_rgb() -> Tuple[int, int, int]:
@@ -476,6 +498,9 @@ class RGBColorCorrectionProfile:
         for _ in range(3):
             self._lookup_table.append(list(range(256)))
 
+        # combined brightness and correction tables per brightness factor
+        self._corrected_tables = {}         # type: Dict[float, Tuple[bytes, bytes, bytes]]
+
     def generate_from_parameters(self, gamma=2.5, whitepoint=(1.0, 1.0, 1.0),
                                  linear_slope=1.0, linear_cutoff=0.0):
         """Generate an RGB color correction profile lookup table based on the parameters supplied.
@@ -514,6 +539,8 @@ class RGBColorCorrectionProfile:
                 # Clamp the lookup table value between 0 and 255
                 self._lookup_table[channel][index] = max(0, min(value, 255))
 
+        self._corrected_tables = {}
+
     def assign_channel_lookup_table_values(self, channel: int, table_values: List[int]):
         """Assign the specified lookup table values to the profile channel.
 
@@ -538,6 +565,8 @@ class RGBColorCorrectionProfile:
 
             self._lookup_table[channel][index] = value
 
+        self._corrected_tables = {}
+
     @property
     def name(self) -> str:
         """Return the color correction profile name.
@@ -561,9 +590,66 @@ class RGBColorCorrectionProfile:
         assert len(self._lookup_table[0]) == 256
         assert len(self._lookup_table[1]) == 256
         assert len(self._lookup_table[2]) == 256
-        return RGBColor((self._lookup_table[0][color.red],
-                         self._lookup_table[1][color.green],
-                         self._lookup_table[2][color.blue]))
+        return RGBColor(self.apply_rgb(color.rgb))
+
+    def get_corrected_tables(self, brightness_factor=1.0) -> Tuple[bytes, bytes, bytes]:
+        """Return lookup tables which apply brightness and this profile in one step.
+
+        Each table maps an uncorrected channel value (0..255) to the value after
+        scaling it by the brightness factor and applying the channel lookup
+        table. Tables are cached per brightness factor.
+
+        Args:
+        ----
+            brightness_factor: Factor (0.0..1.0) to scale colors by before correction.
+        """
+        try:
+            return self._corrected_tables[brightness_factor]
+        except KeyError:
+            pass
+
+        if len(self._corrected_tables) >= MAX_CORRECTED_TABLES:
+            self._corrected_tables = {}
+
+        tables = tuple(bytes(lookup_table[max(0, min(int(index * brightness_factor), 255))]
+                             for index in range(256))
+                       for lookup_table in self._lookup_table)
+        self._corrected_tables[brightness_factor] = tables
+        return tables
+
+    def apply_rgb(self, rgb, brightness_factor=1.0) -> Tuple[int, int, int]:
+        """Apply brightness and this profile to a (red, green, blue) tuple.
+
+        Args:
+        ----
+            rgb: The (red, green, blue) tuple to correct.
+            brightness_factor: Factor (0.0..1.0) to scale the color by before correction.
+
+        Returns: A corrected (red, green, blue) tuple
+        """
+        red, green, blue = self.get_corrected_tables(brightness_factor)
+        return red[rgb[0]], green[rgb[1]], blue[rgb[2]]
+
+    def apply_batch(self, data: bytes, brightness_factor=1.0) -> bytes:
+        """Apply brightness and this profile to a buffer of colors at once.
+
+        Args:
+        ----
+            data: Bytes of interleaved red, green and blue values (three bytes per color).
+            brightness_factor: Factor (0.0..1.0) to scale colors by before correction.
+
+        Returns: Bytes with the corrected colors in the same layout
+        """
+        red, green, blue = self.get_corrected_tables(brightness_factor)
+        if red == green == blue:
+            # all channels use the same curve. translate everything in one go
+            return data.translate(red)
+
+        corrected = bytearray(len(data))
+        corrected[0::3] = data[0::3].translate(red)
+        corrected[1::3] = data[1::3].translate(green)
+        corrected[2::3] = data[2::3].translate(blue)
+        return bytes(corrected)
 
     @staticmethod
     def default() -> "RGBColorCorrectionProfile":
@@ -19,6 +19,18 @@ class TextToSegmentMapper:
 
     """Helper to map text to segments."""
 
+    # copies of segments with dp turned on by id of the original. copy_with_dp_on is slow.
+    _dp_segments = {}   # type: Dict[int, Tuple[Segment, Segment]]
+
+    @classmethod
+    def get_segment_with_dp(cls, mapping: "Segment") -> "Segment":
+        """Return the segment with dp turned on. Segments are shared and must not be changed."""
+        entry = cls._dp_segments.get(id(mapping))
+        if entry is None or entry[0] is not mapping:
+            entry = (mapping, mapping.copy_with_dp_on())
+            cls._dp_segments[id(mapping)] = entry
+        return entry[1]
+
     @classmethod
     def map_segment_text_to_segments(cls, text: SegmentDisplayText, display_width, segment_mapping) -> List["Segment"]:
         """Map a segment display text to a certain display mapping."""
@@ -26,7 +38,7 @@ class TextToSegmentMapper:
         for char in text:
             mapping = segment_mapping.get(char.char_code, segment_mapping[None])
             if char.dot:
-                mapping = mapping.copy_with_dp_on()
+                mapping = cls.get_segment_with_dp(mapping)
             segments.append(mapping)
 
         # remove leading segments if mapping is too long
@@ -47,7 +59,7 @@ class TextToSegmentMapper:
         for char in text:
             mapping = segment_mapping.get(char.char_code, segment_mapping[None])
             if char.dot:
-                mapping = mapping.copy_with_dp_on()
+                mapping = cls.get_segment_with_dp(mapping)
             segments.append((mapping, char.color))
 
         # remove leading segments if mapping is too long
@@ -81,7 +93,7 @@ class TextToSegmentMapper:
                     next_char = " "
                 if next_char == ".":
                     # next char is a dot -> turn dot on
-                    mapping = mapping.copy_with_dp_on()
+                    mapping = cls.get_segment_with_dp(mapping)
                     text_position += 1
             segments.append(mapping)
 
@@ -0,0 +1,160 @@
+"""Ring buffer in shared memory to pass display frames between processes on the same host."""
+import os
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple, Set
+
+# magic, version, number of slots, slot size, sequence number of the latest frame
+_HEADER = struct.Struct("<4sIIIQ")
+_HEADER_SIZE = 32
+# sequence number and length of the frame in this slot
+_SLOT_HEADER = struct.Struct("<QI")
+_SLOT_HEADER_SIZE = 16
+
+_MAGIC = b"MPFF"
+_VERSION = 1
+
+# segments created by this process. they stay registered with the resource tracker when attached again
+_CREATED_SEGMENTS = set()     # type: Set[str]
+
+
+class SharedFrameBuffer:
+
+    """Ring buffer of frames in shared memory with one writer and one reader.
+
+    The writer (e.g. MPF-MC) puts every frame into the next slot and then
+    publishes its sequence number in the header. The reader only looks at
+    the latest frame. Older frames which have not been read yet are stale
+    and skipped. A frame which is overwritten while it is read is dropped.
+
+    Only the process which created the buffer unlinks the segment. Processes
+    which attach to it do not register it with their resource tracker which
+    would otherwise remove the segment when they exit.
+    """
+
+    __slots__ = ["name", "slots", "slot_size", "_memory", "_owner", "_write_sequence", "last_sequence",
+                 "frames_read", "frames_skipped", "frames_dropped"]
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool) -> None:
+        """Initialise frame buffer on a shared memory segment."""
+        magic, version, slots, slot_size, sequence = _HEADER.unpack_from(memory.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            memory.close()
+            raise AssertionError("Shared memory {} does not contain a frame buffer.".format(memory.name))
+
+        self.name = memory.name
+        self.slots = slots
+        self.slot_size = slot_size
+        self._memory = memory
+        self._owner = owner
+        self._write_sequence = sequence
+        self.last_sequence = sequence
+        self.frames_read = 0
+        self.frames_skipped = 0
+        self.frames_dropped = 0
+
+    @classmethod
+    def create(cls, name: str, slots: int, slot_size: int) -> "SharedFrameBuffer":
+        """Create a new frame buffer.
+
+        A stale segment with the same name (e.g. after a crash) is replaced.
+
+        Args:
+        ----
+            name: Name of the shared memory segment.
+            slots: Number of frames in the ring.
+            slot_size: Maximum size of a frame in bytes.
+        """
+        size = _HEADER_SIZE + slots * (_SLOT_HEADER_SIZE + slot_size)
+        try:
+            memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale_memory = shared_memory.SharedMemory(name=name)
+            stale_memory.close()
+            stale_memory.unlink()
+            memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        _HEADER.pack_into(memory.buf, 0, _MAGIC, _VERSION, slots, slot_size, 0)
+        _CREATED_SEGMENTS.add(memory.name)
+        return cls(memory, True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameBuffer":
+        """Attach to an existing frame buffer.
+
+        Args:
+        ----
+            name: Name of the shared memory segment.
+        """
+        if sys.version_info >= (3, 13):
+            # pylint: disable-msg=unexpected-keyword-arg
+            return cls(shared_memory.SharedMemory(name=name, track=False), False)
+
+        memory = shared_memory.SharedMemory(name=name)
+        if os.name == "posix" and memory.name not in _CREATED_SEGMENTS:
+            # before Python 3.13 attaching registers the segment with the resource tracker of this process
+            resource_tracker.unregister(memory._name, "shared_memory")     # pylint: disable-msg=protected-access
+        return cls(memory, False)
+
+    def _get_slot_offset(self, sequence: int) -> int:
+        return _HEADER_SIZE + (sequence % self.slots) * (_SLOT_HEADER_SIZE + self.slot_size)
+
+    def write(self, frame: bytes) -> int:
+        """Write a frame and return its sequence number."""
+        if len(frame) > self.slot_size:
+            raise ValueError("Frame has {} bytes but slots only have {} bytes.".format(len(frame), self.slot_size))
+        self._write_sequence += 1
+        sequence = self._write_sequence
+        offset = self._get_slot_offset(sequence)
+        buf = self._memory.buf
+        # invalidate the slot while it is written
+        _SLOT_HEADER.pack_into(buf, offset, 0, 0)
+        buf[offset + _SLOT_HEADER_SIZE:offset + _SLOT_HEADER_SIZE + len(frame)] = frame
+        _SLOT_HEADER.pack_into(buf, offset, sequence, len(frame))
+        # publish the frame
+        struct.pack_into("<Q", buf, 16, sequence)
+        return sequence
+
+    def get_latest_sequence(self) -> int:
+        """Return the sequence number of the latest frame which has been written."""
+        return struct.unpack_from("<Q", self._memory.buf, 16)[0]
+
+    def read_latest(self) -> Optional[Tuple[int, bytes]]:
+        """Return sequence number and data of the latest frame or None if there is no new frame.
+
+        The data is copied once out of the shared memory because platforms
+        keep frames after update() returns while the writer reuses the slot.
+        """
+        sequence = self.get_latest_sequence()
+        if sequence <= self.last_sequence:
+            return None
+
+        if sequence > self.last_sequence + 1:
+            self.frames_skipped += sequence - self.last_sequence - 1
+        self.last_sequence = sequence
+
+        offset = self._get_slot_offset(sequence)
+        buf = self._memory.buf
+        slot_sequence, length = _SLOT_HEADER.unpack_from(buf, offset)
+        if slot_sequence != sequence or length > self.slot_size:
+            self.frames_dropped += 1
+            return None
+        data = bytes(buf[offset + _SLOT_HEADER_SIZE:offset + _SLOT_HEADER_SIZE + length])
+        if _SLOT_HEADER.unpack_from(buf, offset)[0] != sequence:
+            # the writer wrapped around while we were reading
+            self.frames_dropped += 1
+            return None
+
+        self.frames_read += 1
+        return sequence, data
+
+    def close(self):
+        """Detach from the buffer and remove it if we created it."""
+        if not self._memory:
+            return
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+            _CREATED_SEGMENTS.discard(self.name)
+        self._memory = None
@@ -1,6 +1,38 @@
 """Contains the ShowController base class."""
+import heapq
+import time
+
+from typing import List, Optional
+
 from mpf.assets.show import Show, ShowConfig, ShowPool
 from mpf.core.mpf_controller import MpfController
+from mpf.core.show_profiler import ShowProfiler, format_show_profile
+
+
+class ScheduledShowStep:
+
+    """A show step waiting for its tick in the show controller."""
+
+    __slots__ = ["controller", "time", "number", "callback", "cancelled"]
+
+    def __init__(self, controller, time, number, callback):
+        """Initialize scheduled step."""
+        self.controller = controller
+        self.time = time
+        self.number = number
+        self.callback = callback
+        self.cancelled = False
+
+    def __lt__(self, other):
+        """Order steps by time and then by the order in which they were scheduled."""
+        return (self.time, self.number) < (other.time, other.number)
+
+    def cancel(self):
+        """Do not run this step."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self.controller.step_cancelled(self)
 
 
 class ShowController(MpfController):
@@ -12,7 +44,8 @@ class ShowController(MpfController):
 
     """
 
-    __slots__ = ["show_players", "_next_show_id"]
+    __slots__ = ["show_players", "_next_show_id", "_scheduled_steps", "_scheduled_step_number", "_tick_handle",
+                 "_tick_time", "show_profiler"]
 
     config_name = "show_controller"
 
@@ -28,6 +61,12 @@ class ShowController(MpfController):
         self.show_players = {}
         self._next_show_id = 0
 
+        self._scheduled_steps = []      # type: List[ScheduledShowStep]
+        self._scheduled_step_number = 0
+        self._tick_handle = None
+        self._tick_time = None
+        self.show_profiler = None       # type: Optional[ShowProfiler]
+
         self.machine.events.add_handler('init_phase_1', self._initialize, priority=10)
         self.machine.events.add_handler('init_phase_3', self._load_shows)
         self.machine.shows = dict()
@@ -44,6 +83,30 @@ class ShowController(MpfController):
         for mode in self.machine.modes.values():
             self._create_show_pool(config=mode.config)
 
+        if self.machine.config['mpf']['profile_shows']:
+            self.enable_profiler()
+        self.machine.events.add_handler('shutdown', self._log_show_profile)
+
+    def enable_profiler(self, reset=False):
+        """Start collecting show statistics.
+
+        Args:
+        ----
+            reset: Discard statistics which have been collected so far.
+        """
+        if not self.show_profiler or reset:
+            self.show_profiler = ShowProfiler(self.machine.clock)
+
+    def disable_profiler(self):
+        """Stop collecting show statistics and discard them."""
+        self.show_profiler = None
+
+    def _log_show_profile(self, **kwargs):
+        del kwargs
+        if not self.show_profiler:
+            return
+        self.info_log("Show profile:\n%s", "\n".join(format_show_profile(self.show_profiler.get_report())))
+
     def _load_shows(self, **kwargs):
         del kwargs
         show_names = self.machine.mpf_config.get_shows()
@@ -56,6 +119,82 @@ class ShowController(MpfController):
         for show_pool_name, show_pool_config in config.get("show_pools", {}).items():
             self.machine.shows[show_pool_name] = ShowPool(self.machine, show_pool_name, show_pool_config, Show)
 
+    @property
+    def batch_show_steps(self) -> bool:
+        """Return true if show steps should be scheduled with schedule_show_step."""
+        return self.machine.config['mpf']['batch_show_steps']
+
+    def schedule_show_step(self, when, callback) -> ScheduledShowStep:
+        """Run a show step in the tick of the show controller.
+
+        All steps which are due within show_step_tolerance of the first due
+        step run in the same tick. Lights changed by those steps are updated
+        together at the end of the tick.
+
+        Args:
+        ----
+            when: Loop time when the step is due.
+            callback: Method which runs the step.
+
+        Returns a handle which can be cancelled.
+        """
+        self._scheduled_step_number += 1
+        step = ScheduledShowStep(self, when, self._scheduled_step_number, callback)
+        heapq.heappush(self._scheduled_steps, step)
+        self._update_tick()
+        return step
+
+    def step_cancelled(self, step: ScheduledShowStep):
+        """Stop waking up for a cancelled step if it is the next one."""
+        if self._scheduled_steps and self._scheduled_steps[0] is step:
+            self._update_tick()
+
+    def _update_tick(self):
+        """Drop cancelled steps from the head of the queue and schedule the tick for the next step."""
+        while self._scheduled_steps and self._scheduled_steps[0].cancelled:
+            heapq.heappop(self._scheduled_steps)
+
+        if not self._scheduled_steps:
+            if self._tick_handle:
+                self._tick_handle.cancel()
+                self._tick_handle = None
+            return
+
+        when = self._scheduled_steps[0].time
+        if self._tick_handle is None or when != self._tick_time:
+            self._schedule_tick(when)
+
+    def _schedule_tick(self, when):
+        if self._tick_handle:
+            self._tick_handle.cancel()
+        self._tick_time = when
+        self._tick_handle = self.machine.clock.loop.call_at(when, self._tick)
+
+    def _tick(self):
+        """Run all show steps which are due within the tolerance."""
+        self._tick_handle = None
+        due_time = self.machine.clock.get_time() + self.machine.config['mpf']['show_step_tolerance'] / 1000
+        players = list(self.show_players.values())
+        for player in players:
+            player.start_show_tick()
+        try:
+            while self._scheduled_steps and self._scheduled_steps[0].time <= due_time:
+                step = heapq.heappop(self._scheduled_steps)
+                if not step.cancelled:
+                    step.callback()
+        finally:
+            profiler = self.show_profiler
+            for player in players:
+                if profiler and player.show_section in profiler.players:
+                    tick_start = time.perf_counter()
+                    player.end_show_tick()
+                    profiler.player_done(player.show_section, time.perf_counter() - tick_start, call=False)
+                else:
+                    player.end_show_tick()
+
+            # schedule the next tick even if a step raised
+            self._update_tick()
+
     def get_next_show_id(self):
         """Return the next show id."""
         self._next_show_id += 1
@@ -0,0 +1,129 @@
+"""Collect statistics about running shows and the cost of their steps."""
+from collections import deque
+from typing import Dict, List, Any
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from mpf.core.clock import ClockBase  # pylint: disable-msg=cyclic-import,unused-import
+
+# steps of the last seconds count for steps_per_second
+STEP_RATE_WINDOW = 10.0
+
+
+class ShowProfiler:
+
+    """Track running shows, executed steps and the time spent in shows and config players.
+
+    Durations are measured with time.perf_counter() and reported in ms. Shows
+    which were already running when the profiler was enabled are not counted
+    as active.
+    """
+
+    __slots__ = ["clock", "start_time", "active_shows", "peak_active_shows", "shows_started", "steps",
+                 "_recent_steps", "shows", "players"]
+
+    def __init__(self, clock: "ClockBase") -> None:
+        """Initialise profiler."""
+        self.clock = clock
+        self.start_time = clock.get_time()
+        self.active_shows = set()
+        self.peak_active_shows = 0
+        self.shows_started = 0
+        self.steps = 0
+        self._recent_steps = deque()
+        self.shows = {}         # type: Dict[str, Dict[str, Any]]
+        self.players = {}       # type: Dict[str, Dict[str, Any]]
+
+    def _get_show_stats(self, show_name) -> Dict[str, Any]:
+        try:
+            return self.shows[show_name]
+        except KeyError:
+            stats = self.shows[show_name] = {"plays": 0, "steps": 0, "time": 0.0, "max_step_time": 0.0}
+            return stats
+
+    def show_started(self, running_show):
+        """Count a started show."""
+        self.active_shows.add(running_show.id)
+        self.shows_started += 1
+        self.peak_active_shows = max(self.peak_active_shows, len(self.active_shows))
+        self._get_show_stats(running_show.name)["plays"] += 1
+
+    def show_stopped(self, running_show):
+        """Remove a stopped show from the active shows."""
+        self.active_shows.discard(running_show.id)
+
+    def step_done(self, show_name, duration):
+        """Add a step which took duration seconds."""
+        self.steps += 1
+        current_time = self.clock.get_time()
+        self._recent_steps.append(current_time)
+        self._trim_recent_steps(current_time)
+        stats = self._get_show_stats(show_name)
+        stats["steps"] += 1
+        stats["time"] += duration * 1000
+        if duration * 1000 > stats["max_step_time"]:
+            stats["max_step_time"] = duration * 1000
+
+    def player_done(self, item_type, duration, call=True):
+        """Add time spent in a config player for a show entry or a tick flush (call=False)."""
+        try:
+            stats = self.players[item_type]
+        except KeyError:
+            stats = self.players[item_type] = {"calls": 0, "time": 0.0}
+        if call:
+            stats["calls"] += 1
+        stats["time"] += duration * 1000
+
+    def _trim_recent_steps(self, current_time):
+        """Forget steps which are older than STEP_RATE_WINDOW."""
+        while self._recent_steps and self._recent_steps[0] < current_time - STEP_RATE_WINDOW:
+            self._recent_steps.popleft()
+
+    def get_steps_per_second(self) -> float:
+        """Return the steps per second during the last STEP_RATE_WINDOW seconds."""
+        current_time = self.clock.get_time()
+        self._trim_recent_steps(current_time)
+        window = min(STEP_RATE_WINDOW, current_time - self.start_time)
+        if window <= 0:
+            return 0.0
+        return len(self._recent_steps) / window
+
+    def get_report(self) -> Dict[str, Any]:
+        """Return all statistics as dict."""
+        duration = self.clock.get_time() - self.start_time
+        shows = {}
+        for name, stats in self.shows.items():
+            shows[name] = dict(stats)
+            shows[name]["average_step_time"] = stats["time"] / stats["steps"] if stats["steps"] else 0.0
+        return {
+            "duration": duration,
+            "active_shows": len(self.active_shows),
+            "peak_active_shows": self.peak_active_shows,
+            "shows_started": self.shows_started,
+            "steps": self.steps,
+            "steps_per_second": self.get_steps_per_second(),
+            "average_steps_per_second": self.steps / duration if duration > 0 else 0.0,
+            "shows": shows,
+            "players": {name: dict(stats) for name, stats in self.players.items()},
+        }
+
+
+def format_show_profile(report: Dict[str, Any]) -> List[str]:
+    """Format a show profile report as text lines. Most expensive shows and players come first."""
+    lines = [
+        "Duration: {:.1f}s Active shows: {} Peak: {} Started: {}".format(
+            report["duration"], report["active_shows"], report["peak_active_shows"], report["shows_started"]),
+        "Steps: {} Steps/s: {:.1f} (average {:.1f})".format(
+            report["steps"], report["steps_per_second"], report["average_steps_per_second"]),
+        "",
+        "{:40} {:>7} {:>8} {:>12} {:>10} {:>10}".format("Show", "Plays", "Steps", "Time (ms)", "Avg (ms)",
+                                                         "Max (ms)")]
+    for name, stats in sorted(report["shows"].items(), key=lambda x: -x[1]["time"]):
+        lines.append("{:40} {:>7} {:>8} {:>12.2f} {:>10.3f} {:>10.3f}".format(
+            name, stats["plays"], stats["steps"], stats["time"], stats["average_step_time"],
+            stats["max_step_time"]))
+    lines.append("")
+    lines.append("{:40} {:>7} {:>8} {:>12}".format("Player", "", "Calls", "Time (ms)"))
+    for name, stats in sorted(report["players"].items(), key=lambda x: -x[1]["time"]):
+        lines.append("{:40} {:>7} {:>8} {:>12.2f}".format(name, "", stats["calls"], stats["time"]))
+    return lines
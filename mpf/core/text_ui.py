@@ -1,11 +1,12 @@
 """Contains the TextUI class."""
+import threading
+import time
 from collections import defaultdict
 
 from datetime import datetime
 from psutil import cpu_percent, virtual_memory, Process
 
 import mpf._version
-from mpf.core.delays import DelayManager
 from mpf.core.mpf_controller import MpfController
 
 try:
@@ -26,7 +27,7 @@ except ImportError:
 
 MYPY = False
 if MYPY:   # pragma: no cover
-    from typing import List, Tuple, Dict  # pylint: disable-msg=cyclic-import,unused-import
+    from typing import List, Tuple, Dict, Set, Any, Optional, Callable  # pylint: disable-msg=cyclic-import,unused-import
     from mpf.core.machine import MachineController  # pylint: disable-msg=cyclic-import,unused-import,ungrouped-imports
     from mpf.devices.ball_device.ball_device \
         import BallDevice  # pylint: disable-msg=cyclic-import,unused-import,ungrouped-imports
@@ -62,22 +63,33 @@ class MpfLayout(Layout):
 # pylint: disable-msg=too-many-instance-attributes
 class TextUi(MpfController):
 
-    """Handles the text-based UI."""
+    """Handles the text-based UI.
+
+    Handlers on the event loop only update a snapshot of the state (plain
+    strings and bools) and mark the changed sections dirty. A separate
+    thread takes the dirty sections at most max_fps times per second,
+    updates the affected widgets and draws the frame. The screen is only
+    opened and closed on the event loop because curses installs signal
+    handlers. _screen_lock guards the screen between both threads.
+    """
 
     config_name = "text_ui"
 
     __slots__ = ["start_time", "_tick_task", "screen", "mpf_process", "ball_devices", "switches",
                  "config", "_pending_bcp_connection", "_asset_percent", "_player_widgets", "_machine_widgets",
                  "_bcp_status", "frame", "layout", "scene", "footer_memory", "switch_widgets", "mode_widgets",
-                 "ball_device_widgets", "footer_cpu", "footer_mc_cpu", "footer_uptime", "delay", "_layout_change"]
+                 "ball_device_widgets", "footer_cpu", "footer_mc_cpu", "footer_uptime", "_layout_change",
+                 "_sections", "_dirty_sections", "_changed_switches", "_snapshot_lock", "_render_event",
+                 "_stop_event", "_render_thread", "_frame_interval", "frames_drawn", "_popups", "_screen_lock",
+                 "_pending_updates", "_update_scheduled"]
 
     def __init__(self, machine: "MachineController") -> None:
         """Initialize TextUi."""
         super().__init__(machine)
-        self.delay = DelayManager(machine)
         self.config = machine.config.get('text_ui', {})
 
         self.screen = None
+        self._render_thread = None
 
         if not machine.options['text_ui'] or not Scene:
             self.log.debug("Text UI is disabled. TUI option setting: %s, Asciimatics loaded: %s",
@@ -106,7 +118,7 @@ class TextUi(MpfController):
         self.mpf_process = Process()
         self.ball_devices = list()      # type: List[BallDevice]
 
-        self.switches = {}      # type: Dict[str, Switch]
+        self.switches = {}      # type: Dict[str, Tuple[Switch, Widget]]
 
         self.machine.events.add_handler('init_phase_2', self._init)
         # self.machine.events.add_handler('init_phase_3', self._init2)
@@ -126,10 +138,10 @@ class TextUi(MpfController):
         self.machine.events.add_handler('ball_ended',
                                         self._update_player)
 
-        self._pending_bcp_connection = False
-        self._asset_percent = 0
+        self._pending_bcp_connection = None
+        self._asset_percent = None
         self._bcp_status = (0, 0, 0)    # type: Tuple[float, int, int]
-        self.switch_widgets = []        # type: List[Widget]
+        self.switch_widgets = []        # type: List[Tuple[Widget, int]]
         self.mode_widgets = []          # type: List[Widget]
         self.ball_device_widgets = []   # type: List[Widget]
         self._machine_widgets = []      # type: List[Widget]
@@ -139,10 +151,66 @@ class TextUi(MpfController):
         self.footer_mc_cpu = None
         self.footer_uptime = None
         self._layout_change = True
+        self.frames_drawn = 0
+
+        # snapshot of the state which is shared with the render thread. only access it with _snapshot_lock.
+        self._sections = {}             # type: Dict[str, Any]
+        self._dirty_sections = set()    # type: Set[str]
+        self._changed_switches = {}     # type: Dict[str, bool]
+        self._popups = {}               # type: Dict[str, Optional[str]]
+        self._snapshot_lock = threading.Lock()
+        self._render_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._screen_lock = threading.Lock()
+        self._frame_interval = 1 / max(1, int(self.config.get('max_fps', 20)))
+        self._pending_updates = set()   # type: Set[Callable[[], None]]
+        self._update_scheduled = False
 
         self._tick_task = self.machine.clock.schedule_interval(self._tick, 1)
         self._create_window()
-        self._draw_screen()
+        self._start_renderer()
+
+    def _start_renderer(self):
+        """Start the thread which owns the screen."""
+        self._render_thread = threading.Thread(target=self._render_loop, name="text_ui", daemon=True)
+        self._render_thread.start()
+        # draw the first frame right away
+        self._render_event.set()
+
+    def _update_section(self, name, value):
+        """Replace a section of the snapshot and wake the render thread."""
+        with self._snapshot_lock:
+            self._sections[name] = value
+            self._dirty_sections.add(name)
+        self._wake_renderer()
+
+    def _wake_renderer(self):
+        if not self._render_event.is_set():
+            self._render_event.set()
+
+    def _schedule_update(self, callback):
+        """Call callback once per frame interval at most.
+
+        Machine and player variables may change many times per frame (e.g.
+        audits on every switch hit). Their sections are only built once.
+        """
+        self._pending_updates.add(callback)
+        if not self._update_scheduled:
+            self._update_scheduled = True
+            self.machine.clock.schedule_once(self._run_pending_updates, self._frame_interval)
+
+    def _run_pending_updates(self):
+        self._update_scheduled = False
+        pending_updates = self._pending_updates
+        self._pending_updates = set()
+        for callback in pending_updates:
+            callback()
+
+    def _set_popup(self, name, text):
+        with self._snapshot_lock:
+            self._popups[name] = text
+            self._dirty_sections.add("popups")
+        self._wake_renderer()
 
     def _init(self, **kwargs):
         del kwargs
@@ -162,13 +230,13 @@ class TextUi(MpfController):
         self.ball_devices.sort()
 
         self._update_switch_layout()
-        self._schedule_draw_screen()
 
     async def _bcp_status_report(self, client, cpu, rss, vms):
         del client
-        self._bcp_status = cpu, rss, vms
+        self._update_section("bcp_status", (cpu, rss, vms))
 
     def _update_stats(self):
+        """Update footer. This runs in the render thread."""
         # Runtime
         rt = datetime.now() - self.start_time
         mins, sec = divmod(rt.seconds + rt.days * 86400, 60)
@@ -181,10 +249,11 @@ class TextUi(MpfController):
             round(cpu_percent(interval=None, percpu=False)))
 
         # MPF process stats
+        memory_info = self.mpf_process.memory_info()
         self.footer_cpu.text = 'MPF (CPU RSS/VMS): {}% {}/{} MB    '.format(
             round(self.mpf_process.cpu_percent()),
-            round(self.mpf_process.memory_info().rss / 1048576),
-            round(self.mpf_process.memory_info().vms / 1048576))
+            round(memory_info.rss / 1048576),
+            round(memory_info.vms / 1048576))
 
         # MC process stats
         if self._bcp_status != (0, 0, 0):
@@ -197,13 +266,7 @@ class TextUi(MpfController):
 
     def _update_switch_layout(self):
         num = 0
-        self.switch_widgets = []
-        self.switches = {}
-        self.switch_widgets.append((Label("SWITCHES"), 1))
-        self.switch_widgets.append((Divider(), 1))
-        self.switch_widgets.append((Label(""), 2))
-        self.switch_widgets.append((Divider(), 2))
-
+        switches = []
         for sw in sorted(self.machine.switches.values()):
             if sw.invert:
                 name = sw.name + '*'
@@ -211,31 +274,48 @@ class TextUi(MpfController):
                 name = sw.name
 
             col = 1 if num <= int(len(self.machine.switches) / 2) else 2
-
-            switch_widget = Label(name)
-            if sw.state:
-                switch_widget.custom_colour = "active_switch"
-
-            self.switch_widgets.append((switch_widget, col))
-            self.switches[sw.name] = (sw, switch_widget)
-
+            switches.append((sw.name, name, col, bool(sw.state)))
             num += 1
 
-        self._schedule_draw_screen()
+        with self._snapshot_lock:
+            # changes before this are part of the layout
+            self._changed_switches = {}
+            self._sections["switch_layout"] = switches
+            self._dirty_sections.add("switch_layout")
+        self._wake_renderer()
 
     def _update_switches(self, change, *args, **kwargs):
         del args
         del kwargs
-        try:
-            sw, switch_widget = self.switches[change.name]
-        except KeyError:
-            return
-        if sw.state:
-            switch_widget.custom_colour = "active_switch"
-        else:
-            switch_widget.custom_colour = "label"
+        with self._snapshot_lock:
+            self._changed_switches[change.name] = bool(change.state)
+        self._wake_renderer()
 
-        self._schedule_draw_screen()
+    def _create_switch_widgets(self, switches):
+        """Create switch widgets. This runs in the render thread."""
+        self.switch_widgets = []
+        self.switches = {}
+        self.switch_widgets.append((Label("SWITCHES"), 1))
+        self.switch_widgets.append((Divider(), 1))
+        self.switch_widgets.append((Label(""), 2))
+        self.switch_widgets.append((Divider(), 2))
+
+        for sw_name, name, col, state in switches:
+            switch_widget = Label(name)
+            if state:
+                switch_widget.custom_colour = "active_switch"
+
+            self.switch_widgets.append((switch_widget, col))
+            self.switches[sw_name] = switch_widget
+
+    def _update_switch_widgets(self, changed_switches):
+        """Only recolour switches which changed. This runs in the render thread."""
+        for name, state in changed_switches.items():
+            try:
+                switch_widget = self.switches[name]
+            except KeyError:
+                continue
+            switch_widget.custom_colour = "active_switch" if state else "label"
 
     def _draw_switches(self):
         """Draw all switches."""
@@ -243,29 +323,23 @@ class TextUi(MpfController):
             self.layout.add_widget(widget, column)
 
     def _mode_change(self, *args, **kwargs):
-        # Have to call this on the next frame since the mode controller's
-        # active list isn't updated yet
         del args
         del kwargs
-        self.mode_widgets = []
-        self.mode_widgets.append(Label("ACTIVE MODES"))
-        self.mode_widgets.append(Divider())
         try:
             modes = self.machine.mode_controller.active_modes
         except AttributeError:
             modes = None
 
+        lines = ["ACTIVE MODES", None]
         if modes:
             for mode in modes:
-                self.mode_widgets.append(Label('{} ({})'.format(mode.name, mode.priority)))
+                lines.append('{} ({})'.format(mode.name, mode.priority))
         else:
-            self.mode_widgets.append(Label("No active modes"))
+            lines.append("No active modes")
 
         # empty line at the end
-        self.mode_widgets.append(Label(""))
-
-        self._layout_change = True
-        self._schedule_draw_screen()
+        lines.append("")
+        self._update_section("modes", lines)
 
     def _draw_modes(self):
         for widget in self.mode_widgets:
@@ -277,50 +351,41 @@ class TextUi(MpfController):
 
     def _update_ball_devices(self, **kwargs):
         del kwargs
-        # TODO: do not create widgets. just update contents
-        self.ball_device_widgets = []
-        self.ball_device_widgets.append(Label("BALL COUNTS"))
-        self.ball_device_widgets.append(Divider())
+        lines = ["BALL COUNTS", None]
 
         try:
             for pf in self.machine.playfields.values():
-                widget = Label('{}: {} '.format(pf.name, pf.balls))
-                if pf.balls:
-                    widget.custom_colour = "pf_active"
-                else:
-                    widget.custom_colour = "pf_inactive"
-                self.ball_device_widgets.append(widget)
+                lines.append(('{}: {} '.format(pf.name, pf.balls), "pf_active" if pf.balls else "pf_inactive"))
 
         except AttributeError:
             pass
 
         for bd in self.ball_devices:
-            widget = Label('{}: {} ({})'.format(bd.name, bd.balls, bd.state))
-            if bd.balls:
-                widget.custom_colour = "pf_active"
-            else:
-                widget.custom_colour = "pf_inactive"
+            lines.append(('{}: {} ({})'.format(bd.name, bd.balls, bd.state),
+                          "pf_active" if bd.balls else "pf_inactive"))
 
-            self.ball_device_widgets.append(widget)
+        lines.append("")
 
-        self.ball_device_widgets.append(Label(""))
-
-        self._layout_change = True
-        self._schedule_draw_screen()
+        with self._snapshot_lock:
+            if self._sections.get("ball_devices") == lines:
+                return
+        self._update_section("ball_devices", lines)
 
     def _update_player(self, **kwargs):
         del kwargs
-        self._player_widgets = []
-        self._player_widgets.append(Label("CURRENT PLAYER"))
-        self._player_widgets.append(Divider())
+        self._schedule_update(self._build_player)
+
+    def _build_player(self):
+        lines = ["CURRENT PLAYER", None]
 
         try:
             player = self.machine.game.player
-            self._player_widgets.append(Label('PLAYER: {}'.format(player.number)))
-            self._player_widgets.append(Label('BALL: {}'.format(player.ball)))
-            self._player_widgets.append(Label('SCORE: {:,}'.format(player.score)))
+            lines.append('PLAYER: {}'.format(player.number))
+            lines.append('BALL: {}'.format(player.ball))
+            lines.append('SCORE: {:,}'.format(player.score))
         except AttributeError:
-            self._player_widgets.append(Label("NO GAME IN PROGRESS"))
+            lines.append("NO GAME IN PROGRESS")
+            self._update_section("player", lines)
             return
 
         player_vars = player.vars.copy()
@@ -334,10 +399,9 @@ class TextUi(MpfController):
                 self.machine.events.replace_handler('player_' + name, self._update_player)
             except ValueError:
                 pass
-            self._player_widgets.append(Label("{}: {}".format(name, player_vars[name])))
+            lines.append("{}: {}".format(name, player_vars[name]))
 
-        self._layout_change = True
-        self._schedule_draw_screen()
+        self._update_section("player", lines)
 
     def _draw_player(self, **kwargs):
         del kwargs
@@ -347,22 +411,55 @@ class TextUi(MpfController):
     def _update_machine_vars(self, **kwargs):
         """Update machine vars."""
         del kwargs
-        self._machine_widgets = []
-        self._machine_widgets.append(Label("MACHINE VARIABLES"))
-        self._machine_widgets.append(Divider())
+        self._schedule_update(self._build_machine_vars)
+
+    def _build_machine_vars(self):
+        lines = ["MACHINE VARIABLES", None]
         machine_vars = self.machine.variables.machine_vars
         # If config defines explict vars to show, only show those. Otherwise, all
         names = self.config.get('machine_vars', machine_vars.keys())
         for name in names:
-            self._machine_widgets.append(Label("{}: {}".format(name, machine_vars[name]['value'])))
-        self._layout_change = True
-        self._schedule_draw_screen()
+            lines.append("{}: {}".format(name, machine_vars[name]['value']))
+        self._update_section("machine_vars", lines)
 
     def _draw_machine_variables(self):
         """Draw machine vars."""
         for widget in self._machine_widgets:
             self.layout.add_widget(widget, 0)
 
+    @staticmethod
+    def _create_widgets(lines):
+        """Create widgets for a section. None is a divider and tuples are (text, colour)."""
+        widgets = []     # type: List[Widget]
+        for line in lines:
+            if line is None:
+                widgets.append(Divider())
+            elif isinstance(line, tuple):
+                widget = Label(line[0])
+                widget.custom_colour = line[1]
+                widgets.append(widget)
+            else:
+                widgets.append(Label(line))
+        return widgets
+
+    @staticmethod
+    def _update_widgets(widgets, lines) -> bool:
+        """Update the text of the widgets of a section in place.
+
+        Returns False if the rows changed and the widgets have to be created again.
+        """
+        if len(widgets) != len(lines) or \
+                any((line is None) != isinstance(widget, Divider) for widget, line in zip(widgets, lines)):
+            return False
+        for widget, line in zip(widgets, lines):
+            if line is None:
+                continue
+            if isinstance(line, tuple):
+                widget.text, widget.custom_colour = line
+            else:
+                widget.text, widget.custom_colour = line, None
+        return True
+
     def _create_window(self):
         self.screen = Screen.open()
         self.frame = Frame(self.screen, self.screen.height, self.screen.width, has_border=False, title="Test")
@@ -415,16 +512,71 @@ class TextUi(MpfController):
 
         # prevent main from scrolling out the footer
         self.layout.set_max_height(self.screen.height - 2)
+        self._pending_bcp_connection = None
+        self._asset_percent = None
+        self._layout_change = True
 
-    def _schedule_draw_screen(self):
-        # schedule the draw in 10ms if it is not scheduled
-        self.delay.add_if_doesnt_exist(10, self._draw_screen, "draw_screen")
+    def _recreate_window(self):
+        """Create the window again and add all widgets to it. This runs on the event loop."""
+        with self._screen_lock:
+            if not self.screen:
+                return
+            self._create_window()
+        # popups belonged to the old scene
+        with self._snapshot_lock:
+            self._dirty_sections.add("popups")
+        self._wake_renderer()
+
+    def _take_snapshot(self):
+        """Return and reset dirty sections and changed switches."""
+        with self._snapshot_lock:
+            sections = {name: self._sections.get(name) for name in self._dirty_sections if name != "popups"}
+            popups = dict(self._popups) if "popups" in self._dirty_sections else None
+            changed_switches = self._changed_switches
+            self._dirty_sections = set()
+            self._changed_switches = {}
+        return sections, popups, changed_switches
+
+    def _apply_snapshot(self, sections, popups, changed_switches):
+        """Update widgets of changed sections. This runs in the render thread."""
+        widget_sections = {"modes": "mode_widgets", "machine_vars": "_machine_widgets",
+                           "ball_devices": "ball_device_widgets", "player": "_player_widgets"}
+        for name, attribute in widget_sections.items():
+            if name in sections and not self._update_widgets(getattr(self, attribute), sections[name]):
+                setattr(self, attribute, self._create_widgets(sections[name]))
+                self._layout_change = True
+
+        if "switch_layout" in sections:
+            self._create_switch_widgets(sections["switch_layout"])
+            self._layout_change = True
+        if changed_switches:
+            self._update_switch_widgets(changed_switches)
+
+        if "bcp_status" in sections:
+            self._bcp_status = sections["bcp_status"]
+
+        if popups is not None:
+            self._apply_popups(popups)
+
+    def _apply_popups(self, popups):
+        text = popups.get("bcp")
+        if self._pending_bcp_connection:
+            self.scene.remove_effect(self._pending_bcp_connection)
+            self._pending_bcp_connection = None
+        if text:
+            self._pending_bcp_connection = PopUpDialog(self.screen, text, [])
+            self.scene.add_effect(self._pending_bcp_connection)
+
+        text = popups.get("assets")
+        if self._asset_percent:
+            self.scene.remove_effect(self._asset_percent)
+            self._asset_percent = None
+        if text:
+            self._asset_percent = PopUpDialog(self.screen, text, [])
+            self.scene.add_effect(self._asset_percent)
 
     def _draw_screen(self):
-        if not self.screen:
-            # probably drawing during game end
-            return
-
+        """Draw the screen. This runs in the render thread."""
         if self._layout_change:
             self.layout.clear_columns()
             self._draw_modes()
@@ -435,17 +587,45 @@ class TextUi(MpfController):
             self.frame.fix()
             self._layout_change = False
 
+        # asciimatics only writes cells to the terminal which changed since the last frame
         self.screen.force_update()
         self.screen.draw_next_frame()
+        self.frames_drawn += 1
 
-    def _tick(self):
-        if self.screen.has_resized():
-            self._create_window()
+    def _render_loop(self):
+        """Draw frames until the Text UI is stopped.
 
-        self._update_ball_devices()
-        self._update_stats()
+        Waits for changes and draws at most one frame per frame interval.
+        Stats are refreshed every second in this thread so that psutil does
+        not block the event loop.
+        """
+        last_stats = 0
+        while not self._stop_event.is_set():
+            self._render_event.wait(1)
+            self._render_event.clear()
+            frame_start = time.monotonic()
+
+            with self._screen_lock:
+                if self._stop_event.is_set() or not self.screen:
+                    break
+
+                if self.screen.has_resized():
+                    self.machine.clock.loop.call_soon_threadsafe(self._recreate_window)
+                    continue
+
+                self._apply_snapshot(*self._take_snapshot())
+
+                if frame_start - last_stats >= 1:
+                    last_stats = frame_start
+                    self._update_stats()
 
-        self._schedule_draw_screen()
+                self._draw_screen()
+
+            # cap the frame rate. changes in the meantime are collected and drawn in the next frame
+            self._stop_event.wait(self._frame_interval - (time.monotonic() - frame_start))
+
+    def _tick(self):
+        self._update_ball_devices()
 
         self.machine.bcp.transport.send_to_clients_with_handler(handler="_status_request",
                                                                 bcp_command="status_request")
@@ -453,35 +633,32 @@ class TextUi(MpfController):
     def _bcp_connection_attempt(self, name, host, port, **kwargs):
         del name
         del kwargs
-        self._pending_bcp_connection = PopUpDialog(self.screen,
-                                                   'WAITING FOR MEDIA CONTROLLER {}:{}'.format(host, port), [])
-        self.scene.add_effect(self._pending_bcp_connection)
-        self._schedule_draw_screen()
+        self._set_popup("bcp", 'WAITING FOR MEDIA CONTROLLER {}:{}'.format(host, port))
 
     def _bcp_connected(self, **kwargs):
         del kwargs
-        self.scene.remove_effect(self._pending_bcp_connection)
+        self._set_popup("bcp", None)
         # The MC will write any SDL or other messages on top of the TUI, so recreate it to get rid of that stuff
-        self._create_window()
-        self._schedule_draw_screen()
+        self._recreate_window()
 
     def _asset_load_change(self, percent, **kwargs):
         del kwargs
-        if self._asset_percent:
-            self.scene.remove_effect(self._asset_percent)
-        self._asset_percent = PopUpDialog(self.screen, 'LOADING ASSETS: {}%'.format(percent), [])
-        self.scene.add_effect(self._asset_percent)
-        self._schedule_draw_screen()
+        self._set_popup("assets", 'LOADING ASSETS: {}%'.format(percent))
 
     def _asset_load_complete(self, **kwargs):
         del kwargs
-        self.scene.remove_effect(self._asset_percent)
-        self._schedule_draw_screen()
+        self._set_popup("assets", None)
 
     def stop(self, **kwargs):
         """Stop the Text UI and restore the original console screen."""
         del kwargs
-        if self.screen:
+        if self._render_thread:
             self.machine.clock.unschedule(self._tick_task)
-            self.screen.close(True)
-            self.screen = None
+            self._stop_event.set()
+            self._render_event.set()
+            self._render_thread.join(2)
+            self._render_thread = None
+        with self._screen_lock:
+            if self.screen:
+                self.screen.close(True)
+                self.screen = None
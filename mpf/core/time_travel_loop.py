@@ -0,0 +1,327 @@
+"""An event loop which passes time without waiting.
+
+This is used by unit tests and by headless machines (e.g. mpf bench and mpf
+simulate) which run much faster than real time.
+"""
+import collections
+import datetime
+import heapq
+import selectors
+import time
+from asyncio import base_events, events      # type: ignore
+
+import asyncio
+
+from mpf.core.clock import ClockBase
+
+
+class NextTimers:
+
+    """Next timers."""
+
+    __slots__ = ["_timers_set", "_timers_heap"]
+
+    def __init__(self):
+        # Timers set. Used to check uniqueness:
+        self._timers_set = set()
+        # Timers heap. Used to get the closest timer event:
+        self._timers_heap = []
+
+    def add(self, when):
+        """
+        Add a timer (Future event).
+        """
+        # We don't add a time twice:
+        if when in self._timers_set:
+            return
+
+        # Add to set:
+        self._timers_set.add(when)
+        # Add to heap:
+        heapq.heappush(self._timers_heap, when)
+
+    def is_empty(self):
+        return not self._timers_set
+
+    def pop_closest(self):
+        """
+        Get closest event timer. (The one that will happen the soonest).
+        """
+        try:
+            when = heapq.heappop(self._timers_heap)
+            self._timers_set.remove(when)
+        except IndexError:
+            raise IndexError('NextTimers is empty')
+
+        return when
+
+    def __repr__(self):
+        return str(self._timers_set)
+
+
+class TimeTravelSelector(selectors.BaseSelector):
+
+    __slots__ = ["keys"]
+
+    def __init__(self):
+        self.keys = {}
+
+    def register(self, fileobj, events, data=None):
+        key = selectors.SelectorKey(fileobj, 0, events, data)
+        self.keys[fileobj] = key
+        return key
+
+    def unregister(self, fileobj):
+        return self.keys.pop(fileobj)
+
+    def select(self, timeout=None):
+        del timeout
+        if not self.keys:
+            return []
+        ready = []
+        for sock, key in self.keys.items():
+            if sock.read_ready():
+                ready.append((key, selectors.EVENT_READ))
+            if sock.write_ready():
+                ready.append((key, selectors.EVENT_WRITE))
+        return ready
+
+    def get_map(self):
+        return self.keys
+
+
+# Based on TestLoop from asyncio.test_utils:
+class TimeTravelLoop(base_events.BaseEventLoop):
+
+    """
+    Loop for unittests. Passes time without waiting, but makes sure events
+    happen in the correct order.
+    """
+
+    __slots__ = ["readers", "writers", "_time", "_clock_resolution", "_timers", "_selector", "_transports",
+                 "_wait_for_external_executor", "_stopped"]
+
+    def __init__(self):
+        self.readers = {}
+        self.writers = {}
+
+        super().__init__()
+
+        self._time = 0
+        self._stopped = False
+        self._clock_resolution = 1e-9
+        self._timers = NextTimers()
+        self._selector = TimeTravelSelector()
+        self._transports = {}   # needed for newer asyncio on windows
+        self.reset_counters()
+        self._wait_for_external_executor = False
+
+    def close(self, ignore_running_tasks=False) -> None:
+        tasks = asyncio.all_tasks(loop=self)
+
+
+        if not ignore_running_tasks:
+            # open_tasks = [t for t in tasks if (not t.done() and not isinstance(t.get_coro(), asyncio.Lock))]
+            # if open_tasks:
+            #     super().close()
+            #     raise AssertionError("There are still open tasks: {}".format(open_tasks))
+
+            for task in tasks:
+                task.cancel()
+                try:
+                    self.run_until_complete(task)
+                except asyncio.CancelledError:
+                    pass
+
+        super().close()
+
+    def time(self):
+        return self._time
+
+    # def create_task(self, coro, *, name=None):
+    #     import sys
+    #     import traceback
+    #     traceback.print_stack(file=sys.stdout)
+    #     task = super().create_task(coro, name=name)
+    #     print(task.get_name())
+    #     return task
+
+    def set_time(self, time):
+        """Set time in loop."""
+        self._time = time
+
+    def advance_time(self, advance):
+        """Move test time forward."""
+        if advance:
+            self._time += advance
+
+    def _add_reader(self, *args, **kwargs):
+        return self.add_reader(*args, **kwargs)
+
+    def add_reader(self, fd, callback, *args):
+        """Add a reader callback."""
+        self._check_closed()
+        handle = events.Handle(callback, args, self)
+        try:
+            key = self._selector.get_key(fd)
+        except KeyError:
+            self._selector.register(fd, selectors.EVENT_READ,
+                                    (handle, None))
+        else:
+            mask, (reader, writer) = key.events, key.data
+            self._selector.modify(fd, mask | selectors.EVENT_READ,
+                                  (handle, writer))
+            if reader is not None:
+                reader.cancel()
+
+    def stop(self):
+        """Stop loop."""
+        self._stopped = True
+        super().stop()
+
+    def _remove_reader(self, fd):
+        return self.remove_reader(fd)
+
+    def remove_reader(self, fd):
+        """Remove a reader callback."""
+        if self.is_closed():
+            return False
+        try:
+            key = self._selector.get_key(fd)
+        except KeyError:
+            return False
+        else:
+            mask, (reader, writer) = key.events, key.data
+            mask &= ~selectors.EVENT_READ
+            if not mask:
+                self._selector.unregister(fd)
+            else:
+                self._selector.modify(fd, mask, (None, writer))
+
+            if reader is not None:
+                reader.cancel()
+                return True
+            else:
+                return False
+
+    def _add_writer(self, *args, **kwargs):
+        return self.add_writer(*args, **kwargs)
+
+    def add_writer(self, fd, callback, *args):
+        """Add a writer callback.."""
+        self._check_closed()
+        handle = events.Handle(callback, args, self)
+        try:
+            key = self._selector.get_key(fd)
+        except KeyError:
+            self._selector.register(fd, selectors.EVENT_WRITE,
+                                    (None, handle))
+        else:
+            mask, (reader, writer) = key.events, key.data
+            self._selector.modify(fd, mask | selectors.EVENT_WRITE,
+                                  (reader, handle))
+            if writer is not None:
+                writer.cancel()
+
+    def _remove_writer(self, fd):
+        return self.remove_writer(fd)
+
+    def remove_writer(self, fd):
+        """Remove a writer callback."""
+        if self.is_closed():
+            return False
+        try:
+            key = self._selector.get_key(fd)
+        except KeyError:
+            return False
+        else:
+            mask, (reader, writer) = key.events, key.data
+            # Remove both writer and connector.
+            mask &= ~selectors.EVENT_WRITE
+            if not mask:
+                self._selector.unregister(fd)
+            else:
+                self._selector.modify(fd, mask, (reader, None))
+
+            if writer is not None:
+                writer.cancel()
+                return True
+            else:
+                return False
+
+    def assert_writer(self, fd, callback, *args):
+        assert fd in self.writers, 'fd {} is not registered'.format(fd)
+        handle = self.writers[fd]
+        assert handle[0] == callback, '{!r} != {!r}'.format(
+            handle[0], callback)
+        assert handle[1] == args, '{!r} != {!r}'.format(
+            handle[1], args)
+
+    def reset_counters(self):
+        self.remove_reader_count = collections.defaultdict(int)
+        self.remove_writer_count = collections.defaultdict(int)
+
+    def run_once(self):
+        if hasattr(events, "_set_running_loop"):
+            events._set_running_loop(self)
+
+        self._run_once()
+
+        if hasattr(events, "_set_running_loop"):
+            events._set_running_loop(None)
+
+    def _run_once(self):
+        # Advance time only when we finished everything at the present:
+        if len(self._ready) == 0:
+            if not self._timers.is_empty():
+                self._time = self._timers.pop_closest()
+            elif not self._closed and not self._stopped and not self._selector.select(0) and \
+                    not self._wait_for_external_executor:
+                raise AssertionError("Ran into an infinite loop. No socket ready and nothing scheduled.")
+            if self._wait_for_external_executor:
+                time.sleep(.0001)
+
+        super()._run_once()
+        if self._wait_for_external_executor:
+            self._waiting_since = None
+
+    def call_at(self, when, callback, *args, **kwargs):
+        self._timers.add(when)
+        return super().call_at(when, callback, *args, **kwargs)
+
+    def _process_events(self, event_list):
+        for key, mask in event_list:
+            fileobj, (reader, writer) = key.fileobj, key.data
+            if mask & selectors.EVENT_READ and reader is not None:
+                if reader._cancelled:
+                    self.remove_reader(fileobj)
+                else:
+                    self._add_callback(reader)
+            if mask & selectors.EVENT_WRITE and writer is not None:
+                if writer._cancelled:
+                    self.remove_writer(fileobj)
+                else:
+                    self._add_callback(writer)
+
+    def _write_to_self(self):
+        pass
+
+
+class TimeTravelClock(ClockBase):
+
+    """Clock which runs on a TimeTravelLoop."""
+
+    __slots__ = ["_time_travel_loop"]
+
+    def __init__(self, loop):
+        """Initialise clock on a time travel loop."""
+        self._time_travel_loop = loop
+        super().__init__()
+
+    def get_datetime(self):
+        """Create datetime based on time travel loop."""
+        # for some weird reason windows does not like timestamps below 86400 so add a little bit to it
+        return datetime.datetime.fromtimestamp(self.get_time() + 100000)
+
+    def _create_event_loop(self):
+        return self._time_travel_loop
@@ -264,6 +264,49 @@ class Util:
         # log.info("Dict Merge result: %s", result)
         return result
 
+    @staticmethod
+    def dict_merge_shared(a, b, combine_lists=True) -> dict:
+        """Recursively merge dictionaries without copying unchanged subtrees.
+
+        Same rules as :meth:`dict_merge` but neither a nor b is modified or
+        copied. Only dicts and lists along the paths which change are new.
+        Everything else is shared with a or b. Callers have to treat a, b
+        and the result as read-only or copy the result once when they are
+        done merging.
+
+        Args:
+        ----
+            a (dict): The first dictionary
+            b (dict): The second dictionary
+            combine_lists (bool): Controls whether lists should be combined (extended) or overwritten.
+                Default is `True` which combines them.
+
+        Returns the merged dictionaries.
+        """
+        if not isinstance(b, dict):
+            return b
+        result = dict(a)
+        for k, v in b.items():
+            if v is None:
+                continue
+            if isinstance(v, dict) and '_overwrite' in v:
+                result[k] = {key: value for key, value in v.items() if key != '_overwrite'}
+            elif isinstance(v, dict) and '_delete' in v:
+                if k in result:
+                    del result[k]
+            elif k in result and isinstance(result[k], dict):
+                result[k] = Util.dict_merge_shared(result[k], v, combine_lists)
+            elif k in result and isinstance(result[k], list):
+                if isinstance(v, dict) and v[0] == dict(_overwrite=True):
+                    result[k] = v[1:]
+                elif isinstance(v, list) and combine_lists:
+                    result[k] = result[k] + v
+                else:
+                    result[k] = v
+            else:
+                result[k] = v
+        return result
+
     @staticmethod
     def hex_string_to_list(input_string, output_length=3) -> List[int]:
         """Take a string input of hex numbers and return a list of integers.
@@ -563,6 +606,23 @@ class Util:
         """Return true if string is hex."""
         return Util.hex_matcher.fullmatch(str(string)) is not None
 
+    @staticmethod
+    def string_to_bool(value: Union[str, bool, int, None]) -> Optional[bool]:
+        """Convert a value such as "true", "off" or 0 to a bool. None stays None.
+
+        Values from BCP without a type arrive as strings where "false" would
+        otherwise be truthy.
+        """
+        if value is None or isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            if value.lower() in ('false', 'f', 'no', 'disable', 'off', '0'):
+                return False
+            if value.lower() in ('true', 't', 'yes', 'enable', 'on', '1'):
+                return True
+            raise ValueError("Cannot convert {} to bool".format(value))
+        return bool(value)
+
     @staticmethod
     # pylint: disable-msg=too-many-return-statements
     def string_to_ms(time_string: str) -> int:
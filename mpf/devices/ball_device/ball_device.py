@@ -1,6 +1,7 @@
 """Contains the base class for ball devices."""
 import asyncio
 from collections import deque
+from typing import Dict, List, Optional, Tuple, Union
 
 from mpf.core.events import QueuedEvent, event_handler
 from mpf.devices.ball_device.ball_count_handler import BallCountHandler
@@ -33,7 +34,10 @@ class BallDevice(SystemWideDevice):
 
     __slots__ = ["delay", "available_balls", "_target_on_unexpected_ball", "_source_devices", "_ball_requests",
                  "ejector", "ball_count_handler", "incoming_balls_handler", "outgoing_balls_handler",
-                 "counted_balls", "_state"]
+                 "counted_balls", "_state", "_routing_generation", "_path_cache", "_source_paths", "_next_trough"]
+
+    # incremented whenever the routing graph between ball devices changes. this invalidates all cached paths
+    routing_generation = 0
 
     def __init__(self, machine, name):
         """Initialize ball device."""
@@ -52,6 +56,12 @@ class BallDevice(SystemWideDevice):
         self._source_devices = list()
         # Ball devices that have this device listed among their eject targets
 
+        self._routing_generation = -1
+        self._path_cache = dict()       # type: Dict[BallDevice, Union[Tuple[BallDevice, ...], bool]]
+        self._source_paths = None       # type: Optional[List[Tuple[BallDevice, ...]]]
+        self._next_trough = None        # type: Optional[Union[BallDevice, bool]]
+        # routes to targets, from sources and to the next trough. computed on first use
+
         self._ball_requests = deque()
         # deque of tuples that holds requests from target devices for balls
         # that this device could fulfil
@@ -397,6 +407,7 @@ class BallDevice(SystemWideDevice):
             for target in device.config['eject_targets']:
                 if target.name == self.name:
                     self._source_devices.append(device)
+                    BallDevice.routing_generation += 1
                     break
 
         # register event handler for available balls at source devices
@@ -486,27 +497,43 @@ class BallDevice(SystemWideDevice):
         """Return the device state."""
         return self._state
 
-    def find_one_available_ball(self, path=None):
-        """Find a path to a source device which has at least one available ball."""
-        if path is None:
-            path = deque()
-        else:
-            # copy path
-            path = deque(path)
-
-        # prevent loops
-        if self in path:
-            return False
-
-        path.appendleft(self)
+    def _check_routing_cache(self):
+        """Drop cached routes if the routing graph changed."""
+        if self._routing_generation != BallDevice.routing_generation:
+            self._routing_generation = BallDevice.routing_generation
+            self._path_cache = dict()
+            self._source_paths = None
+            self._next_trough = None
 
-        if self.available_balls > 0 and len(path) > 1:
-            return path
+    def _get_source_paths(self) -> List[Tuple["BallDevice", ...]]:
+        """Return all loop free paths from (indirect) source devices to this device.
 
-        for source in self._source_devices:
-            full_path = source.find_one_available_ball(path=path)
-            if full_path:
-                return full_path
+        Paths are ordered by a depth first search over the source devices.
+        """
+        self._check_routing_cache()
+        if self._source_paths is None:
+            paths = []
+            stack = [(self, (self, ))]
+            while stack:
+                device, path = stack.pop()
+                children = []
+                for source in device._source_devices:     # pylint: disable-msg=protected-access
+                    if source in path:
+                        continue
+                    children.append((source, (source, ) + path))
+                # visit children in order. each child before the sources of the next child
+                stack.extend(reversed(children))
+                if device is not self:
+                    paths.append(path)
+            self._source_paths = paths
+
+        return self._source_paths
+
+    def find_one_available_ball(self):
+        """Find a path to a source device which has at least one available ball."""
+        for path in self._get_source_paths():
+            if path[0].available_balls > 0:
+                return deque(path)
 
         return False
 
@@ -616,6 +643,12 @@ class BallDevice(SystemWideDevice):
 
     def find_next_trough(self):
         """Find next trough after device."""
+        self._check_routing_cache()
+        if self._next_trough is None:
+            self._next_trough = self._find_next_trough()
+        return self._next_trough
+
+    def _find_next_trough(self):
         # are we a trough?
         if 'trough' in self.tags:
             return self
@@ -632,12 +665,19 @@ class BallDevice(SystemWideDevice):
 
     def find_path_to_target(self, target):
         """Find a path to this target."""
+        self._check_routing_cache()
+        try:
+            path = self._path_cache[target]
+        except KeyError:
+            path = self._path_cache[target] = self._find_path_to_target(target)
+
+        # callers modify the path
+        return deque(path) if path else False
+
+    def _find_path_to_target(self, target):
         # if we can eject to target directly just do it
         if target in self.config['eject_targets']:
-            path = deque()
-            path.appendleft(target)
-            path.appendleft(self)
-            return path
+            return self, target
 
         # otherwise find any target which can
         for target_device in self.config['eject_targets']:
@@ -645,8 +685,7 @@ class BallDevice(SystemWideDevice):
                 continue
             path = target_device.find_path_to_target(target)
             if path:
-                path.appendleft(self)
-                return path
+                return (self, ) + tuple(path)
 
         return False
 
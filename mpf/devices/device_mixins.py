@@ -1,6 +1,8 @@
 """Device Mixins."""
 from typing import List
 
+from mpf.core.shared_frame_buffer import SharedFrameBuffer
+
 
 class DevicePositionMixin():
 
@@ -36,3 +38,56 @@ class DevicePositionMixin():
         Returns the devices z position from config
         """
         return self.config.get('z', None)
+
+
+class SharedFrameBufferMixin:
+
+    """Adds frames from shared memory and the frame BCP command to a DMD device.
+
+    The device needs the shared_memory config settings, an update method and
+    a frame_buffer slot.
+    """
+
+    __slots__ = []  # type: List[str]
+
+    def _create_frame_buffer(self):
+        """Create a shared memory ring buffer which a local media controller can write frames to."""
+        self.frame_buffer = SharedFrameBuffer.create(self.config['shared_memory'], self.config['shared_memory_slots'],
+                                                     self.config['shared_memory_frame_size'])
+        self.machine.events.add_handler("shutdown", self._close_frame_buffer)
+
+    def _close_frame_buffer(self, **kwargs):
+        del kwargs
+        self.frame_buffer.close()
+
+    @classmethod
+    async def _bcp_receive_dmd_frame(cls, machine, client, name, rawbytes=None, **kwargs):
+        """Update dmd from BCP.
+
+        Without rawbytes the frame is read from shared memory.
+        """
+        del client
+        del kwargs
+
+        devices = getattr(machine, cls.collection)
+        if name not in devices:
+            raise TypeError("{} {} not known".format(cls.class_label, name))
+
+        if rawbytes is None:
+            devices[name].update_from_frame_buffer()
+        else:
+            devices[name].update(rawbytes)
+
+    def update_from_frame_buffer(self):
+        """Update the dmd with the latest frame from shared memory.
+
+        Frames older than the last one shown are skipped. Requests for a dmd
+        without shared memory come from a misconfigured client and are
+        ignored.
+        """
+        if not self.frame_buffer:
+            self.warning_log("Got a shared memory frame but shared_memory is not configured. Ignoring it.")
+            return
+        frame = self.frame_buffer.read_latest()
+        if frame:
+            self.update(frame[1])
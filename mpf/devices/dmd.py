@@ -4,10 +4,13 @@ from functools import partial
 from mpf.core.machine import MachineController
 from mpf.core.platform import DmdPlatform
 
+from mpf.core.shared_frame_buffer import SharedFrameBuffer
 from mpf.core.system_wide_device import SystemWideDevice
+from mpf.devices.device_mixins import SharedFrameBufferMixin
+from mpf.platforms.dmd_frame_diff import DmdFrameDiff
 
 
-class Dmd(SystemWideDevice):
+class Dmd(SharedFrameBufferMixin, SystemWideDevice):
 
     """A physical DMD."""
 
@@ -15,7 +18,7 @@ class Dmd(SystemWideDevice):
     collection = 'dmds'
     class_label = 'dmd'
 
-    __slots__ = ["hw_device"]
+    __slots__ = ["hw_device", "frame_buffer", "frame_diff"]
 
     @classmethod
     def device_class_init(cls, machine: MachineController):
@@ -30,6 +33,8 @@ class Dmd(SystemWideDevice):
     def __init__(self, machine, name):
         """Initialize DMD."""
         self.hw_device = None
+        self.frame_buffer = None    # type: SharedFrameBuffer
+        self.frame_diff = None      # type: DmdFrameDiff
         self.platform = None        # type: DmdPlatform
         super().__init__(machine, name)
 
@@ -38,17 +43,10 @@ class Dmd(SystemWideDevice):
         self.platform = self.machine.get_platform_sections("dmd", self.config['platform'])
         self.platform.assert_has_feature("dmds")
         self.hw_device = self.platform.configure_dmd()
-
-    @classmethod
-    async def _bcp_receive_dmd_frame(cls, machine, client, name, rawbytes, **kwargs):
-        """Update dmd from BCP."""
-        del client
-        del kwargs
-
-        if name not in machine.dmds:
-            raise TypeError("dmd {} not known".format(name))
-
-        machine.dmds[name].update(rawbytes)
+        if self.config['only_send_changes']:
+            self.frame_diff = DmdFrameDiff()
+        if self.config['shared_memory']:
+            self._create_frame_buffer()
 
     def update(self, data: bytes):
         """Update data on the dmd.
@@ -57,4 +55,7 @@ class Dmd(SystemWideDevice):
         ----
             data: bytes to send
         """
+        if self.frame_diff and not self.frame_diff.update(data):
+            # with only_send_changes the frame is not sent again
+            return
         self.hw_device.update(data)
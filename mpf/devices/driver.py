@@ -29,6 +29,7 @@ class Driver(SystemWideDevice):
     collection = 'coils'
     class_label = 'coil'
 
+    # __dict__ stays because tests replace pulse/enable/disable on coil instances. It is only allocated when used.
     __slots__ = ["hw_driver", "delay", "__dict__", "_pulse_ms", "_timed_enable_ms"]
 
     def __init__(self, machine: MachineController, name: str) -> None:
@@ -1,4 +1,6 @@
 """A dual wound coil which consists of two coils."""
+from typing import List
+
 from mpf.core.events import event_handler
 from mpf.core.system_wide_device import SystemWideDevice
 
@@ -11,6 +13,8 @@ class DualWoundCoil(SystemWideDevice):
     collection = "dual_wound_coils"  # String name of the collection
     class_label = "dual_wound_coil"  # String of the friendly name of the device class
 
+    __slots__ = []  # type: List[str]
+
     def __init__(self, machine, name):
         """Initialize a dual wound coil."""
         super().__init__(machine, name)
@@ -11,7 +11,7 @@ from mpf.core.platform import LightsPlatform, LightConfig, LightConfigColors
 
 from mpf.core.device_monitor import DeviceMonitor
 from mpf.core.machine import MachineController
-from mpf.core.rgb_color import RGBColor, ColorException
+from mpf.core.rgb_color import RGBColor, RGBColorCorrectionProfile, ColorException
 from mpf.core.system_wide_device import SystemWideDevice
 from mpf.devices.device_mixins import DevicePositionMixin
 from mpf.exceptions.config_file_error import ConfigFileError
@@ -20,6 +20,11 @@ MYPY = False
 if MYPY:
     from mpf.platforms.interfaces.light_platform_interface import LightPlatformInterface    # pylint: disable-msg=cyclic-import,unused-import; # noqa
 
+_CHANNEL_INDEX = {"red": 0, "green": 1, "blue": 2}
+
+# used for lights without color correction. only applies the brightness factor
+_LINEAR_PROFILE = RGBColorCorrectionProfile("linear")
+
 
 class LightStackEntry:
 
@@ -395,6 +400,18 @@ class Light(SystemWideDevice, DevicePositionMixin):
                            "priority: %s, key: %s", color, fade_ms, priority,
                            key)
 
+        if self.add_color(color, fade_ms, priority, key, start_time):
+            self._schedule_update()
+
+    # pylint: disable-msg=too-many-arguments
+    def add_color(self, color, fade_ms=None, priority=0, key=None, start_time=None) -> bool:
+        """Add or update a color entry in the stack without updating the hardware.
+
+        Takes the same arguments as color(). Use this together with
+        Light.schedule_updates() to update many lights at once.
+
+        Returns True if the visible color of this light might have changed.
+        """
         if isinstance(color, str) and color == "on":
             color = self.config['default_on_color']
         elif not isinstance(color, RGBColor):
@@ -410,8 +427,7 @@ class Light(SystemWideDevice, DevicePositionMixin):
 
         self._add_to_stack(color, fade_ms, priority, key, start_time)
 
-        if color_changes:
-            self._schedule_update()
+        return color_changes
 
     def on(self, brightness=None, fade_ms=None, priority=0, key=None, **kwargs):
         """Turn light on.
@@ -594,72 +610,162 @@ class Light(SystemWideDevice, DevicePositionMixin):
         else:
             self.stack = [x for x in self.stack if x.key != key]
 
+    @staticmethod
+    def schedule_updates(lights):
+        """Update the hardware of multiple lights at once.
+
+        Pending fades of all lights are color corrected in one batch per color
+        correction profile and every platform is synced only once.
+
+        Args:
+        ----
+            lights: Iterable of lights which stacks changed.
+        """
+        fades_per_profile = {}
+        for light in lights:
+            fade_target = light.get_fade_target()
+            if fade_target:
+                fades_per_profile.setdefault(light.color_correction_profile, []).append((light, fade_target))
+
+        if not fades_per_profile:
+            return
+
+        platforms = set()
+        brightness_factor = None
+        for profile, fades in fades_per_profile.items():
+            if brightness_factor is None:
+                brightness_factor = fades[0][0].machine.light_controller.brightness_factor
+            data = bytearray()
+            for _, (start_color, _, target_color, _) in fades:
+                data.extend(start_color.rgb)
+                data.extend(target_color.rgb)
+            corrected = profile.apply_batch(bytes(data), brightness_factor)
+            offset = 0
+            for light, (_, start_time, _, target_time) in fades:
+                light.set_corrected_fade(corrected[offset:offset + 3], start_time,
+                                         corrected[offset + 3:offset + 6], target_time)
+                platforms.update(light.platforms)
+                offset += 6
+
+        for platform in platforms:
+            platform.light_sync()
+
     def _schedule_update(self):
+        fade_target = self.get_fade_target()
+        if not fade_target:
+            return
+
+        start_color, start_time, target_color, target_time = fade_target
+        tables = self.color_correction_profile.get_corrected_tables(self.machine.light_controller.brightness_factor)
+        red, green, blue = start_color.rgb
+        start_rgb = (tables[0][red], tables[1][green], tables[2][blue])
+        if start_color.rgb != target_color.rgb:
+            red, green, blue = target_color.rgb
+            target_rgb = (tables[0][red], tables[1][green], tables[2][blue])
+        else:
+            target_rgb = start_rgb
+
+        self.set_corrected_fade(start_rgb, start_time, target_rgb, target_time)
+
+        for platform in self.platforms:
+            platform.light_sync()
+
+    def get_max_fade_ms(self) -> int:
+        """Return the longest fade in ms which all channels of this light can run in hardware.
+
+        0 means that at least one channel is faded by the host. A negative
+        value means that there is no limit.
+        """
+        limits = [driver.get_max_fade_ms() for drivers in self.hw_drivers.values() for driver in drivers]
+        if not limits or 0 in limits:
+            return 0
+        limits = [limit for limit in limits if limit > 0]
+        return min(limits) if limits else -1
+
+    @property
+    def color_correction_profile(self) -> RGBColorCorrectionProfile:
+        """Return the color correction profile used for this light (linear if it has none)."""
+        if self._color_correction_profile is None:
+            return _LINEAR_PROFILE
+        return self._color_correction_profile
+
+    def get_fade_target(self):
+        """Return the uncorrected fade which should be sent to the hardware.
+
+        Returns a tuple of (start_color, start_time, target_color, target_time)
+        or None if the hardware already got this fade.
+        """
         start_color, start_time, target_color, target_time = self._get_color_and_target_time(self.stack)
 
         # check if our fade target really changed
         if (start_color, start_time, target_color, target_time) == self._last_fade_target:
             # nope its the same -> nothing to do
-            return
+            return None
 
-        if self._last_fade_target and target_color == self._last_fade_target[2] and \
-                (self._last_fade_target[3] < 0 or self._last_fade_target[3] < self.machine.clock.get_time()):
-            # last fade had the same target and finished already -> nothing to do
-            return
+        if self._last_fade_target and target_color == self._last_fade_target[2]:
+            last_target_time = self._last_fade_target[3]
+            if last_target_time < 0 or last_target_time < self.machine.clock.get_time():
+                # last fade had the same target and finished already -> nothing to do
+                return None
+            if target_time > 0 and abs(target_time - last_target_time) < 0.001:
+                # the hardware already fades to this color at this time (e.g. planned show fades) -> nothing to do
+                return None
 
         self._last_fade_target = (start_color, start_time, target_color, target_time)
+        return self._last_fade_target
 
-        if start_color != target_color:
-            start_color = self.color_correct(self.gamma_correct(start_color))
-            target_color = self.color_correct(self.gamma_correct(target_color))
-        else:
-            start_color = self.color_correct(self.gamma_correct(start_color))
-            target_color = start_color
+    # pylint: disable-msg=too-many-branches
+    def set_corrected_fade(self, start_rgb, start_time, target_rgb, target_time):
+        """Send a fade between two color corrected colors to all channels of this light.
+
+        This does not sync the platforms. Call light_sync on them afterwards.
 
+        Args:
+        ----
+            start_rgb: Corrected start color as (red, green, blue) sequence.
+            start_time: Start time of the fade.
+            target_rgb: Corrected target color as (red, green, blue) sequence.
+            target_time: Time when the fade ends (-1 for no fade).
+        """
+        start_red, start_green, start_blue = start_rgb
+        target_red, target_green, target_blue = target_rgb
         for color, drivers in self.hw_drivers.items():
-            if color in ["red", "blue", "green"]:
+            if color in _CHANNEL_INDEX:
+                index = _CHANNEL_INDEX[color]
                 if self._rbgw_style == "duck_rgb":
-                    start_brightness = (getattr(start_color, color) -
-                                        min(start_color.red, start_color.green, start_color.blue)) / 255.0
-                    target_brightness = (getattr(target_color, color) -
-                                         min(target_color.red, target_color.green, target_color.blue)) / 255.0
+                    start_brightness = (start_rgb[index] - min(start_red, start_green, start_blue)) / 255.0
+                    target_brightness = (target_rgb[index] - min(target_red, target_green, target_blue)) / 255.0
                 elif self._rbgw_style == "white_only":  # any shade of white is moved to the white channel
-                    if start_color.red == start_color.green == start_color.blue:
+                    if start_red == start_green == start_blue:
                         start_brightness = 0.0
                     else:
-                        start_brightness = getattr(start_color, color) / 255.0
-                    if target_color.red == target_color.green == target_color.blue:
+                        start_brightness = start_rgb[index] / 255.0
+                    if target_red == target_green == target_blue:
                         target_brightness = 0.0
                     else:
-                        target_brightness = getattr(target_color, color) / 255.0
+                        target_brightness = target_rgb[index] / 255.0
                 else:  # min_rgb or None (non-RGBW)
-                    start_brightness = getattr(start_color, color) / 255.0
-                    target_brightness = getattr(target_color, color) / 255.0
+                    start_brightness = start_rgb[index] / 255.0
+                    target_brightness = target_rgb[index] / 255.0
 
             elif color == "white":
                 if self._rbgw_style == "white_only":
-                    if start_color.red == start_color.green == start_color.blue:
-                        start_brightness = start_color.red / 255.0
+                    if start_red == start_green == start_blue:
+                        start_brightness = start_red / 255.0
                     else:
                         start_brightness = 0.0
-                    if target_color.red == target_color.green == target_color.blue:
-                        target_brightness = target_color.red / 255.0
+                    if target_red == target_green == target_blue:
+                        target_brightness = target_red / 255.0
                     else:
                         target_brightness = 0.0
                 else:  # white is the minimum of RGB
-                    start_brightness = min(start_color.red, start_color.green, start_color.blue) / 255.0
-                    target_brightness = min(target_color.red, target_color.green, target_color.blue) / 255.0
+                    start_brightness = min(start_red, start_green, start_blue) / 255.0
+                    target_brightness = min(target_red, target_green, target_blue) / 255.0
             else:
                 raise ColorException("Invalid color {}".format(color))
 
             for driver in drivers:
-                try:
-                    driver.set_fade(start_brightness, start_time, target_brightness, target_time)
-                except UnboundLocalError:
-                    print()
-
-        for platform in self.platforms:
-            platform.light_sync()
+                driver.set_fade(start_brightness, start_time, target_brightness, target_time)
 
     def clear_stack(self):
         """Remove all entries from the stack and resets this light to 'off'."""
@@ -803,17 +909,17 @@ class Light(SystemWideDevice, DevicePositionMixin):
         except ZeroDivisionError:
             ratio = 1.0
 
-        return RGBColor.blend(color_settings.start_color, dest_color, ratio), max_fade_ms, False
+        return RGBColor(RGBColor.blend_rgb(color_settings.start_color.rgb, dest_color.rgb, ratio)), max_fade_ms, False
 
     def _get_brightness_and_fade(self, max_fade_ms: int, color: str, *, current_time=None) -> Tuple[float, int, bool]:
         uncorrected_color, fade_ms, done = self._get_color_and_fade(self.stack, max_fade_ms, current_time=current_time)
-        corrected_color = self.gamma_correct(uncorrected_color)
-        corrected_color = self.color_correct(corrected_color)
+        corrected_rgb = self.color_correction_profile.apply_rgb(uncorrected_color.rgb,
+                                                                self.machine.light_controller.brightness_factor)
 
-        if color in ["red", "blue", "green"]:
-            brightness = getattr(corrected_color, color) / 255.0
+        if color in _CHANNEL_INDEX:
+            brightness = corrected_rgb[_CHANNEL_INDEX[color]] / 255.0
         elif color == "white":
-            brightness = min(corrected_color.red, corrected_color.green, corrected_color.blue) / 255.0
+            brightness = min(corrected_rgb) / 255.0
         else:
             raise ColorException("Invalid color {}".format(color))
         return brightness, fade_ms, done
@@ -88,9 +88,8 @@ class LightGroup(SystemWideDevice):
         raise NotImplementedError("Implement")
 
     def color(self, color, fade_ms=None, priority=0, key=None):
-        """Call color on all lights in this group."""
-        for light in self.lights:
-            light.color(color, fade_ms, priority, key)
+        """Call color on all lights in this group and update them in one batch."""
+        Light.schedule_updates([light for light in self.lights if light.add_color(color, fade_ms, priority, key)])
 
     def _reorder_lights(self):
         if self.config['size'] == '8digit':
@@ -362,6 +362,11 @@ class Playfield(SystemWideDevice):
         """Track an incoming ball."""
         self._incoming_balls.append(incoming_ball)
 
+    @property
+    def num_incoming_balls(self) -> int:
+        """Return the number of balls which left a device and are on their way to this playfield."""
+        return len(self._incoming_balls)
+
     def remove_incoming_ball(self, incoming_ball: IncomingBall):
         """Stop tracking an incoming ball."""
         try:
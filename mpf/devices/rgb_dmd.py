@@ -4,10 +4,13 @@ from functools import partial
 from mpf.core.machine import MachineController
 from mpf.core.platform import RgbDmdPlatform
 
+from mpf.core.shared_frame_buffer import SharedFrameBuffer
 from mpf.core.system_wide_device import SystemWideDevice
+from mpf.devices.device_mixins import SharedFrameBufferMixin
+from mpf.platforms.dmd_frame_diff import DmdFrameDiff
 
 
-class RgbDmd(SystemWideDevice):
+class RgbDmd(SharedFrameBufferMixin, SystemWideDevice):
 
     """A physical DMD."""
 
@@ -15,7 +18,7 @@ class RgbDmd(SystemWideDevice):
     collection = 'rgb_dmds'
     class_label = 'rgb_dmd'
 
-    __slots__ = ["hw_device"]
+    __slots__ = ["hw_device", "frame_buffer", "frame_diff"]
 
     @classmethod
     def device_class_init(cls, machine: MachineController):
@@ -30,6 +33,8 @@ class RgbDmd(SystemWideDevice):
     def __init__(self, machine, name):
         """Initialize DMD."""
         self.hw_device = None
+        self.frame_buffer = None    # type: SharedFrameBuffer
+        self.frame_diff = None      # type: DmdFrameDiff
         self.platform = None        # type: RgbDmdPlatform
         super().__init__(machine, name)
 
@@ -38,6 +43,10 @@ class RgbDmd(SystemWideDevice):
         self.platform = self.machine.get_platform_sections("rgb_dmd", self.config['platform'])
         self.platform.assert_has_feature("rgb_dmds")
         self.hw_device = self.platform.configure_rgb_dmd(self.name)
+        if self.config['only_send_changes']:
+            self.frame_diff = DmdFrameDiff()
+        if self.config['shared_memory']:
+            self._create_frame_buffer()
         self._update_brightness(None)
 
     def _update_brightness(self, future):
@@ -46,17 +55,6 @@ class RgbDmd(SystemWideDevice):
         self.hw_device.set_brightness(brightness)
         brightness_changed_future.add_done_callback(self._update_brightness)
 
-    @classmethod
-    async def _bcp_receive_dmd_frame(cls, machine, client, name, rawbytes, **kwargs):
-        """Update dmd from BCP."""
-        del client
-        del kwargs
-
-        if name not in machine.rgb_dmds:
-            raise TypeError("rgb dmd {} not known".format(name))
-
-        machine.rgb_dmds[name].update(rawbytes)
-
     def update(self, data: bytes):
         """Update data on the dmd.
 
@@ -64,4 +62,7 @@ class RgbDmd(SystemWideDevice):
         ----
             data: bytes to send
         """
+        if self.frame_diff and not self.frame_diff.update(data):
+            # with only_send_changes the frame is not sent again
+            return
         self.hw_device.update(data)
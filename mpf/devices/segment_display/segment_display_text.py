@@ -1,7 +1,7 @@
 """Specialized text support classes for segment displays."""
 import abc
 from collections import namedtuple
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Tuple
 
 from mpf.core.rgb_color import RGBColor
 
@@ -11,6 +11,18 @@ DOT_CODE = ord(".")
 COMMA_CODE = ord(",")
 SPACE_CODE = ord(" ")
 
+# characters by text, display size, dot and comma settings and colors. transitions parse the same texts in every step
+# and score displays often show the same texts again.
+CHARACTER_CACHE_SIZE = 1024
+_character_cache = {}     # type: Dict[tuple, Tuple[DisplayCharacter, ...]]
+
+
+def get_colors_key(colors: Optional[List[Optional[RGBColor]]]) -> Optional[tuple]:
+    """Return a hashable key for a list of colors."""
+    if colors is None:
+        return None
+    return tuple(color.rgb if isinstance(color, RGBColor) else color for color in colors)
+
 
 class SegmentDisplayText(metaclass=abc.ABCMeta):
 
@@ -69,7 +81,6 @@ class SegmentDisplayText(metaclass=abc.ABCMeta):
 
         return char_list
 
-    # pylint: disable-msg=too-many-locals
     @classmethod
     def _create_characters(cls, text: str, display_size: int, collapse_dots: bool, collapse_commas: bool,
                            use_dots_for_commas: bool, colors: List[Optional[RGBColor]]) -> List[DisplayCharacter]:
@@ -80,7 +91,29 @@ class SegmentDisplayText(metaclass=abc.ABCMeta):
         - The first color is used to pad the text to the left if text is shorter than the display - thus text is right
           aligned.
         - Dots and commas are embedded on the fly.
+
+        Results are cached. Every call returns a new list.
         """
+        key = (text, display_size, collapse_dots, collapse_commas, use_dots_for_commas, get_colors_key(colors))
+        try:
+            characters = _character_cache.get(key)
+        except TypeError:
+            # colors which are not hashable
+            return cls._create_characters_uncached(text, display_size, collapse_dots, collapse_commas,
+                                                   use_dots_for_commas, colors)
+        if characters is None:
+            characters = tuple(cls._create_characters_uncached(text, display_size, collapse_dots, collapse_commas,
+                                                               use_dots_for_commas, colors[:]))
+            if len(_character_cache) >= CHARACTER_CACHE_SIZE:
+                _character_cache.clear()
+            _character_cache[key] = characters
+        return list(characters)
+
+    # pylint: disable-msg=too-many-locals
+    @classmethod
+    def _create_characters_uncached(cls, text: str, display_size: int, collapse_dots: bool, collapse_commas: bool,
+                                    use_dots_for_commas: bool,
+                                    colors: List[Optional[RGBColor]]) -> List[DisplayCharacter]:
         char_list = []
         left_pad_color = colors[0] if colors else None
         default_right_color = colors[len(colors) - 1] if colors else None
@@ -1,14 +1,19 @@
 """Text transitions used for segment displays."""
 import abc
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 
 from mpf.core.placeholder_manager import TextTemplate
 from mpf.core.rgb_color import RGBColor
-from mpf.devices.segment_display.segment_display_text import SegmentDisplayText, UncoloredSegmentDisplayText
+from mpf.devices.segment_display.segment_display_text import SegmentDisplayText, UncoloredSegmentDisplayText, \
+    DisplayCharacter, get_colors_key
 
 STEP_OUT_OF_RANGE_ERROR = "Step is out of range"
 TRANSITION_DIRECTION_UNKNOWN_ERROR = "Transition uses an unknown direction value"
 
+# transition frames by transition, step, texts and colors. score displays run the same transitions over and over.
+FRAME_CACHE_SIZE = 1024
+_frame_cache = {}     # type: Dict[tuple, Tuple[type, Tuple[DisplayCharacter, ...]]]
+
 
 class TransitionBase(metaclass=abc.ABCMeta):
 
@@ -30,6 +35,11 @@ class TransitionBase(metaclass=abc.ABCMeta):
             if hasattr(self, key):
                 setattr(self, key, value)
 
+    def get_cache_key(self) -> tuple:
+        """Return a key which is equal for transitions which produce the same frames."""
+        return (self.__class__, self.output_length, self.collapse_dots, self.collapse_commas,
+                self.use_dots_for_commas, repr(sorted(self.config.items())))
+
     @abc.abstractmethod
     def get_step_count(self):
         """Return the total number of steps required for the transition."""
@@ -48,7 +58,8 @@ class TransitionRunner:
 
     """Class to run/execute transitions using an iterator."""
 
-    __slots__ = ["_transition", "_step", "_current_placeholder", "_new_placeholder", "_current_colors", "_new_colors"]
+    __slots__ = ["_transition", "_step", "_current_placeholder", "_new_placeholder", "_current_colors", "_new_colors",
+                 "_cache_key"]
 
     # pylint: disable=too-many-arguments
     def __init__(self, machine, transition: TransitionBase, current_text: str, new_text: str,
@@ -61,6 +72,7 @@ class TransitionRunner:
         self._new_placeholder = TextTemplate(machine, new_text)
         self._current_colors = current_colors
         self._new_colors = new_colors
+        self._cache_key = (transition.get_cache_key(), get_colors_key(current_colors), get_colors_key(new_colors))
 
     def __iter__(self):
         """Return the iterator."""
@@ -71,11 +83,30 @@ class TransitionRunner:
         if self._step >= self._transition.get_step_count():
             raise StopIteration
 
-        transition_step = self._transition.get_transition_step(self._step,
-                                                               self._current_placeholder.evaluate({}),
-                                                               self._new_placeholder.evaluate({}),
-                                                               self._current_colors,
-                                                               self._new_colors)
+        current_text = self._current_placeholder.evaluate({})
+        new_text = self._new_placeholder.evaluate({})
+        key = (self._cache_key, self._step, current_text, new_text)
+        try:
+            frame = _frame_cache.get(key)
+        except TypeError:
+            # colors which are not hashable
+            key = None
+            frame = None
+
+        if frame is None:
+            transition_step = self._transition.get_transition_step(self._step, current_text, new_text,
+                                                                   self._current_colors, self._new_colors)
+            if key is not None:
+                if len(_frame_cache) >= FRAME_CACHE_SIZE:
+                    _frame_cache.clear()
+                # pylint: disable-msg=protected-access
+                _frame_cache[key] = (transition_step.__class__, tuple(transition_step._text))
+        else:
+            # return a new instance because texts are mutable
+            text_class, characters = frame
+            transition_step = text_class(list(characters), self._transition.collapse_dots,
+                                         self._transition.collapse_commas, self._transition.use_dots_for_commas)
+
         self._step += 1
         return transition_step
 
@@ -13,6 +13,8 @@ class TimedSwitch(SystemWideDevice, ModeDevice):
     collection = 'timed_switches'
     class_label = 'timed_switch'
 
+    __slots__ = ["active_switches"]
+
     def __init__(self, machine, name):
         """Initialize Timed Switch."""
         super().__init__(machine, name)
@@ -14,9 +14,13 @@ class PickleInterface(FileInterface):
 
     file_types = ['.bin']
 
-    def load(self, filename, expected_version_str=None, halt_on_error=True):
-        """Load data from binary file."""
+    def load(self, filename, expected_version_str=None, halt_on_error=True, shared=False):
+        """Load data from binary file.
+
+        Every call unpickles a new object so the result is never shared.
+        """
         del expected_version_str
+        del shared
         self.log.info("Loading %s", filename)
         try:
             with open(filename, "rb") as f:
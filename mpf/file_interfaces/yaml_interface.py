@@ -3,23 +3,119 @@ import copy
 from typing import Any, Iterable, Dict
 
 from ruamel import yaml
+from ruamel.yaml.constructor import DuplicateKeyError
 from ruamel.yaml.error import MarkedYAMLError
+from ruamel.yaml.resolver import implicit_resolvers
+from ruamel.yaml.util import create_timestamp, timestamp_regexp
 
 from mpf.core.file_interface import FileInterface
 
+# pylint: disable-msg=ungrouped-imports
+try:
+    import yaml as pyyaml
+    from yaml import CSafeLoader
+except ImportError:
+    pyyaml = None
+    CSafeLoader = None
+
 _yaml = yaml.YAML(typ='safe')
 _yaml.default_flow_style = False
 
 
+def _construct_yaml_int(loader, node):
+    value = loader.construct_scalar(node).replace('_', '')
+    sign = -1 if value[0] == '-' else 1
+    if value[0] in '+-':
+        value = value[1:]
+    if value.startswith('0b'):
+        return sign * int(value[2:], 2)
+    if value.startswith('0x'):
+        return sign * int(value[2:], 16)
+    if value.startswith('0o'):
+        return sign * int(value[2:], 8)
+    return sign * int(value)
+
+
+def _construct_yaml_float(loader, node):
+    value = loader.construct_scalar(node).replace('_', '').lower()
+    sign = -1 if value[0] == '-' else 1
+    if value[0] in '+-':
+        value = value[1:]
+    if value == '.inf':
+        return sign * float('inf')
+    if value == '.nan':
+        return float('nan')
+    return sign * float(value)
+
+
+def _construct_yaml_bool(loader, node):
+    return loader.construct_scalar(node).lower() == 'true'
+
+
+def _construct_yaml_timestamp(loader, node):
+    match = timestamp_regexp.match(loader.construct_scalar(node))
+    if match is None:
+        raise pyyaml.constructor.ConstructorError(None, None, 'failed to construct timestamp from "{}"'.format(
+            node.value), node.start_mark)
+    return create_timestamp(**match.groupdict())
+
+
+if CSafeLoader:
+    class _FastSafeLoader(CSafeLoader):     # pylint: disable-msg=too-many-ancestors
+
+        """Parse and compose in libyaml and construct plain dicts and lists like ruamel's YAML 1.2 safe loader.
+
+        Scalars are resolved with ruamel's YAML 1.2 rules (e.g. "on" and "yes" stay strings and 012 is 12).
+        Duplicate keys are errors. An alias constructs a new object every time it is used so that modifying
+        one place does not change another one.
+        """
+
+        yaml_implicit_resolvers = {}    # type: Dict[str, Any]
+
+        def construct_object(self, node, deep=False):
+            """Construct a new object for every alias."""
+            self.constructed_objects.pop(node, None)
+            return super().construct_object(node, deep)
+
+        def construct_mapping(self, node, deep=False):
+            """Construct mapping and refuse duplicate keys."""
+            if isinstance(node, pyyaml.MappingNode):
+                self.flatten_mapping(node)
+            keys = set()
+            for key_node, _ in node.value:
+                if isinstance(key_node, pyyaml.ScalarNode):
+                    key = (key_node.tag, key_node.value)
+                    if key in keys:
+                        raise DuplicateKeyError("while constructing a mapping", node.start_mark,
+                                                'found duplicate key "{}"'.format(key_node.value),
+                                                key_node.start_mark)
+                    keys.add(key)
+            return super().construct_mapping(node, deep)
+
+    for _versions, _tag, _regexp, _first in implicit_resolvers:
+        if (1, 2) in _versions:
+            _FastSafeLoader.add_implicit_resolver(_tag, _regexp, _first)
+    _FastSafeLoader.add_constructor('tag:yaml.org,2002:int', _construct_yaml_int)
+    _FastSafeLoader.add_constructor('tag:yaml.org,2002:float', _construct_yaml_float)
+    _FastSafeLoader.add_constructor('tag:yaml.org,2002:bool', _construct_yaml_bool)
+    _FastSafeLoader.add_constructor('tag:yaml.org,2002:timestamp', _construct_yaml_timestamp)
+else:
+    _FastSafeLoader = None
+
+_MARKED_YAML_ERRORS = (MarkedYAMLError, pyyaml.MarkedYAMLError) if pyyaml else (MarkedYAMLError, )
+
+
 class YamlInterface(FileInterface):
 
     """File interface for yaml files."""
 
     file_types = ['.yaml', '.yml']
     cache = False
+    # use libyaml through PyYAML if it is installed
+    fast_loader = _FastSafeLoader is not None
     file_cache = dict()     # type: Dict[str, Any]
 
-    def load(self, filename, expected_version_str=None, halt_on_error=True) -> dict:
+    def load(self, filename, expected_version_str=None, halt_on_error=True, shared=False) -> dict:
         """Load a YAML file from disk.
 
         Args:
@@ -30,10 +126,14 @@ class YamlInterface(FileInterface):
                 can't be loaded. (Not found, invalid format, etc. If True, MPF
                 will raise an error and exit. If False, an empty config
                 dictionary will be returned.
+            shared: If True the result may be the cached dictionary. The
+                caller must not modify it.
 
         Returns a dictionary of the settings from this YAML file.
         """
         if self.cache and filename in self.file_cache:
+            if shared:
+                return self.file_cache[filename]
             return copy.deepcopy(self.file_cache[filename])
 
         config = dict()     # type: dict
@@ -48,8 +148,7 @@ class YamlInterface(FileInterface):
                         raise AssertionError("Version mismatch. Expected: {} Actual: {} Files: {}".format(
                             expected_version_str, version_str, filename))
                 config = self.process(f)
-                config = self.to_plain_dict(config)
-        except MarkedYAMLError as e:
+        except _MARKED_YAML_ERRORS as e:
             mark = e.problem_mark
             msg = "YAML error found in file {}. Line {}, " \
                   "Position {}: {}".format(filename, mark.line + 1 if mark else None,
@@ -67,7 +166,9 @@ class YamlInterface(FileInterface):
             self.log.warning(msg)
 
         if self.cache and config:
-            self.file_cache[filename] = copy.deepcopy(config)
+            self.file_cache[filename] = config
+            if not shared:
+                return copy.deepcopy(config)
 
         return config
 
@@ -80,10 +181,12 @@ class YamlInterface(FileInterface):
             return [YamlInterface.to_plain_dict(item) for item in data]
         return data
 
-    @staticmethod
-    def process(data_string: Iterable[str]) -> dict:
-        """Parse yaml from a string."""
-        return _yaml.load(data_string)
+    @classmethod
+    def process(cls, data_string: Iterable[str]) -> dict:
+        """Parse yaml from a string or file."""
+        if cls.fast_loader:
+            return pyyaml.load(data_string, Loader=_FastSafeLoader)   # nosec
+        return cls.to_plain_dict(_yaml.load(data_string))
 
     def save(self, filename: str, data: dict) -> None:   # pragma: no cover
         """Save config to yaml file."""
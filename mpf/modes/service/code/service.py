@@ -745,16 +745,13 @@ sort_devices_by_number: single|bool|True
         await self._audits_submenu(items)
 
     async def _audit_switch_menu(self):
-        items = self.machine.auditor.current_audits.get('switches', {})
-        await self._audits_submenu(list(items.items()))
+        await self._audits_submenu(self.machine.auditor.get_audits('switches'))
 
     async def _audit_shot_menu(self):
-        items = self.machine.auditor.current_audits.get('shots', {})
-        await self._audits_submenu(list(items.items()))
+        await self._audits_submenu(self.machine.auditor.get_audits('shots'))
 
     async def _audit_event_menu(self):
-        items = self.machine.auditor.current_audits.get('events', {})
-        await self._audits_submenu(list(items.items()))
+        await self._audits_submenu(self.machine.auditor.get_audits('events'))
 
     def _update_settings_slide(self, items, position, is_change=False):
         setting = items[position]
@@ -0,0 +1,46 @@
+"""Frame diffing and lookup tables shared by DMD platforms."""
+from typing import Optional, List
+
+
+def create_lookup_table(values: List[int]) -> bytes:
+    """Return a table for bytes.translate which maps every byte value to values[byte].
+
+    Translating a frame runs in C and replaces per-pixel lookups in Python.
+    """
+    if len(values) != 256:
+        raise AssertionError("Lookup table needs 256 entries.")
+    return bytes(value & 0xFF for value in values)
+
+
+class DmdFrameDiff:
+
+    """Compare every frame with the last one which has been sent to the hardware.
+
+    Used by DMDs with only_send_changes to skip identical frames.
+    """
+
+    __slots__ = ["last_frame", "frames_sent", "frames_skipped"]
+
+    def __init__(self) -> None:
+        """Initialise frame diff."""
+        self.last_frame = None      # type: Optional[bytes]
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
+    def update(self, frame: bytes) -> bool:
+        """Remember frame and return False if it is the same as the last one."""
+        frame = bytes(frame)
+        if self.last_frame == frame:
+            self.frames_skipped += 1
+            return False
+
+        self.last_frame = frame
+        self.frames_sent += 1
+        return True
+
+    def get_metrics(self) -> dict:
+        """Return counters about sent and skipped frames."""
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+        }
@@ -105,6 +105,10 @@ class FASTLEDChannel(LightPlatformInterface):
         self._current_fade = (start_brightness, start_time, target_brightness, target_time)
         self._last_brightness = None
 
+    def get_max_fade_ms(self) -> int:
+        """Return the hardware fade time of the LED."""
+        return self.led.hardware_fade_ms
+
     def get_fade_and_brightness(self, current_time):
         """Return fade + brightness and mark as clean if this is it."""
         if self._last_brightness:
@@ -38,6 +38,14 @@ class LightPlatformInterface(metaclass=abc.ABCMeta):
         """Return the name of the board of this light."""
         raise NotImplementedError
 
+    def get_max_fade_ms(self) -> int:
+        """Return the longest fade in ms which the hardware runs on its own.
+
+        0 means that the host has to do all fading (default). A negative
+        value means that there is no limit.
+        """
+        return 0
+
     def is_successor_of(self, other):
         """Return true if this light is the direct successor of the other light passed as parameter."""
         raise NotImplementedError
@@ -7,12 +7,14 @@ from mpf.core.segment_mappings import SEVEN_SEGMENTS, BCD_SEGMENTS, FOURTEEN_SEG
 from mpf.platforms.interfaces.segment_display_platform_interface import SegmentDisplaySoftwareFlashPlatformInterface
 from mpf.core.platform import SegmentDisplaySoftwareFlashPlatform
 
+_SEGMENT_OFF = object()
+
 
 class LightSegmentDisplay(SegmentDisplaySoftwareFlashPlatformInterface):
 
     """Segment display which drives lights."""
 
-    __slots__ = ["_lights", "_key", "_segment_map", "_current_text"]
+    __slots__ = ["_lights", "_key", "_segment_map", "_current_text", "_light_colors"]
 
     def __init__(self, number, lights, segment_type):
         """Initialize segment display."""
@@ -33,6 +35,8 @@ class LightSegmentDisplay(SegmentDisplaySoftwareFlashPlatformInterface):
 
         self._key = "segment_display_{}".format(number)
         self._current_text = None
+        # color per segment light which we set last
+        self._light_colors = [{} for _ in lights]
 
     def _set_text(self, text: ColoredSegmentDisplayText) -> None:
         """Set text to lights."""
@@ -48,12 +52,20 @@ class LightSegmentDisplay(SegmentDisplaySoftwareFlashPlatformInterface):
         mapped_text = TextToSegmentMapper.map_segment_text_to_segments_with_color(
             self._current_text, len(self._lights), self._segment_map)
 
-        for char, lights_for_char in zip(mapped_text, self._lights):
+        # only touch lights which change
+        for (segment, color), lights_for_char, light_colors in zip(mapped_text, self._lights, self._light_colors):
             for name, light in lights_for_char.items():
-                if getattr(char[0], name):
-                    light.color(color=char[1], key=self._key)
-                else:
+                new_color = color if getattr(segment, name) else _SEGMENT_OFF
+                if name in light_colors:
+                    old_color = light_colors[name]
+                    if old_color is new_color or old_color is not _SEGMENT_OFF and new_color is not _SEGMENT_OFF \
+                            and old_color == new_color:
+                        continue
+                light_colors[name] = new_color
+                if new_color is _SEGMENT_OFF:
                     light.remove_from_stack_by_key(key=self._key)
+                else:
+                    light.color(color=new_color, key=self._key)
 
 
 class LightSegmentDisplaysPlatform(SegmentDisplaySoftwareFlashPlatform):
@@ -4,6 +4,7 @@ import logging
 import threading
 from mpf.core.utility_functions import Util
 
+from mpf.platforms.dmd_frame_diff import create_lookup_table
 from mpf.platforms.interfaces.dmd_platform import DmdPlatformInterface
 from mpf.core.platform import RgbDmdPlatform
 
@@ -33,6 +34,10 @@ GAMMA_TABLE = [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1,
                45, 46, 47, 47, 48, 48, 49, 49, 50, 50, 51, 52, 52, 53, 53, 54,
                55, 55, 56, 56, 57, 58, 58, 59, 60, 60, 61, 62, 62, 63, 63, 63]
 
+# PLANE_TABLES[plane][bit] maps a color value to bit "plane" of its gamma corrected value shifted to "bit"
+PLANE_TABLES = [[create_lookup_table([((GAMMA_TABLE[value] >> plane) & 1) << bit for value in range(256)])
+                 for bit in range(6)] for plane in range(6)]
+
 
 class Pin2DmdHardwarePlatform(RgbDmdPlatform):
 
@@ -113,56 +118,27 @@ class Pin2DmdDevice(DmdPlatformInterface):
         else:
             elements = 6144
 
-        output_buffer = [0] * (elements * 6 + 4)
-
-        output_buffer[0] = 0x81
-        output_buffer[1] = 0xC3
-        output_buffer[2] = 0xE9
-        output_buffer[3] = 18
-
-        for i in range(0, elements):
-            idx = i * 3
-
-            if self.panel == "rgb":
-                # use these mappings for RGB panels
-                pixel_r = buffer[idx]
-                pixel_g = buffer[idx + 1]
-                pixel_b = buffer[idx + 2]
-                # lower half of display
-                pixel_rl = buffer[elements * 3 + idx]
-                pixel_gl = buffer[elements * 3 + idx + 1]
-                pixel_bl = buffer[elements * 3 + idx + 2]
-            else:
-                # use these mappings for RBG panels
-                pixel_r = buffer[idx]
-                pixel_g = buffer[idx + 2]
-                pixel_b = buffer[idx + 1]
-                # lower half of display
-                pixel_rl = buffer[elements * 3 + idx]
-                pixel_gl = buffer[elements * 3 + idx + 2]
-                pixel_bl = buffer[elements * 3 + idx + 1]
-
-            # color correction
-            pixel_r = GAMMA_TABLE[pixel_r]
-            pixel_g = GAMMA_TABLE[pixel_g]
-            pixel_b = GAMMA_TABLE[pixel_b]
-
-            pixel_rl = GAMMA_TABLE[pixel_rl]
-            pixel_gl = GAMMA_TABLE[pixel_gl]
-            pixel_bl = GAMMA_TABLE[pixel_bl]
-
-            target_idx = i + 4
-
-            for _ in range(0, 6):
-                output_buffer[target_idx] = ((pixel_gl & 1) << 5) | ((pixel_bl & 1) << 4) | ((pixel_rl & 1) << 3) |\
-                                            ((pixel_g & 1) << 2) | ((pixel_b & 1) << 1) | ((pixel_r & 1) << 0)
-                pixel_r >>= 1
-                pixel_g >>= 1
-                pixel_b >>= 1
-                pixel_rl >>= 1
-                pixel_gl >>= 1
-                pixel_bl >>= 1
-                target_idx += elements
+        upper = bytes(buffer[:elements * 3])
+        lower = bytes(buffer[elements * 3:elements * 6])
+        if len(lower) != elements * 3:
+            raise AssertionError("Frame has {} bytes but PIN2DMD expects {} bytes.".format(
+                len(buffer), elements * 6))
+
+        # channels in the order of their bit in the output (r, b, g for upper and lower half)
+        if self.panel == "rgb":
+            # use these mappings for RGB panels
+            channels = (upper[0::3], upper[2::3], upper[1::3], lower[0::3], lower[2::3], lower[1::3])
+        else:
+            # use these mappings for RBG panels
+            channels = (upper[0::3], upper[1::3], upper[2::3], lower[0::3], lower[1::3], lower[2::3])
+
+        output_buffer = bytearray([0x81, 0xC3, 0xE9, 18])
+        for plane_tables in PLANE_TABLES:
+            # every channel contributes a different bit so or-ing the planes as big ints combines them in C
+            plane = 0
+            for channel, table in zip(channels, plane_tables):
+                plane |= int.from_bytes(channel.translate(table), "little")
+            output_buffer += plane.to_bytes(elements, "little")
 
         if self.debug:
             self.log.debug("Writing 0x01, %s, 1000", "".join(" 0x%02x" % b for b in output_buffer))
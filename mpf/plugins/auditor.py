@@ -1,4 +1,5 @@
 """MPF plugin for an auditor which records switch events, high scores, shots, etc."""
+import heapq
 
 from mpf.core.switch_controller import MonitoredSwitchChange
 from mpf.core.plugin import MpfPlugin
@@ -7,7 +8,7 @@ from mpf.devices.shot import Shot
 MYPY = False
 if MYPY:   # pragma: no cover
     from mpf.core.machine import MachineController  # pylint: disable-msg=cyclic-import,unused-import
-    from typing import Any, Set     # pylint: disable-msg=cyclic-import,unused-import
+    from typing import Any, Set, List, Tuple    # pylint: disable-msg=cyclic-import,unused-import
 
 
 class Auditor(MpfPlugin):
@@ -15,7 +16,8 @@ class Auditor(MpfPlugin):
     """Writes switch events, regular events, and player variables to an audit log file."""
 
     __slots__ = ["switchnames_to_audit", "_autosave",
-                 "current_audits", "enabled", "data_manager"]
+                 "current_audits", "enabled", "data_manager", "_dirty_audits", "_save_pending",
+                 "_flush_scheduled", "_save_interval", "saves_avoided"]
 
     config_section = 'auditor'
 
@@ -27,6 +29,11 @@ class Auditor(MpfPlugin):
         self.enabled = None
         self.data_manager = None
         self.switchnames_to_audit = None
+        self._dirty_audits = set()      # type: Set[Tuple[str, str]]
+        self._save_pending = False
+        self._flush_scheduled = False
+        self._save_interval = 0
+        self.saves_avoided = 0
 
     def initialize(self):
         """Initialize the auditor."""
@@ -99,6 +106,9 @@ class Auditor(MpfPlugin):
                     self.current_audits['player'][item]['top'] = list()
                     self.current_audits['player'][item]['average'] = 0
                     self.current_audits['player'][item]['total'] = 0
+                else:
+                    # audit files may have been edited. top lists have to be sorted for merging
+                    self.current_audits['player'][item]['top'].sort(reverse=True)
 
     def _set_machine_variables(self):
         """Set machine variables for audits."""
@@ -117,6 +127,7 @@ class Auditor(MpfPlugin):
 
         self.current_audits = self.data_manager.get_data()
         self._autosave = self.config["autosave"]
+        self._save_interval = self.config["save_interval"] / 1000.0
 
         self._load_defaults()
         self._set_machine_variables()
@@ -127,15 +138,18 @@ class Auditor(MpfPlugin):
             self.machine.events.add_handler(event, self.enable)
         for event in self.config['disable_events']:
             self.machine.events.add_handler(event, self.disable)
+        self.machine.events.add_handler('shutdown', self.flush)
 
     def _reset(self, **kwargs):
         """Reset audits."""
         del kwargs
         self.log.info("Resetting audits")
         self.current_audits = {}
+        self._dirty_audits = set()
         self._load_defaults()
         self._set_machine_variables()
-        self._save_audits()
+        self._save_pending = True
+        self.flush()
 
     def audit(self, audit_class, event, value=None, **kwargs):
         """Log an auditable event.
@@ -163,9 +177,39 @@ class Auditor(MpfPlugin):
             self.current_audits[audit_class][event] += 1
         else:
             self.current_audits[audit_class][event] = value
-        self.machine.variables.set_machine_var("audits_{}_{}".format(audit_class, event),
-                                               self.current_audits[audit_class][event])
-        if self._autosave:
+        self._dirty_audits.add((audit_class, event))
+        self._schedule_flush(self._autosave)
+
+    def _schedule_flush(self, save):
+        """Flush changed audits now or at the end of the save interval."""
+        if save:
+            if self._save_pending:
+                self.saves_avoided += 1
+            self._save_pending = True
+        if not self._save_interval:
+            self.flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.machine.clock.schedule_once(self._flush_scheduled_audits, self._save_interval)
+
+    def _flush_scheduled_audits(self):
+        self._flush_scheduled = False
+        self.flush()
+
+    def flush(self, **kwargs):
+        """Update machine variables of changed audits and save them if needed.
+
+        Called at the end of the save interval, on game end and on shutdown.
+        """
+        del kwargs
+        if self._dirty_audits:
+            dirty_audits = self._dirty_audits
+            self._dirty_audits = set()
+            for audit_class, event in dirty_audits:
+                self.machine.variables.set_machine_var("audits_{}_{}".format(audit_class, event),
+                                                       self.current_audits[audit_class][event])
+        if self._save_pending:
+            self._save_pending = False
             self._save_audits()
 
     def get_audit(self, audit_class, event, **kwargs):
@@ -213,7 +257,7 @@ class Auditor(MpfPlugin):
         except KeyError:
             self.current_audits['events'][eventname] = 1
         if self._autosave or self.config['autosave_events']:
-            self._save_audits()
+            self._schedule_flush(True)
 
     def audit_player(self, **kwargs):
         """Write player data to the audit log.
@@ -250,7 +294,7 @@ class Auditor(MpfPlugin):
 
                 self.current_audits['player'][item]['total'] += 1
         if self._autosave:
-            self._save_audits()
+            self._schedule_flush(True)
 
     def report_missing_switches(self, missing_switch_min_games=None):
         """Generate a report of switches that have not been hit in a while."""
@@ -260,12 +304,27 @@ class Auditor(MpfPlugin):
         result = filter(lambda x: x[1] >= min_threshold, missing_switches)
         return list(result)
 
+    def get_audits(self, audit_class) -> "List[Tuple[str, Any]]":
+        """Return all audits of a class as list of (name, value).
+
+        This is used by the service mode audit pages.
+        """
+        return list(self.current_audits.get(audit_class, {}).items())
+
+    def get_top_audits(self, audit_class, count) -> "List[Tuple[str, Any]]":
+        """Return the count audits with the highest values in a class."""
+        return heapq.nlargest(count, self.current_audits.get(audit_class, {}).items(), key=lambda x: x[1])
+
     @classmethod
     def _merge_into_top_list(cls, new_item, current_list, num_items):
-        # takes a list of top integers and a new item and merges the new item
-        # into the list, then trims it based on the num_items specified
-        current_list.append(new_item)
-        current_list.sort(reverse=True)
+        # takes a descending list of top integers and a new item and merges
+        # the new item into the list, then trims it based on the num_items
+        # specified. the list is already sorted so we only search the slot.
+        position = len(current_list)
+        while position > 0 and current_list[position - 1] < new_item:
+            position -= 1
+        if position < num_items:
+            current_list.insert(position, new_item)
         return current_list[0:num_items]
 
     def enable(self, **kwargs):
@@ -333,6 +392,7 @@ class Auditor(MpfPlugin):
         del kwargs
         self.log.debug("Disabling the Auditor")
         self.enabled = False
+        self.flush()
 
         # remove switch and event handlers
         self.machine.events.remove_handler(self.audit_event)
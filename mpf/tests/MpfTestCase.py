@@ -7,7 +7,7 @@ import sys
 import time
 import unittest
 
-from mpf.core.config_loader import YamlMultifileConfigLoader
+from mpf.core.headless_machine import HeadlessConfigLoader, HeadlessMachineController
 
 from unittest.mock import *
 
@@ -17,12 +17,12 @@ from asyncio import events
 from mpf.core.logging import LogMixin
 from mpf.core.rgb_color import RGBColor
 
+from mpf.tests import fork_server
 from mpf.tests.TestDataManager import TestDataManager
 from mpf.tests.loop import TimeTravelLoop, TestClock
 
 import mpf.core
 import mpf.core.config_validator
-from mpf.core.machine import MachineController
 from mpf.core.utility_functions import Util
 from mpf.file_interfaces.yaml_interface import YamlInterface
 
@@ -30,33 +30,10 @@ YamlInterface.cache = True
 
 LOCAL_START_TIMEOUT = 20  # Set to None if you need to pause and debug something
 
-class UnitTestConfigLoader(YamlMultifileConfigLoader):
+class UnitTestConfigLoader(HeadlessConfigLoader):
 
     """Config Loader for Unit Tests."""
 
-    def __init__(self, machine_path, configfile, config_defaults, config_patches, spec_patches):
-        super().__init__(machine_path, configfile, True, True)
-        self.config_defaults = config_defaults
-        self.config_patches = config_patches
-        self.spec_patches = spec_patches
-
-    def _load_config_spec(self):
-        config_spec = super()._load_config_spec()
-        if self.spec_patches:
-            config_spec = Util.dict_merge(config_spec, self.spec_patches, deepcopy_both=False)
-        return config_spec
-
-    def _load_mpf_machine_config(self, config_spec):
-        config = super()._load_mpf_machine_config(config_spec)
-        # remove text-ui as it imports a lot of modules which we do not need in tests
-        del(config["mpf"]["core_modules"]["text_ui"])
-
-        if self.config_defaults:
-            config = Util.dict_merge(self.config_defaults, config, deepcopy_both=False)
-        if self.config_patches:
-            config = Util.dict_merge(config, self.config_patches, False, deepcopy_both=False)
-        return config
-
 
 class MpfUnitTestFormatter(logging.Formatter):
 
@@ -100,7 +77,7 @@ def test_config_directory(config_directory):
     return test_decorator
 
 
-class TestMachineController(MachineController):
+class TestMachineController(HeadlessMachineController):
 
     """A patched version of the MachineController used in tests.
 
@@ -116,35 +93,22 @@ class TestMachineController(MachineController):
 
     """
 
-    def __init__(self, options, config, config_patches, config_defaults, clock, mock_data,
-                 enable_plugins=False):
-        self.test_config_patches = config_patches
-        self.test_config_defaults = config_defaults
-        self._enable_plugins = enable_plugins
-        self._test_clock = clock
-        self._mock_data = mock_data
-        super().__init__(options, config)
-
     def create_data_manager(self, config_name):
         """Create TestDataManager."""
         return TestDataManager(self._mock_data.get(config_name, {}))
 
-    def _load_clock(self):
-        return self._test_clock
-
     def __del__(self):
         if self._test_clock:
             self._test_clock.loop.close()
 
-    def _register_plugin_config_players(self):
-        if self._enable_plugins:
-            super()._register_plugin_config_players()
-
 
 class MpfTestCase(unittest.TestCase):
 
     """Primary TestCase class used for all MPF unit tests."""
 
+    # boot the machine once and run every test in a fork of it. see fork_server.
+    use_fork_server = False
+
     def __init__(self, methodName='runTest'):
         LogMixin.unit_test = True
 
@@ -169,6 +133,31 @@ class MpfTestCase(unittest.TestCase):
         self._events = {}
         self.expected_duration = 0.5
 
+    def _get_fork_server_key(self):
+        """Return the key of the pre-booted machine for this test or None to run it normally."""
+        if not self.use_fork_server and os.getenv('MPF_TEST_FORK_SERVER', '0') != '1':
+            return None
+        test_method = getattr(self, self._testMethodName)
+        if (not fork_server.is_fork_server_available() or
+                getattr(self.__class__, "__unittest_skip__", False) or
+                getattr(test_method, "__unittest_skip__", False) or
+                getattr(test_method, "expect_startup_error", False)):
+            return None
+        try:
+            # some tests pick mock data per test method
+            return (self.__class__, self.get_absolute_machine_path(), self._get_config_file(), self.get_platform(),
+                    repr(self._get_mock_data()))
+        except AttributeError:
+            # the test picks its config in the test method
+            return None
+
+    def run(self, result=None):
+        """Run test in a fork of a pre-booted machine if enabled."""
+        key = self._get_fork_server_key() if result is not None else None
+        if key is None:
+            return super().run(result)
+        return fork_server.run_forked(self, result, key)
+
     def start_mode(self, mode):
         """Start mode."""
         self.assertIn(mode, self.machine.modes)
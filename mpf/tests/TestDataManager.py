@@ -1,9 +1,8 @@
 """In-memory DataManager."""
-import copy
-from mpf.core.data_manager import DataManager
+from mpf.core.headless_machine import MemoryDataManager
 
 
-class TestDataManager(DataManager):
+class TestDataManager(MemoryDataManager):
 
     """A patched version of the DataManager which is used in unit tests.
 
@@ -12,10 +11,3 @@ class TestDataManager(DataManager):
     unneeded data.
 
     """
-
-    def __init__(self, data):
-        self.data = data
-        self.written_data = None
-
-    def _trigger_save(self):
-        self.written_data = copy.deepcopy(self.data)
@@ -0,0 +1,254 @@
+"""Run tests in forked children of a pre-booted machine.
+
+Booting a machine is the most expensive part of most tests. A fork server
+boots one machine per test class, machine path, config file, platform and
+mock data and stays around. For every test it forks a child from that
+pre-booted state (copy-on-write), runs the test plus tearDown in the child
+and sends the outcome back to the runner in the parent process.
+
+Enable it per test class with ``use_fork_server = True`` or for all tests
+with the environment variable ``MPF_TEST_FORK_SERVER=1``. It only works on
+platforms which support ``os.fork``. Tests which start threads or open real
+sockets during boot are not suitable because only the forking thread
+survives in the child. Coverage data of the children is not collected.
+"""
+import atexit
+import os
+import sys
+import time
+import traceback
+import unittest
+from collections import OrderedDict
+from multiprocessing import Pipe
+from typing import Optional
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from multiprocessing.connection import Connection   # pylint: disable-msg=cyclic-import,unused-import
+    from mpf.tests.MpfTestCase import MpfTestCase   # pylint: disable-msg=cyclic-import,unused-import
+
+# idle servers keep a whole machine in memory. tests run grouped by class
+# so there is no need to keep many around.
+MAX_FORK_SERVERS = 4
+
+
+class RemoteTestFailure(AssertionError):
+
+    """A test failed in a forked child. The message contains the original traceback."""
+
+
+class RemoteTestError(Exception):
+
+    """A test raised an error in a forked child. The message contains the original traceback."""
+
+
+def is_fork_server_available() -> bool:
+    """Return true if the platform can fork."""
+    return hasattr(os, "fork")
+
+
+def _skip_setup():
+    """Replace setUp in forked children because the machine is already booted."""
+
+
+class ForkServer:
+
+    """Boot a machine once and fork a child per test from it."""
+
+    __slots__ = ["key", "pid", "owner_pid", "_conn"]
+
+    def __init__(self, key) -> None:
+        """Initialise fork server.
+
+        Args:
+        ----
+            key: Tuple which identifies tests which can share a booted machine.
+        """
+        self.key = key
+        self.pid = None         # type: Optional[int]
+        self.owner_pid = os.getpid()
+        self._conn = None       # type: Optional[Connection]
+
+    def start(self, test: "MpfTestCase"):
+        """Fork the server process and boot the machine for a fresh instance of the test class."""
+        template = type(test)(test._testMethodName)
+        conn, server_conn = Pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid:
+            server_conn.close()
+            self.pid = pid
+            self._conn = conn
+            return
+
+        # server process. servers of the parent belong to the parent.
+        conn.close()
+        _servers.clear()
+        exit_code = 0
+        try:
+            self._serve(template, server_conn)
+        except BaseException:   # pylint: disable-msg=broad-except
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)     # pylint: disable-msg=protected-access
+
+    @staticmethod
+    def _serve(template: "MpfTestCase", conn: "Connection"):
+        """Boot the machine and fork a child for every test which is requested."""
+        boot_error = None
+        try:
+            template.setUp()
+        except BaseException:   # pylint: disable-msg=broad-except
+            boot_error = traceback.format_exc()
+
+        while True:
+            try:
+                method_name = conn.recv()
+            except EOFError:
+                return
+            if method_name is None:
+                return
+            if boot_error:
+                conn.send({"errors": ["Machine did not boot in fork server:\n" + boot_error]})
+                continue
+            conn.send(ForkServer._fork_test(template, method_name))
+
+    @staticmethod
+    def _fork_test(template: "MpfTestCase", method_name: str) -> dict:
+        """Run one test in a forked child and return its outcome."""
+        reader, writer = Pipe(duplex=False)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if not pid:
+            reader.close()
+            try:
+                writer.send(_run_in_child(template, method_name))
+            except BaseException:   # pylint: disable-msg=broad-except
+                writer.send({"errors": [traceback.format_exc()]})
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(0)     # pylint: disable-msg=protected-access
+
+        writer.close()
+        try:
+            outcome = reader.recv()
+        except EOFError:
+            outcome = None
+        reader.close()
+        _, status = os.waitpid(pid, 0)
+        if outcome is None:
+            outcome = {"errors": ["Forked test process died with status {}.".format(status)]}
+        return outcome
+
+    def run_test(self, method_name: str) -> dict:
+        """Run a test method in a fork of the booted machine and return its outcome."""
+        try:
+            self._conn.send(method_name)
+            return self._conn.recv()
+        except (EOFError, OSError):
+            self.stop()
+            return {"errors": ["Fork server for {} died.".format(self.key)]}
+
+    def stop(self):
+        """Stop the server and the machine in it."""
+        if not self._conn or os.getpid() != self.owner_pid:
+            return
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._conn.close()
+        self._conn = None
+        os.waitpid(self.pid, 0)
+
+
+def _run_in_child(template: "MpfTestCase", method_name: str) -> dict:
+    """Run test method, tearDown and cleanups on the pre-booted template and collect the outcome."""
+    template._testMethodName = method_name      # pylint: disable-msg=protected-access
+    template.setUp = _skip_setup
+    template.test_start_time = time.time()
+    result = unittest.TestResult()
+    unittest.TestCase.run(template, result)
+    return {
+        "failures": [_format_remote(test, template, tb) for test, tb in result.failures],
+        "errors": [_format_remote(test, template, tb) for test, tb in result.errors],
+        "skipped": [reason for _, reason in result.skipped],
+        "expected_failures": [tb for _, tb in result.expectedFailures],
+        "unexpected_success": bool(result.unexpectedSuccesses),
+    }
+
+
+def _format_remote(test, template, tb: str) -> str:
+    if test is template:
+        return tb
+    # sub tests
+    return "{}\n{}".format(test, tb)
+
+
+_servers = OrderedDict()    # type: OrderedDict
+
+
+def get_fork_server(test: "MpfTestCase", key) -> ForkServer:
+    """Return a running fork server for the key and start one if needed."""
+    server = _servers.get(key)
+    if server:
+        _servers.move_to_end(key)
+        return server
+
+    while len(_servers) >= MAX_FORK_SERVERS:
+        _, old_server = _servers.popitem(last=False)
+        old_server.stop()
+
+    server = ForkServer(key)
+    server.start(test)
+    _servers[key] = server
+    return server
+
+
+@atexit.register
+def stop_fork_servers():
+    """Stop all fork servers of this process."""
+    while _servers:
+        _, server = _servers.popitem()
+        server.stop()
+
+
+def run_forked(test: "MpfTestCase", result: unittest.TestResult, key):
+    """Run test in a fork of a pre-booted machine and report the outcome to result.
+
+    Args:
+    ----
+        test: Test to run.
+        result: Result of the runner in this process.
+        key: Tests with the same key share a pre-booted machine.
+    """
+    result.startTest(test)
+    try:
+        outcome = get_fork_server(test, key).run_test(test._testMethodName)     # pylint: disable-msg=W0212
+        reported = False
+        for tb in outcome.get("failures", []):
+            result.addFailure(test, (RemoteTestFailure, RemoteTestFailure(tb), None))
+            reported = True
+        for tb in outcome.get("errors", []):
+            result.addError(test, (RemoteTestError, RemoteTestError(tb), None))
+            reported = True
+        for reason in outcome.get("skipped", []):
+            result.addSkip(test, reason)
+            reported = True
+        for tb in outcome.get("expected_failures", []):
+            result.addExpectedFailure(test, (RemoteTestFailure, RemoteTestFailure(tb), None))
+            reported = True
+        if outcome.get("unexpected_success"):
+            result.addUnexpectedSuccess(test)
+            reported = True
+        if not reported:
+            result.addSuccess(test)
+    finally:
+        result.stopTest(test)
+    return result
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from mpf.plugins.auditor import Auditor
 from mpf.tests.MpfFakeGameTestCase import MpfFakeGameTestCase
 
@@ -167,3 +169,46 @@ class TestAuditor(MpfFakeGameTestCase):
         self.assertEqual(0, data_manager.written_data['switches']['s_test'])
         self.assertEqual(0, auditor.current_audits['events']['game_started'])
         self.assertEqual(0, data_manager.written_data['events']['game_started'])
+
+    def test_auditor_coalesces_saves(self):
+        auditor = self.machine.plugins[0]
+        data_manager = auditor.data_manager
+        self.start_game()
+        self.advance_time_and_run(1)
+        saves_avoided = auditor.saves_avoided
+
+        with patch.object(data_manager, "save_all", wraps=data_manager.save_all) as save_all:
+            for _ in range(5):
+                self.machine.switch_controller.process_switch("s_test", 1)
+                self.machine.switch_controller.process_switch("s_test", 0)
+
+            # counters change right away but persistence waits for the save interval
+            self.assertEqual(5, auditor.current_audits['switches']['s_test'])
+            self.assertEqual(0, data_manager.written_data['switches']['s_test'])
+            self.advance_time_and_run(.1)
+            self.assertEqual(5, data_manager.written_data['switches']['s_test'])
+            self.assertMachineVarEqual(5, "audits_switches_s_test")
+            self.assertEqual(1, save_all.call_count)
+            self.assertEqual(saves_avoided + 4, auditor.saves_avoided)
+
+            # nothing changed since the last save
+            auditor.flush()
+            self.assertEqual(1, save_all.call_count)
+            self.assertEqual(saves_avoided + 4, auditor.saves_avoided)
+
+        self.assertIn(("s_test", 5), auditor.get_audits('switches'))
+        self.assertEqual([("s_test", 5)], auditor.get_top_audits('switches', 1))
+
+    def test_merge_into_top_list(self):
+        self.assertEqual([5, 3, 1], Auditor._merge_into_top_list(3, [5, 1], 3))
+        self.assertEqual([5, 3], Auditor._merge_into_top_list(1, [5, 3], 2))
+        self.assertEqual([7, 5], Auditor._merge_into_top_list(7, [5, 3], 2))
+        self.assertEqual([2], Auditor._merge_into_top_list(2, [], 1))
+
+    def test_unsorted_top_list_from_disk(self):
+        auditor = self.machine.plugins[0]
+        auditor.current_audits['player']['score']['top'] = [100, 300, 200]
+        auditor._load_defaults()
+        self.assertEqual([300, 200, 100], auditor.current_audits['player']['score']['top'])
+        self.assertEqual([300, 250, 200], Auditor._merge_into_top_list(
+            250, auditor.current_audits['player']['score']['top'], 3))
@@ -84,3 +84,35 @@ class TestBallDeviceRouting(MpfTestCase):
         self.advance_time_and_run(1)
 
         self.assertEqual(0, self._missing)
+
+    def test_cached_paths(self):
+        trough1 = self.machine.ball_devices['test_trough1']
+        trough2 = self.machine.ball_devices['test_trough2']
+        launcher = self.machine.ball_devices['test_launcher']
+        target1 = self.machine.ball_devices['test_target1']
+        drain = self.machine.ball_devices['test_drain']
+
+        path = trough1.find_path_to_target(target1)
+        self.assertEqual([trough1, launcher, target1], list(path))
+        # callers consume the path. this must not change the cached path
+        path.popleft()
+        self.assertEqual([trough1, launcher, target1], list(trough1.find_path_to_target(target1)))
+        self.assertFalse(target1.find_path_to_target(trough1))
+
+        self.assertEqual(trough2, launcher.find_next_trough())
+        self.assertEqual(trough1, trough1.find_next_trough())
+        self.assertFalse(target1.find_next_trough())
+
+        # sources are searched depth first
+        self.assertEqual([(launcher, target1), (trough1, launcher, target1), (drain, target1)],
+                         target1._get_source_paths())
+
+        trough1.available_balls = 0
+        launcher.available_balls = 0
+        drain.available_balls = 1
+        self.assertEqual([drain, target1], list(target1.find_one_available_ball()))
+        trough1.available_balls = 1
+        self.assertEqual([trough1, launcher, target1], list(target1.find_one_available_ball()))
+        trough1.available_balls = 0
+        drain.available_balls = 0
+        self.assertFalse(target1.find_one_available_ball())
@@ -2,6 +2,8 @@
 import asyncio
 from unittest import mock
 
+from mpf.assets.show import Show
+from mpf.core.bcp.bcp_interface import MAX_MEMORY_SNAPSHOTS
 from mpf.core.events import RegisteredHandler
 from mpf.tests.MpfBcpTestCase import MpfBcpTestCase
 
@@ -42,6 +44,7 @@ class TestBcpInterface(MpfBcpTestCase):
         self.advance_time_and_run()
 
         self.machine.events.post("test1")
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertIn(
             ('monitored_event', dict(event_name='test1', event_type=None,
@@ -50,6 +53,7 @@ class TestBcpInterface(MpfBcpTestCase):
             queue)
 
         self.machine.events.post("test2")
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertIn(
             ('monitored_event', dict(event_name='test2', event_type=None,
@@ -58,6 +62,7 @@ class TestBcpInterface(MpfBcpTestCase):
             queue)
 
         self.machine.events.post("test3", callback=handler)
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertIn(
             ('monitored_event', dict(registered_handlers=[], event_name='test3',
@@ -72,6 +77,7 @@ class TestBcpInterface(MpfBcpTestCase):
 
         # Event should not be sent via BCP
         self.machine.events.post("test1")
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertFalse(queue)
 
@@ -142,6 +148,62 @@ class TestBcpInterface(MpfBcpTestCase):
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertFalse(queue)
 
+    def test_monitor_batching(self):
+        transport = self.machine.bcp.transport
+        self._bcp_external_client.send('monitor_start', {'category': 'devices'})
+        self.advance_time_and_run()
+        self._bcp_external_client.reset_and_return_queue()
+
+        # device updates are queued and merged until the flush
+        self.machine.switch_controller.process_switch("s_test", 1, logical=True)
+        self.machine.switch_controller.process_switch("s_test", 0, logical=True)
+        self.machine.switch_controller.process_switch("s_test", 1, logical=True)
+        self.assertFalse(self._bcp_external_client.reset_and_return_queue())
+        self.assertEqual(2, transport.merged_monitor_messages)
+
+        self.advance_time_and_run(.1)
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual(
+            [("device", {"type": "switch",
+                         "name": "s_test",
+                         "state": {'state': 1, 'recycle_jitter_count': 0},
+                         "changes": ('state', 0, 1)})],
+            queue)
+
+        # variable updates are merged and keep the previous value of the first update
+        self._bcp_external_client.send('monitor_start', {'category': 'machine_vars'})
+        self.machine.variables.set_machine_var("var0", 1)
+        self.advance_time_and_run()
+        self._bcp_external_client.reset_and_return_queue()
+        self.machine.variables.set_machine_var("var0", 2)
+        self.machine.variables.set_machine_var("var0", 5)
+        transport.flush_monitor_messages()
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual([("machine_variable", {"name": "var0", "value": 5, "prev_value": 1, "change": 4})], queue)
+
+        # the oldest state messages are dropped when too many are queued. events are never dropped
+        self._bcp_external_client.send('monitor_start', {'category': 'events'})
+        self.advance_time_and_run()
+        self._bcp_external_client.reset_and_return_queue()
+        transport.monitor_max_pending = 2
+        for num in range(5):
+            self.machine.events.post("test{}".format(num))
+        for num in range(1, 5):
+            self.machine.variables.set_machine_var("var{}".format(num), num)
+        self.assertEqual(3, transport.dropped_monitor_messages)
+        transport.flush_monitor_messages()
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual(["test0", "test1", "test2", "test3", "test4"],
+                         [message[1]["event_name"] for message in queue
+                          if message[0] == "monitored_event" and message[1]["event_name"].startswith("test")])
+        self.assertEqual(["var4"], [message[1]["name"] for message in queue if message[0] == "machine_variable"])
+
+        # messages are sent in order when a regular command is sent to the client
+        self.machine.events.post("test5")
+        self.machine.bcp.transport.send_to_all_clients("trigger", name="test")
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual(["monitored_event", "trigger"], [message[0] for message in queue])
+
     def test_switch_monitor(self):
         self._bcp_external_client.reset_and_return_queue()
 
@@ -272,6 +334,7 @@ class TestBcpInterface(MpfBcpTestCase):
 
         # Create a new machine variable
         self.machine.variables.set_machine_var("test_var", "testing")
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
 
         self.assertIn(
@@ -282,6 +345,7 @@ class TestBcpInterface(MpfBcpTestCase):
             queue)
 
         self.machine.variables.set_machine_var("test_var", "2nd")
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertIn(
             ("machine_variable", {"value": "2nd",
@@ -297,6 +361,7 @@ class TestBcpInterface(MpfBcpTestCase):
         self.machine.variables.set_machine_var("test_var", "3rd")
 
         # The BCP queue should be empty
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertFalse(queue)
 
@@ -321,6 +386,7 @@ class TestBcpInterface(MpfBcpTestCase):
 
         # Create a new player variable
         self.machine.game.player.test_var = "testing"
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
 
         self.assertIn(
@@ -332,6 +398,7 @@ class TestBcpInterface(MpfBcpTestCase):
             queue)
 
         self.machine.game.player.test_var = "2nd"
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertIn(
             ("player_variable", {"player_num": 1,
@@ -348,6 +415,7 @@ class TestBcpInterface(MpfBcpTestCase):
         self.machine.variables.set_machine_var("test_var", "3rd")
 
         # The BCP queue should be empty
+        self.advance_time_and_run(.1)
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertFalse(queue)
 
@@ -580,4 +648,91 @@ class TestBcpInterface(MpfBcpTestCase):
                     ('Virtual', '1004', 's_ball_switch2', 0),
                 ]}),
             ],
-            queue)
\ No newline at end of file
+            queue)
+
+    def test_memory_report(self):
+        self._bcp_external_client.reset_and_return_queue()
+        self._bcp_external_client.send('memory_report', {'snapshot': 'start'})
+        self.advance_time_and_run()
+
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual(1, len(queue))
+        command, kwargs = queue[0]
+        self.assertEqual("memory_report", command)
+        self.assertFalse(kwargs["error"])
+        categories = kwargs["report"]["categories"]
+        self.assertIn("devices.coils", categories)
+        self.assertIn("event_handlers", categories)
+        self.assertIn("placeholder_templates", categories)
+        self.assertGreater(categories["devices.coils"]["size"], 0)
+        self.assertGreater(categories["devices.coils"]["objects"], 0)
+
+        # leak some handlers
+        for _ in range(100):
+            self.machine.events.add_handler("leaked_event", self._cb)
+
+        self._bcp_external_client.send('memory_report', {'diff': 'start'})
+        self.advance_time_and_run()
+        queue = self._bcp_external_client.reset_and_return_queue()
+        changes = {category: size for category, size, _ in queue[0][1]["diff"]}
+        self.assertGreater(changes["event_handlers"], 0)
+
+        self._bcp_external_client.send('memory_report', {'diff': 'unknown'})
+        self.advance_time_and_run()
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual("Snapshot unknown not found", queue[0][1]["error"])
+
+        # only the latest snapshots are kept
+        for num in range(MAX_MEMORY_SNAPSHOTS):
+            self._bcp_external_client.send('memory_report', {'snapshot': 'snapshot{}'.format(num)})
+        self.advance_time_and_run()
+        self._bcp_external_client.send('memory_report', {'diff': 'start'})
+        self.advance_time_and_run()
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual("Snapshot start not found", queue[-1][1]["error"])
+
+    def test_show_profile(self):
+        self._bcp_external_client.reset_and_return_queue()
+        self._bcp_external_client.send('show_profile', {})
+        self.advance_time_and_run()
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual([("show_profile", {"error": "Show profiler is not enabled"})], queue)
+
+        self._bcp_external_client.send('show_profile', {'enable': True})
+        self.advance_time_and_run()
+        self._bcp_external_client.reset_and_return_queue()
+
+        show = Show(self.machine, "profiled_show")
+        show.load([{"duration": 1, "events": ["profiled_event"]}])
+        running_show = show.play(loops=1)
+        self.advance_time_and_run(3)
+
+        self._bcp_external_client.send('show_profile', {'enable': False})
+        self.advance_time_and_run()
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertEqual(1, len(queue))
+        command, kwargs = queue[0]
+        self.assertEqual("show_profile", command)
+        self.assertFalse(kwargs["error"])
+        report = kwargs["report"]
+        self.assertTrue(running_show.stopped)
+        self.assertEqual(0, report["active_shows"])
+        self.assertEqual(1, report["peak_active_shows"])
+        self.assertEqual(2, report["steps"])
+        self.assertEqual(2, report["shows"]["profiled_show"]["steps"])
+        self.assertEqual(2, report["players"]["events"]["calls"])
+        self.assertIsNone(self.machine.show_controller.show_profiler)
+
+        # untyped values arrive as strings
+        self._bcp_external_client.send('show_profile', {'enable': "true"})
+        self.advance_time_and_run()
+        self.assertIsNotNone(self.machine.show_controller.show_profiler)
+        self._bcp_external_client.send('show_profile', {'enable': "false"})
+        self.advance_time_and_run()
+        self.assertIsNone(self.machine.show_controller.show_profiler)
+        self._bcp_external_client.reset_and_return_queue()
+
+        self._bcp_external_client.send('show_profile', {'enable': "maybe"})
+        self.advance_time_and_run()
+        self.assertEqual([("show_profile", {"error": "Cannot convert maybe to bool"})],
+                         self._bcp_external_client.reset_and_return_queue())
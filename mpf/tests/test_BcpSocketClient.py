@@ -127,11 +127,21 @@ class MockBcpQueueSocket(MockQueueSocket):
 
     """Mock Queue Socket for BCP which emulates reset."""
 
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.stalled = False
+
+    def write_ready(self):
+        return not self.stalled
+
     def send(self, data):
+        if self.stalled:
+            return 0
         if data == b'reset\n':
             self.recv_queue.append(b'reset_complete\n')
             return len(data)
-        return super().send(data)
+        # the transport may pass a view on its buffer
+        return super().send(bytes(data))
 
 
 class TestBcpSocketClient(MpfTestCase):
@@ -191,6 +201,73 @@ class TestBcpSocketClient(MpfTestCase):
         self.client_socket.recv_queue.append(b'invalid_method?param1=1&param2=2\n')
         self.advance_time_and_run()
 
+    def _get_sent_messages(self):
+        data = b''
+        while not self.client_socket.send_queue.empty():
+            data += self.client_socket.send_queue.get_nowait()
+        return [decode_command_string(line) for line in data.decode().splitlines()]
+
+    def testSendBuffer(self):
+        self.advance_time_and_run()
+        self._get_sent_messages()
+        self._bcp_client._high_watermark = 100
+        self._bcp_client._low_watermark = 10
+        self._bcp_client._max_send_buffer = 400
+        self._bcp_client._set_write_buffer_limits()
+
+        # the remote side stops reading. messages end up in the transport until it reaches the high watermark
+        self.client_socket.stalled = True
+        self._bcp_client.send("trigger", {"name": "first_event_with_a_long_name_to_fill_the_buffer"})
+        self._bcp_client.send("trigger", {"name": "second_event_with_a_long_name_to_fill_the_buffer"})
+        metrics = self.machine.bcp.transport.get_send_buffer_metrics()["local_display"]
+        self.assertGreater(metrics["transport_bytes"], 100)
+        self.assertEqual(0, metrics["buffered_bytes"])
+
+        # after that they are buffered. state updates replace older updates of the same variable
+        for score in range(10):
+            self._bcp_client.send("player_variable", {"name": "score", "value": score, "player_num": 1})
+        metrics = self.machine.bcp.transport.get_send_buffer_metrics()["local_display"]
+        self.assertEqual(1, metrics["buffered_messages"])
+        self.assertEqual(9, metrics["coalesced_messages"])
+
+        # the oldest state messages are dropped when the buffer is full
+        self._bcp_client.send("trigger", {"name": "buffered_event"})
+        for num in range(20):
+            self._bcp_client.send("machine_variable", {"name": "var{}".format(num), "value": num})
+        metrics = self.machine.bcp.transport.get_send_buffer_metrics()["local_display"]
+        self.assertLessEqual(metrics["buffered_bytes"], 400)
+        self.assertGreater(metrics["dropped_messages"], 0)
+        self.advance_time_and_run()
+        self.assertFalse(self._get_sent_messages())
+
+        # everything left is sent in order once the remote side reads again
+        self.client_socket.stalled = False
+        self.advance_time_and_run()
+        messages = self._get_sent_messages()
+        self.assertEqual("first_event_with_a_long_name_to_fill_the_buffer", messages[0][1]["name"])
+        self.assertEqual("second_event_with_a_long_name_to_fill_the_buffer", messages[1][1]["name"])
+        # the score update was the oldest state message in the buffer. other messages are never dropped
+        self.assertNotIn(("player_variable", {"name": "score", "value": 9, "player_num": 1}), messages)
+        self.assertEqual(("trigger", {"name": "buffered_event"}), messages[2])
+        self.assertEqual(("machine_variable", {"name": "var19", "value": 19}), messages[-1])
+        self.assertEqual(len(messages) - 3 + metrics["dropped_messages"], 21)
+        metrics = self.machine.bcp.transport.get_send_buffer_metrics()["local_display"]
+        self.assertEqual(0, metrics["transport_bytes"])
+        self.assertEqual(0, metrics["buffered_bytes"])
+
+        self._bcp_client.send("trigger", {"name": "last"})
+        self.advance_time_and_run()
+        self.assertEqual([("trigger", {"name": "last"})], self._get_sent_messages())
+
+        # the client is disconnected when messages which cannot be dropped exceed the buffer
+        self._bcp_client.exit_on_close = False
+        self.client_socket.stalled = True
+        for num in range(20):
+            self._bcp_client.send("trigger", {"name": "event_with_a_long_name_{}".format(num)})
+        self.advance_time_and_run()
+        self.assertFalse(self.machine.bcp.transport.get_named_client("local_display"))
+        self.assertFalse(self.client_socket.is_open)
+
 
 class TestBcpSocketMultipleClients(MpfTestCase):
 
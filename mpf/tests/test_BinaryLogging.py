@@ -0,0 +1,114 @@
+"""Test binary logging."""
+import gzip
+import logging
+import os
+import tempfile
+from queue import Queue
+from unittest import TestCase
+
+from mpf.core.binary_logging import BinaryLogHandler, BoundedQueueHandler, read_entries, open_log_file, \
+    entry_to_record
+
+
+class TestBinaryLogging(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.logger = logging.getLogger("binary_test")
+        self.logger.propagate = False
+        self.logger.setLevel(1)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_write_and_decode(self):
+        filename = os.path.join(self.tmp_dir.name, "test.binlog")
+        handler = BinaryLogHandler(filename)
+        self.logger.addHandler(handler)
+
+        self.logger.log(22, "<<<<<<< '%s' active >>>>>>>", "s_test")
+        self.logger.info("Int %s float %s bool %s none %s", 7, 1.5, True, None)
+        self.logger.info("Object %s", ["a", 1])
+        self.logger.info("Plain")
+        handler.close()
+
+        with open_log_file(filename) as file:
+            entries = list(read_entries(file))
+
+        self.assertEqual(4, len(entries))
+        self.assertEqual("binary_test", entries[0][1])
+        self.assertEqual(22, entries[0][2])
+        self.assertEqual(("s_test", ), entries[0][4])
+        self.assertEqual((7, 1.5, True, None), entries[1][4])
+        self.assertEqual("Object ['a', 1]", entry_to_record(entries[2]).getMessage())
+        self.assertEqual("Plain", entry_to_record(entries[3]).getMessage())
+
+    def test_ring(self):
+        handler = BinaryLogHandler(None, ring_size=3)
+        self.logger.addHandler(handler)
+        for i in range(5):
+            self.logger.info("Record %s", i)
+
+        self.assertEqual(3, len(handler.ring))
+        self.assertEqual(2, handler.ring_overwrites)
+        self.assertEqual(5, handler.get_stats()["records"])
+
+        filename = os.path.join(self.tmp_dir.name, "ring.binlog")
+        handler.dump_ring(filename)
+        with gzip.open(filename, "rb") as file:
+            entries = list(read_entries(file))
+        self.assertEqual([(2, ), (3, ), (4, )], [entry[4] for entry in entries])
+
+    def test_format_table_is_capped(self):
+        handler = BinaryLogHandler(None, max_formats=2)
+        self.logger.addHandler(handler)
+        self.logger.info("Known %s", 1)
+        self.logger.info("Pre-formatted {}".format(1))
+        for i in range(2, 5):
+            self.logger.info("Pre-formatted {}".format(i))
+        self.logger.info("New %s", "arg")
+        self.logger.info("Known %s", 2)
+        self.logger.info("Mapping %(a)s", {"a": 1})
+
+        # the literal format is the only entry over the cap
+        self.assertEqual(["Known %s", "Pre-formatted 1", "%s"], handler.formats)
+        stats = handler.get_stats()
+        self.assertEqual(3, stats["formats"])
+        self.assertEqual(5, stats["literal_messages"])
+
+        filename = os.path.join(self.tmp_dir.name, "ring.binlog")
+        handler.dump_ring(filename)
+        with gzip.open(filename, "rb") as file:
+            messages = [entry_to_record(entry).getMessage() for entry in read_entries(file)]
+        self.assertEqual(["Known 1", "Pre-formatted 1", "Pre-formatted 2", "Pre-formatted 3", "Pre-formatted 4",
+                          "New arg", "Known 2", "Mapping 1"], messages)
+
+    def test_rotation(self):
+        filename = os.path.join(self.tmp_dir.name, "rotate.binlog")
+        handler = BinaryLogHandler(filename, max_bytes=200, backup_count=2)
+        self.logger.addHandler(handler)
+        for i in range(100):
+            self.logger.info("Rotating record number %s", i)
+        handler.close()
+
+        self.assertTrue(os.path.isfile(filename + ".1"))
+        self.assertTrue(os.path.isfile(filename + ".2"))
+        self.assertFalse(os.path.isfile(filename + ".3"))
+        # every file decodes on its own
+        with open_log_file(filename + ".2") as file:
+            entries = list(read_entries(file))
+        self.assertTrue(entries)
+        self.assertEqual("Rotating record number %s", entries[0][3])
+
+    def test_bounded_queue_handler(self):
+        handler = BoundedQueueHandler(Queue(maxsize=2))
+        self.logger.addHandler(handler)
+        for i in range(5):
+            self.logger.info("Record %s", i)
+
+        self.assertEqual(2, handler.queue.qsize())
+        self.assertEqual(3, handler.dropped_records)
@@ -43,3 +43,37 @@ class TestDeviceCollection(MpfTestCase):
         self.assertIn(led2, self.machine.lights.items_tagged('*'))
         self.assertIn(led3, self.machine.lights.items_tagged('*'))
         self.assertIn(led4, self.machine.lights.items_tagged('*'))
+
+    def test_tag_index(self):
+        lights = self.machine.lights
+        led1 = lights['led1']
+        led2 = lights['led2']
+        led3 = lights['led3']
+        led4 = lights['led4']
+
+        self.assertEqual([led1, led2], lights.items_tagged('tag1'))
+        # lists are reused as long as the tag does not change
+        self.assertIs(lights.items_tagged('tag1'), lights.items_tagged('tag1'))
+
+        led4.tags = ['tag3', 'tag1']
+        lights.update_tags(led4)
+        self.assertEqual([led1, led2, led4], lights.items_tagged('tag1'))
+        self.assertEqual([led4], lights.items_tagged('tag3'))
+
+        # expressions
+        self.assertEqual([led1], lights.items_tagged('tag1&tag2'))
+        self.assertEqual([led1, led3, led4], lights.items_tagged('tag2|tag3'))
+        self.assertEqual([led1, led4], lights.items_tagged('tag3 & tag1 | tag2 & tag1 | tag2 & fake_tag'))
+        self.assertEqual([], lights.items_tagged('fake_tag&tag1'))
+
+        # removed devices leave the index. re-added devices are sorted last
+        del lights['led1']
+        self.assertEqual([led2, led4], lights.items_tagged('tag1'))
+        self.assertEqual([led3], lights.items_tagged('tag1&tag2|tag2'))
+        lights['led1'] = led1
+        self.assertEqual([led2, led4, led1], lights.items_tagged('tag1'))
+
+        led4.tags = []
+        lights.update_tags(led4)
+        self.assertEqual([led2, led1], lights.items_tagged('tag1'))
+        self.assertEqual([], lights.items_tagged('tag3'))
@@ -0,0 +1,35 @@
+"""Test that hot path devices keep a slotted layout."""
+from unittest import TestCase
+
+from mpf.core.device import Device
+from mpf.core.logging import LogMixin
+from mpf.core.mode_device import ModeDevice
+from mpf.core.system_wide_device import SystemWideDevice
+from mpf.devices.device_mixins import DevicePositionMixin
+from mpf.devices.driver import Driver
+from mpf.devices.dual_wound_coil import DualWoundCoil
+from mpf.devices.light import Light, LightStackEntry
+from mpf.devices.switch import Switch
+from mpf.devices.timed_switch import TimedSwitch
+
+
+class TestDeviceSlots(TestCase):
+
+    def assertSlotted(self, cls):
+        for klass in cls.__mro__:
+            if klass is object:
+                continue
+            self.assertIn("__slots__", klass.__dict__, "{} in MRO of {} has no __slots__".format(klass, cls))
+
+    def test_base_classes(self):
+        for cls in (LogMixin, Device, SystemWideDevice, ModeDevice, DevicePositionMixin):
+            self.assertSlotted(cls)
+
+    def test_devices(self):
+        for cls in (Switch, Light, LightStackEntry, TimedSwitch, DualWoundCoil, Driver):
+            self.assertSlotted(cls)
+
+        # no per-instance dict for switches and lights
+        for cls in (Switch, Light, LightStackEntry, TimedSwitch, DualWoundCoil):
+            self.assertFalse(any("__dict__" in klass.__dict__ for klass in cls.__mro__ if klass is not object),
+                             cls)
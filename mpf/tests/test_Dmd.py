@@ -1,3 +1,10 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from mpf.core.shared_frame_buffer import SharedFrameBuffer
+from mpf.platforms.dmd_frame_diff import DmdFrameDiff
 from mpf.tests.MpfBcpTestCase import MpfBcpTestCase
 from mpf.tests.MpfTestCase import test_config
 
@@ -17,6 +24,60 @@ class TestDmd(MpfBcpTestCase):
 
         self.assertEqual(b'1337', self.machine.dmds["test_dmd"].hw_device.data)
 
+        # without only_send_changes every frame is sent
+        with patch.object(self.machine.dmds["test_dmd"], "hw_device") as hw_device:
+            self.machine.dmds["test_dmd"].update(b'1337')
+            self.machine.dmds["test_dmd"].update(b'1337')
+        self.assertEqual(2, hw_device.update.call_count)
+
+        # frames from shared memory are ignored when it is not configured
+        self._bcp_client.receive_queue.put_nowait(("dmd_frame", {"name": "test_dmd"}))
+        self.machine_run()
+        self.assertEqual(b'1337', self.machine.dmds["test_dmd"].hw_device.data)
+
+    @test_config("testDmdSharedMemory.yaml")
+    def testDmdSharedMemory(self):
+        dmd = self.machine.dmds["test_dmd"]
+        writer = SharedFrameBuffer.attach("mpf_test_dmd")
+        self.addCleanup(writer.close)
+        self.assertEqual(3, writer.slots)
+        self.assertEqual(8, writer.slot_size)
+
+        writer.write(b'1337')
+        self._bcp_client.receive_queue.put_nowait(("dmd_frame", {"name": "test_dmd"}))
+        self.machine_run()
+        self.assertEqual(b'1337', dmd.hw_device.data)
+
+        # only the latest frame is shown. older frames are skipped
+        writer.write(b'1')
+        writer.write(b'12')
+        writer.write(b'123')
+        writer.write(b'1234')
+        self._bcp_client.receive_queue.put_nowait(("dmd_frame", {"name": "test_dmd"}))
+        self._bcp_client.receive_queue.put_nowait(("dmd_frame", {"name": "test_dmd"}))
+        self.machine_run()
+        self.assertEqual(b'1234', dmd.hw_device.data)
+        self.assertEqual(2, dmd.frame_buffer.frames_read)
+        self.assertEqual(3, dmd.frame_buffer.frames_skipped)
+
+        # frames over BCP still work
+        self._bcp_client.receive_queue.put_nowait(("dmd_frame", {"name": "test_dmd", "rawbytes": b'42'}))
+        self.machine_run()
+        self.assertEqual(b'42', dmd.hw_device.data)
+
+        with self.assertRaises(ValueError):
+            writer.write(b'123456789')
+
+        # another process which attaches and exits does not remove the segment
+        subprocess.run([sys.executable, "-c", "from mpf.core.shared_frame_buffer import SharedFrameBuffer; "
+                                              "SharedFrameBuffer.attach('mpf_test_dmd').close()"],
+                       check=True, stderr=subprocess.PIPE,
+                       cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        reader = SharedFrameBuffer.attach("mpf_test_dmd")
+        self.addCleanup(reader.close)
+        writer.write(b'7')
+        self.assertEqual(b'7', reader.read_latest()[1])
+
     @test_config("testRgbDmd.yaml")
     def testRgbDmd(self):
         self.machine.rgb_dmds["test_dmd"].update(b'12345')
@@ -34,3 +95,24 @@ class TestDmd(MpfBcpTestCase):
         self.advance_time_and_run()
 
         self.assertEqual(0.75, display.hw_device.brightness)
+
+    @test_config("testDmdOnlySendChanges.yaml")
+    def testDmdOnlySendChanges(self):
+        for dmd in (self.machine.dmds["test_dmd"], self.machine.rgb_dmds["test_rgb_dmd"]):
+            with patch.object(dmd, "hw_device") as hw_device:
+                dmd.update(b'1337')
+                dmd.update(b'1337')
+                hw_device.update.assert_called_once_with(b'1337')
+
+                dmd.update(b'42')
+                hw_device.update.assert_called_with(b'42')
+            self.assertEqual({"frames_sent": 2, "frames_skipped": 1}, dmd.frame_diff.get_metrics())
+
+    @test_config("testDmd.yaml")
+    def testFrameDiff(self):
+        frame_diff = DmdFrameDiff()
+        self.assertTrue(frame_diff.update(bytes(12)))
+        self.assertFalse(frame_diff.update(bytes(12)))
+        self.assertTrue(frame_diff.update(bytes(4) + b'\x01' + bytes(7)))
+        self.assertTrue(frame_diff.update(bytes(8)))
+        self.assertEqual({"frames_sent": 3, "frames_skipped": 1}, frame_diff.get_metrics())
@@ -13,6 +13,14 @@ class TestDualWoundCoil(MpfTestCase):
     def get_machine_path(self):
         return 'tests/machine_files/device/'
 
+    def testTags(self):
+        # dual wound coils are also indexed by tag in coils
+        self.assertEqual([self.machine.dual_wound_coils["c_test"]],
+                         self.machine.dual_wound_coils.items_tagged("flipper"))
+        self.assertEqual([self.machine.coils["c_test"]], self.machine.coils.items_tagged("flipper"))
+        # playfields are also in ball_devices
+        self.assertIn(self.machine.playfields["playfield"], self.machine.ball_devices.items_tagged("default"))
+
     def testBasicFunctions(self):
         c_power = self.machine.coils["c_power"].hw_driver
         c_hold = self.machine.coils["c_hold"].hw_driver
@@ -0,0 +1,89 @@
+import os
+import unittest
+
+from mpf.tests import fork_server
+from mpf.tests.MpfTestCase import MpfTestCase
+
+_RUNNER_PID = os.getpid()
+
+
+@unittest.skipUnless(fork_server.is_fork_server_available(), "Needs os.fork")
+class TestForkServer(MpfTestCase):
+
+    use_fork_server = True
+    boots = 0
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_machine_path(self):
+        return 'tests/machine_files/switch_controller/'
+
+    def setUp(self):
+        type(self).boots += 1
+        super().setUp()
+
+    def _check_fresh_machine(self):
+        self.assertNotEqual(_RUNNER_PID, os.getpid())
+        self.assertEqual(1, type(self).boots)
+        self.assertSwitchState("s_test", 0)
+
+        # changes in one test must not leak into the next one
+        self.hit_switch_and_run("s_test", 1)
+        self.assertSwitchState("s_test", 1)
+        self.machine.variables.set_machine_var("fork_test", 1)
+
+    def test_first(self):
+        self._check_fresh_machine()
+        self.assertFalse(self.machine.variables.is_machine_var("fork_test_second"))
+        self.machine.variables.set_machine_var("fork_test_first", 1)
+
+    def test_second(self):
+        self._check_fresh_machine()
+        self.assertFalse(self.machine.variables.is_machine_var("fork_test_first"))
+        self.machine.variables.set_machine_var("fork_test_second", 1)
+
+
+@unittest.skipUnless(fork_server.is_fork_server_available(), "Needs os.fork")
+class TestForkServerReporting(unittest.TestCase):
+
+    def test_outcomes(self):
+        class ForkedTest(MpfTestCase):
+
+            use_fork_server = True
+
+            def get_config_file(self):
+                return 'config.yaml'
+
+            def get_machine_path(self):
+                return 'tests/machine_files/switch_controller/'
+
+            def test_pass(self):
+                self.assertSwitchState("s_test", 0)
+
+            def test_fail(self):
+                self.assertSwitchState("s_test", 1)
+
+            def test_error(self):
+                raise KeyError("broken test")
+
+            def test_skip(self):
+                self.skipTest("not today")
+
+            def test_crash(self):
+                os._exit(3)
+
+        result = unittest.TestResult()
+        unittest.defaultTestLoader.loadTestsFromTestCase(ForkedTest).run(result)
+        self.addCleanup(fork_server.stop_fork_servers)
+
+        self.assertEqual(5, result.testsRun)
+        self.assertEqual(["test_fail"], [test._testMethodName for test, _ in result.failures])
+        self.assertIn("RemoteTestFailure", result.failures[0][1])
+        self.assertIn("assertSwitchState", result.failures[0][1])
+        self.assertEqual(["test_crash", "test_error"], sorted(test._testMethodName for test, _ in result.errors))
+        errors = {test._testMethodName: tb for test, tb in result.errors}
+        self.assertIn("KeyError: 'broken test'", errors["test_error"])
+        self.assertIn("died", errors["test_crash"])
+        self.assertEqual([("test_skip", "not today")],
+                         [(test._testMethodName, reason) for test, reason in result.skipped])
@@ -0,0 +1,48 @@
+"""Test headless machines and the bench runner."""
+import os
+from unittest import TestCase
+
+import mpf.core
+from mpf.commands.bench import run_machine
+from mpf.core.headless_machine import HeadlessMachine
+
+
+class TestHeadlessMachine(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.machine_path = os.path.abspath(os.path.join(mpf.core.__path__[0], os.pardir,
+                                                         'tests/machine_files/auditor/'))
+        # only load the auditor. some other plugins cannot be imported without their optional dependencies
+        self.config_patches = {"mpf": {"plugins": ["mpf.plugins.auditor.Auditor"]}}
+
+    def _job(self, steps):
+        return {"machine_path": self.machine_path, "config_files": ["config.yaml"], "platform": "virtual",
+                "steps": steps, "copy": 0, "config_patches": self.config_patches}
+
+    def test_boot_and_run_steps(self):
+        machine = HeadlessMachine(self.machine_path, config_patches=self.config_patches)
+        machine.boot()
+        try:
+            self.assertIsNotNone(machine.boot_secs)
+            start = machine.clock.get_time()
+            machine.run_steps([
+                {"event": "test_event1"},
+                {"repeat": 3, "steps": [{"switch": "s_test", "hold": "50ms"}, {"wait": "1s"}]},
+                {"switch": "s_ball", "state": 1},
+            ])
+            self.assertAlmostEqual(3.15, machine.clock.get_time() - start, delta=.01)
+            self.assertTrue(machine.machine.switch_controller.is_active(machine.machine.switches["s_ball"]))
+            self.assertFalse(machine.machine.switch_controller.is_active(machine.machine.switches["s_test"]))
+        finally:
+            machine.stop()
+
+    def test_run_machine(self):
+        result = run_machine(self._job([{"event": "test_event1"}]))
+        self.assertIsNone(result["error"])
+        self.assertGreaterEqual(result["events"], 1)
+        self.assertIsNotNone(result["boot_secs"])
+
+    def test_run_machine_error(self):
+        result = run_machine(self._job([{"switch": "does_not_exist"}]))
+        self.assertIsNotNone(result["error"])
@@ -20,6 +20,27 @@ class TestLightGroups(MpfTestCase):
         self.assertLightColor("stripe1_light_3", "red")
         self.assertLightColor("stripe1_light_4", "red")
 
+    def test_color_batch(self):
+        stripe = self.machine.light_stripes['stripe1']
+        self.machine.light_controller.brightness_factor = 0.5
+        stripe.color(RGBColor("red"))
+        self.advance_time_and_run(.1)
+        for light in stripe.lights:
+            self.assertLightColor(light.name, "red")
+            self.assertEqual(127 / 255.0, light.hw_drivers["red"][0].current_brightness)
+            self.assertEqual(0, light.hw_drivers["green"][0].current_brightness)
+
+        self.machine.light_controller.brightness_factor = 1.0
+        stripe.color(RGBColor("blue"), fade_ms=1000, key="fade")
+        self.advance_time_and_run(.5)
+        for light in stripe.lights:
+            self.assertAlmostEqual(0.5, light.hw_drivers["blue"][0].current_brightness, delta=0.05)
+            self.assertAlmostEqual(0.5, light.hw_drivers["red"][0].current_brightness, delta=0.05)
+        self.advance_time_and_run(1)
+        for light in stripe.lights:
+            self.assertLightColor(light.name, "blue")
+            self.assertEqual(1.0, light.hw_drivers["blue"][0].current_brightness)
+
     def test_config(self):
         # stripe 1
         self.assertEqual("led-10-r", self.machine.lights["stripe1_light_0"].hw_drivers["red"][0].number)
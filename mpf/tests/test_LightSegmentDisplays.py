@@ -1,3 +1,6 @@
+from unittest.mock import patch
+
+from mpf.devices.light import Light
 from mpf.tests.MpfTestCase import MpfTestCase, test_config
 
 
@@ -182,6 +185,28 @@ class TestLightSegmentDisplays(MpfTestCase):
         self.assertLightColor("neoSeg_1_light_92", "off")
 
 
+    def test_only_changed_lights(self):
+        display1 = self.machine.segment_displays["display1"]
+        display1.add_text("37")
+        self.advance_time_and_run()
+
+        with patch.object(Light, "color", autospec=True) as color, \
+                patch.object(Light, "remove_from_stack_by_key", autospec=True) as remove_from_stack_by_key:
+            # 7 -> 8 turns on d, e, f and g of the second digit
+            display1.add_text("38")
+            self.advance_time_and_run()
+            self.assertEqual(["segment2_d", "segment2_e", "segment2_f", "segment2_g"],
+                             sorted(mock_call[0][0].name for mock_call in color.call_args_list))
+            self.assertFalse(remove_from_stack_by_key.called)
+
+            color.reset_mock()
+            # 3 -> 1 turns off a, d and g of the first digit
+            display1.add_text("18")
+            self.advance_time_and_run()
+            self.assertFalse(color.called)
+            self.assertEqual(["segment1_a", "segment1_d", "segment1_g"],
+                             sorted(mock_call[0][0].name for mock_call in remove_from_stack_by_key.call_args_list))
+
     @test_config("config_dots.yaml")
     def test_dots(self):
         """Check that embedded dots work properly."""
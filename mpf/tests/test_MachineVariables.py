@@ -120,6 +120,35 @@ class TestMachineVariables(MpfTestCase):
 
         self.assertEqual(17789290, self.machine.variables.get("player3_score"))
 
+    def testCoalescedWrites(self):
+        self.advance_time_and_run()
+        data_manager = self.machine.variables.machine_var_data_manager
+        data_manager.save_all = MagicMock(wraps=data_manager.save_all)
+        writes_avoided = self.machine.variables.writes_avoided
+
+        for i in range(10):
+            self.machine.variables.set_machine_var("credits", i, persist=True)
+        self.machine.variables.configure_machine_var("credits_expiring", persist=True, expire_secs=100)
+        for i in range(10):
+            self.machine.variables.set_machine_var("credits_expiring", 5)
+        # temporary vars do not cause writes
+        self.machine.variables.set_machine_var("temporary_variable", 1000)
+        data_manager.save_all.assert_not_called()
+
+        self.advance_time_and_run(.1)
+        data_manager.save_all.assert_called_once()
+        self.assertEqual(9, data_manager.data["credits"]["value"])
+        self.assertEqual(5, data_manager.data["credits_expiring"]["value"])
+        self.assertNotIn("temporary_variable", data_manager.data)
+        self.assertEqual(writes_avoided + 19, self.machine.variables.writes_avoided)
+
+        # flush right away on game end
+        data_manager.save_all.reset_mock()
+        self.machine.variables.set_machine_var("credits", 10)
+        self.post_event("game_ended")
+        data_manager.save_all.assert_called_once()
+        self.assertEqual(10, data_manager.data["credits"]["value"])
+
 
 class TestMalformedMachineVariables(MpfTestCase):
 
@@ -0,0 +1,19 @@
+import os
+import tempfile
+import unittest
+
+from mpf.core.file_manager import FileManager
+
+
+class TestPickleInterface(unittest.TestCase):
+
+    def test_load_through_file_manager(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "data.bin")
+            FileManager.save(filename, {"a": [1, 2]})
+
+            self.assertEqual({"a": [1, 2]}, FileManager.load(filename))
+            data = FileManager.load(filename, shared=True)
+            self.assertEqual({"a": [1, 2]}, data)
+            # every load unpickles a new object
+            self.assertIsNot(data, FileManager.load(filename, shared=True))
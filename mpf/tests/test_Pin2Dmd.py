@@ -0,0 +1,91 @@
+"""Test PIN2DMD frame encoding."""
+import random
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from mpf.platforms.dmd_frame_diff import create_lookup_table
+from mpf.platforms.pin2dmd import Pin2DmdDevice, GAMMA_TABLE
+
+
+def encode_frame_per_pixel(buffer, elements, panel):
+    """Encode a frame pixel by pixel like PIN2DMD did before the lookup tables."""
+    output_buffer = [0] * (elements * 6 + 4)
+
+    output_buffer[0] = 0x81
+    output_buffer[1] = 0xC3
+    output_buffer[2] = 0xE9
+    output_buffer[3] = 18
+
+    for i in range(0, elements):
+        idx = i * 3
+
+        if panel == "rgb":
+            pixel_r = buffer[idx]
+            pixel_g = buffer[idx + 1]
+            pixel_b = buffer[idx + 2]
+            pixel_rl = buffer[elements * 3 + idx]
+            pixel_gl = buffer[elements * 3 + idx + 1]
+            pixel_bl = buffer[elements * 3 + idx + 2]
+        else:
+            pixel_r = buffer[idx]
+            pixel_g = buffer[idx + 2]
+            pixel_b = buffer[idx + 1]
+            pixel_rl = buffer[elements * 3 + idx]
+            pixel_gl = buffer[elements * 3 + idx + 2]
+            pixel_bl = buffer[elements * 3 + idx + 1]
+
+        pixel_r = GAMMA_TABLE[pixel_r]
+        pixel_g = GAMMA_TABLE[pixel_g]
+        pixel_b = GAMMA_TABLE[pixel_b]
+
+        pixel_rl = GAMMA_TABLE[pixel_rl]
+        pixel_gl = GAMMA_TABLE[pixel_gl]
+        pixel_bl = GAMMA_TABLE[pixel_bl]
+
+        target_idx = i + 4
+
+        for _ in range(0, 6):
+            output_buffer[target_idx] = ((pixel_gl & 1) << 5) | ((pixel_bl & 1) << 4) | ((pixel_rl & 1) << 3) |\
+                                        ((pixel_g & 1) << 2) | ((pixel_b & 1) << 1) | ((pixel_r & 1) << 0)
+            pixel_r >>= 1
+            pixel_g >>= 1
+            pixel_b >>= 1
+            pixel_rl >>= 1
+            pixel_gl >>= 1
+            pixel_bl >>= 1
+            target_idx += elements
+
+    return bytes(output_buffer)
+
+
+class TestPin2Dmd(TestCase):
+
+    def _assert_same_encoding(self, resolution, elements, panel):
+        device = Pin2DmdDevice(MagicMock(), False, resolution, panel)
+        device.device = MagicMock()
+        generator = random.Random(resolution + panel)
+        frames = [bytes(elements * 6), bytes([255] * elements * 6),
+                  bytes(generator.randrange(256) for _ in range(elements * 6))]
+        for frame in frames:
+            device._send_frame(frame)
+            self.assertEqual(encode_frame_per_pixel(frame, elements, panel),
+                             bytes(device.device.write.call_args[0][1]))
+
+    def test_encoding_128x32(self):
+        self._assert_same_encoding("128x32", 2048, "rgb")
+        self._assert_same_encoding("128x32", 2048, "rbg")
+
+    def test_encoding_192x64(self):
+        self._assert_same_encoding("192x64", 6144, "rgb")
+        self._assert_same_encoding("192x64", 6144, "rbg")
+
+    def test_wrong_frame_size(self):
+        device = Pin2DmdDevice(MagicMock(), False, "128x32", "rgb")
+        device.device = MagicMock()
+        with self.assertRaises(AssertionError):
+            device._send_frame(bytes(100))
+
+    def test_lookup_table(self):
+        self.assertEqual(b'\x02\x02', bytes([0, 255]).translate(create_lookup_table([2] * 256)))
+        with self.assertRaises(AssertionError):
+            create_lookup_table([0] * 255)
@@ -217,3 +217,54 @@ class TestPlaceholderManagerWithMachine(MpfFakeGameTestCase):
         self.assertEqual("Number: 7   ", t.evaluate({"test": 7}))
         self.assertEqual("Number: 0   ", t.evaluate({"test": None}))
 
+    def test_reactive_variables(self):
+        variables = self.machine.placeholder_manager.variables
+        template = self.machine.placeholder_manager.build_int_template("machine.a + machine.b", 0)
+        handlers_before = len(self.machine.events.registered_handlers)
+        subscriptions_before = variables.get_num_subscriptions()
+
+        value, subscription = template.evaluate_and_subscribe([])
+        self.assertEqual(0, value)
+        self.assertFalse(subscription.done())
+        # subscribing does not register event handlers
+        self.assertEqual(handlers_before, len(self.machine.events.registered_handlers))
+
+        # multiple changes in one batch resolve the subscription once
+        flushes = variables.flushes
+        self.machine.variables.set_machine_var("a", 1)
+        self.machine.variables.set_machine_var("a", 2)
+        self.machine.variables.set_machine_var("b", 3)
+        self.assertFalse(subscription.done())
+        self.machine_run()
+        self.assertTrue(subscription.done())
+        self.assertEqual(flushes + 1, variables.flushes)
+
+        value, subscription = template.evaluate_and_subscribe([])
+        self.assertEqual(5, value)
+
+        # unrelated changes do not touch the subscription
+        changes = variables.changes
+        self.machine.variables.set_machine_var("c", 3)
+        self.machine_run()
+        self.assertFalse(subscription.done())
+        self.assertEqual(changes, variables.changes)
+
+        # the template registers every variable once no matter how often it subscribes
+        subscription.cancel()
+        for i in range(20):
+            subscription = template.evaluate_and_subscribe([])[1]
+            self.machine.variables.set_machine_var("a", i)
+            self.machine_run()
+            self.assertTrue(subscription.done())
+        self.assertEqual(subscriptions_before + 2, variables.get_num_subscriptions())
+
+        # all waits of a template share one future until the next change
+        subscription_1 = template.evaluate_and_subscribe([])[1]
+        subscription_2 = template.evaluate_and_subscribe([])[1]
+        future = template.subscription.wait()
+        self.machine.variables.set_machine_var("b", 7)
+        self.machine_run()
+        self.assertTrue(subscription_1.done())
+        self.assertTrue(subscription_2.done())
+        self.assertTrue(future.done())
+        self.assertIsNot(future, template.subscription.wait())
@@ -1,3 +1,4 @@
+from mpf.core.player import Player
 from mpf.tests.MpfGameTestCase import MpfGameTestCase
 
 
@@ -57,3 +58,55 @@ class TestPlayerVars(MpfGameTestCase):
                                     change=-9,
                                     player_num=1,
                                     bar='foo')
+
+    def test_batch(self):
+        self.fill_troughs()
+        self.start_game()
+        player = self.machine.game.player
+
+        changes = []
+        monitor_calls = []
+
+        def _monitor(**kwargs):
+            monitor_calls.append(kwargs)
+
+        def _batch_monitor(changes):
+            monitor_calls.append(changes)
+
+        self.machine.register_monitor("player", _monitor)
+        self.machine.register_monitor("player_vars", _batch_monitor)
+        Player.monitor_enabled = True
+        self.addCleanup(setattr, Player, "monitor_enabled", False)
+        self.machine.events.add_handler("player_some_var", lambda **kwargs: changes.append(kwargs))
+
+        self.mock_event("player_score")
+        self.mock_event("player_some_string")
+        with player.batch():
+            player.score += 100
+            with player.batch():
+                player.add_with_kwargs("score", 50, source="nested")
+                player.some_var = 5
+            player.some_var = 4
+            player.some_string = "abc"
+            # vars change immediately
+            self.assertEqual(150, player.score)
+            self.assertEqual(0, len(monitor_calls))
+
+        self.advance_time_and_run()
+        # one event with the combined change
+        self.assertEventCalledWith("player_score", value=150, prev_value=0, change=150, player_num=1,
+                                   source="nested")
+        self.assertEqual(1, self._events["player_score"])
+        self.assertEventCalledWith("player_some_string", value="abc", prev_value="4", change=True, player_num=1)
+        # some_var ended up at its old value
+        self.assertEqual([], changes)
+
+        # per change monitors are called for every change and batch monitors once
+        self.assertEqual(3, len(monitor_calls))
+        self.assertEqual(["score", "some_string"], [change.name for change in monitor_calls[2]])
+        self.assertEqual({"name": "score", "value": 150, "prev_value": 0, "change": 150, "player_num": 1},
+                         monitor_calls[0])
+
+        # without batch there is one monitor call per change
+        player.score += 1
+        self.assertEqual(5, len(monitor_calls))
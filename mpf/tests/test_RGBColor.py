@@ -128,6 +128,31 @@ class TestRGBColor(unittest.TestCase):
         corrected_color = default_profile.apply(RGBColor((254, 254, 254)))
         self.assertEqual((252, 252, 252), corrected_color.rgb)
 
+    def test_batch_color_correction(self):
+        profile = RGBColorCorrectionProfile("test")
+        profile.generate_from_parameters(gamma=2.0, whitepoint=(0.9, 0.85, 0.9), linear_slope=0.75,
+                                         linear_cutoff=0.1)
+        colors = [(169, 169, 169), (0, 0, 0), (255, 255, 255), (1, 128, 254), (200, 13, 77)]
+        data = bytes(channel for color in colors for channel in color)
+        for current_profile in (profile, RGBColorCorrectionProfile.default(), RGBColorCorrectionProfile("linear")):
+            for brightness_factor in (1.0, 0.5, 0.25):
+                # same result as scaling first and applying the profile afterwards
+                expected = [current_profile.apply(RGBColor([int(x * brightness_factor) for x in color])).rgb
+                            for color in colors]
+                self.assertEqual(expected, [current_profile.apply_rgb(color, brightness_factor) for color in colors])
+                corrected = current_profile.apply_batch(data, brightness_factor)
+                self.assertEqual(expected, [tuple(corrected[i:i + 3]) for i in range(0, len(corrected), 3)])
+
+        # tables are recalculated when the profile changes
+        self.assertEqual((77, 67, 77), profile.apply_rgb((169, 169, 169)))
+        profile.assign_channel_lookup_table_values(1, list(range(256)))
+        self.assertEqual((77, 169, 77), profile.apply_rgb((169, 169, 169)))
+
+    def test_blend_rgb(self):
+        self.assertEqual((64, 48, 32), RGBColor.blend_rgb((128, 64, 0), (0, 32, 64), 0.5))
+        self.assertEqual((128, 64, 0), RGBColor.blend_rgb((128, 64, 0), (0, 32, 64), 0))
+        self.assertEqual((0, 32, 64), RGBColor.blend_rgb((128, 64, 0), (0, 32, 64), 1))
+
     def test_init_and_equal(self):
         black = RGBColor("black")
         color = RGBColor([1, 2, 3])
@@ -1095,6 +1095,36 @@ class TestSegmentDisplay(MpfFakeGameTestCase):
         with self.assertRaises(StopIteration):
             next(transition_iterator)
 
+    def test_transition_frame_cache(self):
+        """Test that cached transition frames match computed frames and are independent copies."""
+        red = RGBColor("red")
+        blue = RGBColor("blue")
+
+        def run(colors):
+            transition = PushTransition(5, False, False, False, {'direction': 'right', 'text': '--'})
+            return list(TransitionRunner(self.machine, transition, "12345", "ABCDE", colors, [blue]))
+
+        with patch.object(PushTransition, "get_transition_step", side_effect=PushTransition.get_transition_step,
+                          autospec=True) as get_transition_step:
+            first_run = run([red])
+            self.assertEqual(7, get_transition_step.call_count)
+            second_run = run([red])
+            # all frames came from the cache
+            self.assertEqual(7, get_transition_step.call_count)
+            # other colors are different frames
+            third_run = run([blue])
+            self.assertEqual(14, get_transition_step.call_count)
+
+        self.assertEqual(first_run, second_run)
+        self.assertEqual(["-1234", "--123", "E--12", "DE--1", "CDE--", "BCDE-", "ABCDE"],
+                         [frame.convert_to_str() for frame in second_run])
+        self.assertEqual([blue, red, red, red, red], second_run[0].get_colors())
+        self.assertEqual([blue] * 5, third_run[0].get_colors())
+
+        # changing a returned frame does not change the cache
+        second_run[0].extend(second_run[1])
+        self.assertEqual(first_run[0], run([red])[0])
+
     @patch("mpf.platforms.virtual.VirtualSegmentDisplay.set_text")
     def test_transitions_with_player(self, mock_set_text):
         red = RGBColor("red")
@@ -0,0 +1,97 @@
+"""Test the show profiler."""
+from unittest.mock import patch
+
+from mpf.core.show_controller import ShowController
+from mpf.core.show_profiler import format_show_profile
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestShowProfiler(MpfTestCase):
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_machine_path(self):
+        return 'tests/machine_files/show_scheduler/'
+
+    def get_platform(self):
+        return 'virtual'
+
+    def setUp(self):
+        self.machine_config_patches['mpf']['profile_shows'] = True
+        super().setUp()
+
+    def _play_shows(self):
+        show = self.machine.shows["blink_red"]
+        show_1 = show.play(show_tokens={"led": "led_01"})
+        show_2 = show.play(show_tokens={"led": "led_02"})
+        self.advance_time_and_run(1.5)
+        show_3 = show.play(show_tokens={"led": "led_03"})
+        self.advance_time_and_run(1)
+        show_1.stop()
+        show_2.stop()
+        self.advance_time_and_run(1)
+        return show_3
+
+    def _assert_report(self, report, running_shows):
+        self.assertEqual(running_shows, report["active_shows"])
+        self.assertEqual(3, report["peak_active_shows"])
+        self.assertEqual(3, report["shows_started"])
+        # every show ran 3 steps
+        self.assertEqual(9, report["steps"])
+        self.assertAlmostEqual(9 / 4, report["steps_per_second"], delta=.01)
+        stats = report["shows"]["blink_red"]
+        self.assertEqual(3, stats["plays"])
+        self.assertEqual(9, stats["steps"])
+        self.assertGreater(stats["time"], 0)
+        self.assertGreaterEqual(stats["max_step_time"], stats["average_step_time"])
+        self.assertEqual(["lights"], list(report["players"]))
+        self.assertEqual(9, report["players"]["lights"]["calls"])
+        self.assertGreater(report["players"]["lights"]["time"], 0)
+
+    def test_batched_steps(self):
+        self.advance_time_and_run(.5)
+        show_3 = self._play_shows()
+        self._assert_report(self.machine.show_controller.show_profiler.get_report(), 1)
+
+        show_3.stop()
+        report = self.machine.show_controller.show_profiler.get_report()
+        self.assertEqual(0, report["active_shows"])
+        lines = format_show_profile(report)
+        self.assertIn("blink_red", "\n".join(lines))
+        self.assertIn("lights", "\n".join(lines))
+
+        with patch.object(ShowController, "info_log", autospec=True) as info_log:
+            self.post_event("shutdown")
+        info_log.assert_called_once_with(self.machine.show_controller, "Show profile:\n%s", "\n".join(lines))
+
+    def test_unbatched_steps(self):
+        self.machine.config['mpf']['batch_show_steps'] = False
+        self.advance_time_and_run(.5)
+        self._play_shows()
+        self._assert_report(self.machine.show_controller.show_profiler.get_report(), 1)
+
+    def test_recent_steps_window(self):
+        profiler = self.machine.show_controller.show_profiler
+        show = self.machine.shows["blink_red"].play(show_tokens={"led": "led_01"})
+        self.advance_time_and_run(30)
+        # only steps of the last 10s are kept without asking for the rate
+        self.assertLessEqual(len(profiler._recent_steps), 11)
+        self.assertEqual(31, profiler.steps)
+        show.stop()
+
+    def test_enable_disable(self):
+        show_controller = self.machine.show_controller
+        self._play_shows()
+        show_controller.enable_profiler()
+        self.assertEqual(3, show_controller.show_profiler.shows_started)
+
+        show_controller.enable_profiler(reset=True)
+        self.assertEqual(0, show_controller.show_profiler.shows_started)
+        self.assertEqual({}, show_controller.show_profiler.get_report()["shows"])
+
+        show_controller.disable_profiler()
+        self.assertIsNone(show_controller.show_profiler)
+        self.machine.shows["blink_red"].play(show_tokens={"led": "led_01"})
+        self.advance_time_and_run(1)
+        self.assertLightColor("led_01", "off")
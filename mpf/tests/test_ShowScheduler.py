@@ -0,0 +1,93 @@
+"""Test batched show steps in the show controller."""
+from unittest.mock import patch
+
+from mpf.core.show_controller import ShowController
+from mpf.devices.light import Light
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestShowScheduler(MpfTestCase):
+
+    def get_config_file(self):
+        return 'config.yaml'
+
+    def get_machine_path(self):
+        return 'tests/machine_files/show_scheduler/'
+
+    def get_platform(self):
+        return 'virtual'
+
+    def test_batched_steps(self):
+        show = self.machine.shows["blink_red"]
+        ticks = []
+        updates = []
+
+        def tick(show_controller):
+            ticks.append(self.machine.clock.get_time())
+            tick_method(show_controller)
+
+        def schedule_updates(lights):
+            updates.append(sorted(light.name for light in lights))
+            schedule_updates_method(lights)
+
+        tick_method = ShowController._tick
+        schedule_updates_method = Light.schedule_updates
+        with patch.object(ShowController, "_tick", autospec=True, side_effect=tick), \
+                patch.object(Light, "schedule_updates", side_effect=schedule_updates):
+            show_1 = show.play(show_tokens={"led": "led_01"})
+            self.advance_time_and_run(.005)
+            show_2 = show.play(show_tokens={"led": "led_02"})
+            self.advance_time_and_run(.5)
+            # out of the tolerance
+            show_3 = show.play(show_tokens={"led": "led_03"})
+            self.assertLightColor("led_01", "red")
+            self.assertLightColor("led_02", "red")
+            self.assertLightColor("led_03", "red")
+            ticks.clear()
+            updates.clear()
+
+            self.advance_time_and_run(.6)
+            # steps of show 1 and 2 ran in one tick and updated their lights together
+            self.assertEqual(1, len(ticks))
+            self.assertEqual([["led_01", "led_02"]], updates)
+            self.assertLightColor("led_01", "off")
+            self.assertLightColor("led_02", "off")
+            self.assertLightColor("led_03", "red")
+
+            self.advance_time_and_run(.5)
+            self.assertEqual(2, len(ticks))
+            self.assertEqual([["led_01", "led_02"], ["led_03"]], updates)
+            self.assertLightColor("led_03", "off")
+
+            # stopped shows do not run any more steps
+            show_2.stop()
+            show_3.stop()
+            self.advance_time_and_run(1)
+            self.assertEqual([["led_01", "led_02"], ["led_03"], ["led_01"]], updates[:3])
+            self.assertLightColor("led_01", "red")
+            self.assertLightColor("led_02", "off")
+            self.assertLightColor("led_03", "off")
+
+            show_1.stop()
+            ticks.clear()
+            self.advance_time_and_run(5)
+            # cancelled steps are dropped and do not wake up the controller
+            self.assertEqual([], ticks)
+            self.assertEqual([], self.machine.show_controller._scheduled_steps)
+            self.assertLightColor("led_01", "off")
+
+    def test_raising_step(self):
+        show_controller = self.machine.show_controller
+        calls = []
+
+        def fail():
+            raise AssertionError("step failed")
+
+        show_controller.schedule_show_step(self.machine.clock.get_time(), fail)
+        show_controller.schedule_show_step(self.machine.clock.get_time() + .5, lambda: calls.append(1))
+        with self.assertRaises(AssertionError):
+            show_controller._tick()
+
+        # the next tick is still scheduled
+        self.advance_time_and_run(1)
+        self.assertEqual([1], calls)
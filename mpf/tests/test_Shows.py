@@ -1,9 +1,10 @@
 """Test shows."""
 import time
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from mpf.platforms.interfaces.driver_platform_interface import PulseSettings
+from mpf.platforms.virtual import VirtualLight
 from mpf.tests.MpfTestCase import MpfTestCase, test_config
 
 
@@ -977,4 +978,127 @@ class TestShows(MpfTestCase):
         # after 1sec, back on
         self.advance_time_and_run(1)
         self.assertLightColor("led_01", [255, 255, 255])
-        self.assertLightChannel("light_01", 255)
\ No newline at end of file
+        self.assertLightChannel("light_01", 255)
+
+    def _assert_gray(self, light_name, value):
+        for channel in self.machine.lights[light_name].get_color().rgb:
+            self.assertAlmostEqual(value, channel, delta=2)
+
+    def _play_ramp(self, **kwargs):
+        """Play the ramp show and return hardware fades per light."""
+        fades = {"led_01": [], "led_02": []}
+        drivers = {self.machine.lights[name].hw_drivers["red"][0]: name for name in fades}
+
+        def set_fade(driver, *args):
+            if driver in drivers:
+                fades[drivers[driver]].append(args)
+
+        with patch.object(VirtualLight, "set_fade", autospec=True, side_effect=set_fade):
+            running_show = self.machine.shows['leds_ramp'].play(**kwargs)
+            self.advance_time_and_run(.01)
+            self._assert_gray("led_01", 0)
+            self.advance_time_and_run(1.5)
+            self._assert_gray("led_01", 50)
+            self.advance_time_and_run(1)
+            self._assert_gray("led_01", 150)
+            self.advance_time_and_run(.5)
+            self._assert_gray("led_01", 200)
+            self.advance_time_and_run(.5)
+            self._assert_gray("led_01", 250)
+            self.assertLightColor("led_02", [0, 255, 0])
+            running_show.stop()
+        return fades
+
+    def test_unplanned_light_fades(self):
+        # the host fades virtual lights. nothing to plan
+        show = self.machine.shows['leds_ramp']
+        self.assertIs(show.get_show_program_with_token({}), show.get_planned_show_program_with_token({}))
+
+        fades = self._play_ramp()
+        # one fade per step and one when the show stops
+        self.assertEqual(5, len(fades["led_01"]))
+        self.assertEqual(5, len(fades["led_02"]))
+
+    def test_planned_light_fades(self):
+        show = self.machine.shows['leds_ramp']
+        with patch.object(VirtualLight, "get_max_fade_ms", return_value=1500, autospec=True):
+            planned_program = show.get_planned_show_program_with_token({})
+
+        light = self.machine.lights["led_01"]
+        entries = [[entry for entry in step.actions[0][2] if entry[0] is light] if step.actions else []
+                   for step in planned_program]
+        # step 1 alone would exceed the fade limit when merged. steps 2 and 3 are one fade
+        self.assertEqual((100, 100, 100), entries[1][0][1].rgb)
+        self.assertEqual(1000, entries[1][0][2])
+        self.assertEqual([((250, 250, 250), 1500), ((250, 250, 250), 500)],
+                         [(entries[step][0][1].rgb, entries[step][0][2]) for step in (2, 3)])
+        # led_02 does not fade along a line
+        self.assertIs(show.get_show_program_with_token({})[2].actions[0][2][1],
+                      planned_program[2].actions[0][2][1])
+
+        fades = self._play_ramp()
+        # the fade of step 3 is already running on the hardware
+        self.assertEqual(4, len(fades["led_01"]))
+        self.assertEqual(5, len(fades["led_02"]))
+        self.assertAlmostEqual(250 / 255, fades["led_01"][2][2])
+
+        # not planned at a different speed
+        fades = self._play_ramp(speed=1.0001)
+        # the light is off already. steps 1 to 3 are sent one by one
+        self.assertEqual(4, len(fades["led_01"]))
+        self.assertAlmostEqual(200 / 255, fades["led_01"][1][2])
+
+    def test_planned_light_fades_pause(self):
+        show = self.machine.shows['leds_ramp']
+        with patch.object(VirtualLight, "get_max_fade_ms", return_value=-1, autospec=True):
+            planned_program = show.get_planned_show_program_with_token({})
+        self.assertEqual(2500, planned_program[1].actions[0][2][0][2])
+
+        running_show = show.play()
+        self.advance_time_and_run(2.5)
+        self._assert_gray("led_01", 150)
+        # the planned fade would continue to fafafa
+        running_show.pause()
+        self.advance_time_and_run(5)
+        self._assert_gray("led_01", 200)
+        running_show.resume()
+        self.advance_time_and_run(.6)
+        self._assert_gray("led_01", 250)
+        running_show.stop()
+
+    def test_compiled_show_program(self):
+        light_player = self.machine.show_controller.show_players["lights"]
+        show = self.machine.shows['leds_name_token']
+        tokens = dict(leds='led_01, led_02')
+
+        program = show.get_show_program_with_token(tokens)
+        # compiled once per token set
+        self.assertIs(program, show.get_show_program_with_token(dict(leds='led_01, led_02')))
+        self.assertIsNot(program, show.get_show_program_with_token(dict(leds='led_01')))
+
+        item_type, player, light_program, _ = program[0].actions[0]
+        self.assertEqual("lights", item_type)
+        self.assertIs(light_player, player)
+        self.assertEqual([self.machine.lights["led_01"], self.machine.lights["led_02"]],
+                         [entry[0] for entry in light_program])
+        self.assertEqual((255, 0, 0), light_program[0][1].rgb)
+
+        running_show = show.play(show_tokens=tokens)
+        self.advance_time_and_run(.5)
+        self.assertLightColor("led_01", 'red')
+        self.assertLightColor("led_02", 'red')
+        running_show.stop()
+        self.advance_time_and_run(.5)
+        self.assertLightColor("led_01", 'off')
+        self.assertLightColor("led_02", 'off')
+
+        # "on" resolves to the default on color and "stop" removes the light from the stack
+        light = self.machine.lights["led_01"]
+        self.assertEqual(((light, light.config['default_on_color'], None, 0), ),
+                         light_player.compile_show_entry({light: {"color": "on", "fade": None, "priority": 0}}))
+        self.assertEqual(((light, None, 100, 2), ),
+                         light_player.compile_show_entry({light: {"color": "stop", "fade": 100, "priority": 2}}))
+        # placeholders are evaluated when played
+        self.assertIsNone(light_player.compile_show_entry({"(leds)": {"color": "red", "fade": None, "priority": 0}}))
+        self.assertIsNone(light_player.compile_show_entry({light: {"color": "(color)", "fade": None,
+                                                                   "priority": 0}}))
@@ -0,0 +1,73 @@
+"""Test the game simulator."""
+import os
+from unittest import TestCase
+
+import mpf.core
+from mpf.commands.simulate import run_simulation, parse_model, get_distribution, get_distributions
+from mpf.core.file_manager import FileManager
+
+
+class TestSimulate(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.machine_path = os.path.abspath(os.path.join(mpf.core.__path__[0], os.pardir,
+                                                         'tests/machine_files/simulate/'))
+        self.model = parse_model(FileManager.load(os.path.join(self.machine_path, "config", "simulate.yaml")))
+
+    def _job(self, games, seed):
+        # some plugins cannot be imported without their optional dependencies
+        return {"machine_path": self.machine_path, "config_files": ["config.yaml"], "model": self.model,
+                "games": games, "seed": seed, "config_patches": {"mpf": {"plugins": []}}}
+
+    def test_parse_model(self):
+        self.assertEqual(20, self.model["ball_time"])
+        self.assertEqual({"s_target": {"rate": 0.5, "hold": 0.05}, "s_bumper": {"rate": 2, "hold": 0.01}},
+                         self.model["switches"])
+        self.assertEqual(["score", "targets_hit"], self.model["player_vars"])
+        self.assertEqual(["ball_started"], self.model["count_events"])
+        self.assertEqual(1, self.model["players"])
+        self.assertEqual(3600, self.model["max_game_time"])
+
+        with self.assertRaises(AssertionError):
+            parse_model({"switches": {"s_target": 1}})
+        with self.assertRaises(AssertionError):
+            parse_model({"ball_time": "10s", "drain_probability": 2})
+        with self.assertRaises(AssertionError):
+            parse_model({"ball_time": "10s", "switch": {"s_target": 1}})
+
+    def test_play_games(self):
+        result = run_simulation(self._job(5, 1))
+        self.assertIsNone(result["error"])
+        self.assertEqual(5, len(result["games"]))
+        for game in result["games"]:
+            self.assertFalse(game["timeout"])
+            self.assertEqual({"ball_started": 3}, game["events"])
+            self.assertEqual(1, len(game["players"]))
+            player = game["players"][0]
+            self.assertEqual(["score", "targets_hit"], sorted(player))
+            self.assertGreaterEqual(player["score"], player["targets_hit"] * 1000)
+
+        # same seed plays the same games
+        self.assertEqual(result["games"], run_simulation(self._job(5, 1))["games"])
+        self.assertNotEqual(result["games"], run_simulation(self._job(5, 2))["games"])
+
+        distributions = get_distributions(result["games"])
+        self.assertEqual(["event.ball_started", "game_secs", "player.score", "player.targets_hit"],
+                         sorted(distributions))
+        self.assertEqual(5, distributions["player.score"]["count"])
+
+    def test_unknown_switch(self):
+        self.model["switches"]["s_does_not_exist"] = {"rate": 1, "hold": 0.1}
+        result = run_simulation(self._job(1, 1))
+        self.assertIn("s_does_not_exist", result["error"])
+
+    def test_distribution(self):
+        distribution = get_distribution([5, 1, 4, 2, 3])
+        self.assertEqual(5, distribution["count"])
+        self.assertEqual(3, distribution["mean"])
+        self.assertEqual(1, distribution["min"])
+        self.assertEqual(5, distribution["max"])
+        self.assertEqual(3, distribution["p50"])
+        self.assertAlmostEqual(1.4, distribution["p10"])
+        self.assertAlmostEqual(4.96, distribution["p99"])
@@ -1,3 +1,4 @@
+import copy
 import unittest
 from mpf.core.utility_functions import Util
 
@@ -13,6 +14,17 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(0, Util.string_to_ms(None))
         self.assertEqual(0, Util.string_to_ms(False))
 
+    def test_string_to_bool(self):
+        self.assertTrue(Util.string_to_bool("true"))
+        self.assertTrue(Util.string_to_bool("On"))
+        self.assertTrue(Util.string_to_bool(1))
+        self.assertFalse(Util.string_to_bool("false"))
+        self.assertFalse(Util.string_to_bool("0"))
+        self.assertFalse(Util.string_to_bool(False))
+        self.assertIsNone(Util.string_to_bool(None))
+        with self.assertRaises(ValueError):
+            Util.string_to_bool("maybe")
+
     def test_keys_to_lower(self):
         inner_dict = dict(key1=1, Key2=2)
         outer_dict = dict(key3=1, Key4=2, Key5=inner_dict)
@@ -92,6 +104,30 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(result['key4'], 'val4')
         self.assertEqual(result['list1'], [4, 5, 6])
 
+    def test_dict_merge_shared(self):
+        dict_a = dict(key1='val1', list1=[1, 2, 3], sub=dict(a=1, b=dict(c=2)), unchanged=dict(d=3))
+        dict_b = dict(key3='val3', list1=[4, 5, 6], sub=dict(b=dict(e=4)), over=dict(_overwrite=True, f=5),
+                      key1=None)
+
+        result = Util.dict_merge_shared(dict_a, dict_b)
+        self.assertEqual(Util.dict_merge(dict_a, copy.deepcopy(dict_b)), result)
+        self.assertEqual(dict(key1='val1', list1=[1, 2, 3, 4, 5, 6], sub=dict(a=1, b=dict(c=2, e=4)),
+                              unchanged=dict(d=3), key3='val3', over=dict(f=5)), result)
+
+        # inputs are not modified
+        self.assertEqual(dict(key1='val1', list1=[1, 2, 3], sub=dict(a=1, b=dict(c=2)), unchanged=dict(d=3)),
+                         dict_a)
+        self.assertIn('_overwrite', dict_b['over'])
+        self.assertEqual([4, 5, 6], dict_b['list1'])
+
+        # unchanged subtrees are shared. changed ones are copied.
+        self.assertIs(dict_a['unchanged'], result['unchanged'])
+        self.assertIsNot(dict_a['sub'], result['sub'])
+
+        result = Util.dict_merge_shared(dict_a, dict(sub=dict(_delete=True)), combine_lists=False)
+        self.assertNotIn('sub', result)
+        self.assertIn('sub', dict_a)
+
     def test_hex_to_string_list(self):
         result = Util.hex_string_to_list('00ff88')
         self.assertEqual(result, [0, 255, 136])
@@ -1,3 +1,4 @@
+import os
 import unittest
 from ruamel.yaml.constructor import DuplicateKeyError
 from mpf.file_interfaces.yaml_interface import YamlInterface
@@ -57,3 +58,55 @@ int_1: 123
                 raise AssertionError('YAML value "{}" is {}, not {}'.format(v,
                     type(v), eval(k.split('_')[0])))
             self.assertEqual(values[k], v)
+
+
+def _typed(data):
+    """Return data with the type next to every value because 1 == 1.0 == True."""
+    if isinstance(data, dict):
+        return {_typed(key): _typed(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_typed(item) for item in data]
+    return type(data).__name__, data
+
+
+@unittest.skipIf(not YamlInterface.fast_loader, "PyYAML with libyaml is not installed")
+class TestYamlInterfaceFastLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, YamlInterface, "fast_loader", True)
+
+    def _load_both(self, data):
+        results = []
+        for fast_loader in (False, True):
+            YamlInterface.fast_loader = fast_loader
+            try:
+                results.append(_typed(YamlInterface.process(data)))
+            except Exception as e:  # pylint: disable-msg=broad-except
+                results.append(type(e).__name__)
+        return results
+
+    def test_scalars(self):
+        for data in ['a: 012', 'a: 0o17', 'a: 0x1F', 'a: 0b11', 'a: -1_000', 'a: .5', 'a: 1e3', 'a: -.inf',
+                     'a: on', 'a: yes', 'a: TRUE', 'a: ~', 'a: 1:20', 'a: 2020-01-01', 'a: 2001-12-14t21:59:43.10-05:00',
+                     'a: !!binary aGVsbG8=', 'a: !!str 1', 'a: "1"', 'a: =', 'b: &b {x: 1}\na:\n  <<: *b\n  y: 2',
+                     'a: [1, {b: 2}]', 'a: 1\na: 2']:
+            slow, fast = self._load_both(data)
+            self.assertEqual(slow, fast, data)
+
+    def test_aliases_are_not_shared(self):
+        config = YamlInterface.process('a: &x [1]\nb: *x')
+        self.assertEqual(config['a'], config['b'])
+        self.assertIsNot(config['a'], config['b'])
+
+    def test_parity_with_machine_files(self):
+        mpf_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+        files = [os.path.join(mpf_path, "config_spec.yaml"), os.path.join(mpf_path, "mpfconfig.yaml")]
+        for root, _, filenames in os.walk(os.path.join(mpf_path, "tests", "machine_files")):
+            files.extend(os.path.join(root, filename) for filename in filenames if filename.endswith(".yaml"))
+
+        self.assertGreater(len(files), 100)
+        for filename in files:
+            with open(filename, encoding="utf8") as f:
+                data = f.read()
+            slow, fast = self._load_both(data)
+            self.assertEqual(slow, fast, filename)